@@ -1,25 +1,50 @@
 # C:\Users\sirok\MoCKA\audit\ed25519\governance\backup_index_append_file.py
 # note: Phase14.6 backup_index append helper (sha256 file, bind latest TIP)
+# note: directory / glob mode: thread pool hashing + (path, size, mtime_ns, inode) cache, one CSV write per run
 
 import os
+import io
 import csv
 import sys
+import glob
+import mmap
+import time
 import hashlib
 import sqlite3
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 ROOT = r"C:\Users\sirok\MoCKA"
 DB_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
 CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "backup_index.csv")
+CACHE_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "backup_index.hashcache.db")
+
+READ_CHUNK = 8 * 1024 * 1024
+WORKERS = min(8, (os.cpu_count() or 1) * 2)
+# mtime がハッシュ時刻に近すぎるエントリは信用しない（同じ mtime 内の書き換え対策）
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 def sha256_file_hex(path: str) -> str:
+    # hashlib は大きな update で GIL を手放すので、thread pool で並列に効く
     h = hashlib.sha256()
     with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return h.hexdigest()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                h.update(m)
+            return h.hexdigest()
+        except (OSError, ValueError):
+            pass
+        f.seek(0)
         while True:
-            b = f.read(1024 * 1024)
+            b = f.read(READ_CHUNK)
             if not b:
                 break
             h.update(b)
@@ -40,43 +65,154 @@ def get_tip_event_id() -> str:
         raise RuntimeError("EMPTY_GOVERNANCE_LEDGER")
     return row[0]
 
+# -------------------------
+# hash cache
+# -------------------------
+
+def open_cache(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS file_hash_cache (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            sha256_hex TEXT NOT NULL,
+            hashed_at_ns INTEGER NOT NULL
+        )
+    """)
+    conn.commit()
+    return conn
+
+def file_identity(path: str) -> Tuple[int, int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+def cached_hashes(conn: sqlite3.Connection, idents: Dict[str, Tuple[int, int, int]]) -> Dict[str, str]:
+    out = {}
+    cur = conn.cursor()
+    for path, (size, mtime_ns, inode) in idents.items():
+        cur.execute("SELECT size, mtime_ns, inode, sha256_hex, hashed_at_ns FROM file_hash_cache WHERE path = ?", (path,))
+        row = cur.fetchone()
+        if row and row[0] == size and row[1] == mtime_ns and row[2] == inode and mtime_ns < row[4] - RACY_WINDOW_NS:
+            out[path] = row[3]
+    return out
+
+def store_hashes(conn: sqlite3.Connection, entries: List[Tuple[str, int, int, int, str, int]]) -> None:
+    conn.executemany("""
+        INSERT INTO file_hash_cache (path, size, mtime_ns, inode, sha256_hex, hashed_at_ns) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            size = excluded.size, mtime_ns = excluded.mtime_ns, inode = excluded.inode,
+            sha256_hex = excluded.sha256_hex, hashed_at_ns = excluded.hashed_at_ns
+    """, entries)
+    conn.commit()
+
+# -------------------------
+# file selection / hashing
+# -------------------------
+
+def expand_targets(target: str) -> List[str]:
+    # ファイル 1 つ / ディレクトリ（再帰）/ glob（** 可）
+    if os.path.isfile(target):
+        return [target]
+    if os.path.isdir(target):
+        paths = []
+        for d, _, files in os.walk(target):
+            for name in files:
+                paths.append(os.path.join(d, name))
+    else:
+        paths = [p for p in glob.glob(target, recursive=True) if os.path.isfile(p)]
+    # index / cache 自身は対象にしない
+    skip = {os.path.abspath(p) for p in (CSV_PATH, CACHE_PATH, CACHE_PATH + "-journal")}
+    return sorted(p for p in paths if os.path.abspath(p) not in skip)
+
+def hash_files(paths: List[str], workers: int = WORKERS, cache_path: Optional[str] = None) -> Tuple[Dict[str, str], int]:
+    # 返り値: ({path: sha256}, 実際に hash した件数)
+    idents = {p: file_identity(p) for p in paths}
+    conn = open_cache(cache_path) if cache_path else None
+    try:
+        digests = cached_hashes(conn, idents) if conn else {}
+        todo = [p for p in paths if p not in digests]
+        hashed_at_ns = time.time_ns()
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as ex:
+                for p, digest in zip(todo, ex.map(sha256_file_hex, todo)):
+                    digests[p] = digest
+        if conn and todo:
+            # hash 中に変わったファイルはキャッシュしない
+            entries = []
+            for p in todo:
+                size, mtime_ns, inode = idents[p]
+                if file_identity(p) == idents[p]:
+                    entries.append((p, size, mtime_ns, inode, digests[p], hashed_at_ns))
+            store_hashes(conn, entries)
+    finally:
+        if conn:
+            conn.close()
+    return digests, len(todo)
+
+def append_rows(rows: List[List[str]]) -> None:
+    # 全行を 1 回の write で追記する
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    for row in rows:
+        w.writerow(row)
+    with open(CSV_PATH, "a", encoding="utf-8", newline="") as f:
+        f.write(buf.getvalue())
+
 def usage() -> int:
     print("USAGE:")
     print("  python backup_index_append_file.py PATH_TO_FILE [BACKUP_ID]")
+    print("  python backup_index_append_file.py DIR_OR_GLOB [BACKUP_ID] [--workers N] [--no-cache]")
     print("NOTE:")
     print("  PATH_TO_FILE may be relative to C:\\Users\\sirok\\MoCKA")
+    print("  DIR is walked recursively; GLOB accepts ** (quote it in PowerShell)")
     return 2
 
 def main(argv) -> int:
     if len(argv) < 2:
         return usage()
 
-    in_path = argv[1]
+    ap = argparse.ArgumentParser(add_help=False)
+    ap.add_argument("path")
+    ap.add_argument("backup_id", nargs="?", default="")
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--no-cache", action="store_true")
+    try:
+        args = ap.parse_args(argv[1:])
+    except SystemExit:
+        return usage()
+
+    in_path = args.path
     if not os.path.isabs(in_path):
         in_path = os.path.join(ROOT, in_path)
 
-    if not os.path.exists(in_path):
+    paths = expand_targets(in_path)
+    if not paths:
         print("FILE_NOT_FOUND:", in_path)
         return 2
 
-    backup_id = argv[2] if len(argv) >= 3 else ("bk_" + datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S"))
+    backup_id = args.backup_id or ("bk_" + datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S"))
 
-    digest = sha256_file_hex(in_path)
+    digests, hashed = hash_files(paths, args.workers, None if args.no_cache else CACHE_PATH)
     tip = get_tip_event_id()
     ts = utc_now_iso()
 
     note = "note: Phase14.6 backup_index append (sha256 computed, latest TIP anchored)"
 
-    with open(CSV_PATH, "a", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        w.writerow([ts, backup_id, in_path, digest, tip, note])
+    append_rows([[ts, backup_id, p, digests[p], tip, note] for p in paths])
 
     print("OK: backup_index appended")
     print("BACKUP_ID:", backup_id)
-    print("FILE:", in_path)
-    print("SHA256:", digest)
+    if len(paths) == 1 and os.path.isfile(in_path):
+        print("FILE:", paths[0])
+        print("SHA256:", digests[paths[0]])
+    else:
+        print("FILES:", len(paths))
+        print("HASHED:", hashed)
+        print("CACHED:", len(paths) - hashed)
     print("TIP_EVENT_ID:", tip)
     return 0
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv))
\ No newline at end of file
+    raise SystemExit(main(sys.argv))
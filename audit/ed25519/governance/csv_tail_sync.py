@@ -0,0 +1,40 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\csv_tail_sync.py
+# note: Phase14.6 shared tail tracking for append-only governance CSVs
+#
+# impact_registry_index（重複 guard）/ governance_csv_repair（tail 修復）/ governance_csv_mirror（SQLite mirror）が
+# 共通で使う「どこまで処理したか」の判定。各 sidecar は (offset, fingerprint) だけを保存する。
+#   offset      : 処理済みの末尾 byte offset
+#   fingerprint : offset と、その直前 FINGERPRINT_BYTES の sha256
+# CSV が offset より伸びていれば末尾だけ処理し、縮んだ / offset 直前が書き換えられていれば作り直す。
+
+import os
+import hashlib
+from typing import Optional, Tuple
+
+FINGERPRINT_BYTES = 4096
+
+def fingerprint(f, offset: int) -> str:
+    start = max(offset - FINGERPRINT_BYTES, 0)
+    f.seek(start)
+    return hashlib.sha256(str(offset).encode("ascii") + b":" + f.read(offset - start)).hexdigest()
+
+def plan_sync(f, state: Optional[Tuple[int, str]], rebuild: bool = False) -> Tuple[str, int]:
+    # state: 前回保存した (offset, fingerprint)。返り値は (mode, start)
+    #   rebuild : state が無い / 強制 / 縮んだ / 書き換えられた -> 0 から処理し直す
+    #   current : 前回から変化なし
+    #   tail    : start から末尾までを処理する
+    size = os.fstat(f.fileno()).st_size
+    if rebuild or state is None:
+        return "rebuild", 0
+    offset, fp = int(state[0]), state[1]
+    if size < offset or fingerprint(f, offset) != fp:
+        return "rebuild", 0
+    if offset == size:
+        return "current", offset
+    return "tail", offset
+
+def read_complete(f, start: int) -> bytes:
+    # start から最後の改行までを返す（改行で終わらない末尾行は書き込み途中かもしれないので次回に回す）
+    f.seek(start)
+    data = f.read()
+    return data[:data.rfind(b"\n") + 1]
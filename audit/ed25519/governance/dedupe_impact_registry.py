@@ -1,15 +1,27 @@
 # C:\Users\sirok\MoCKA\audit\ed25519\governance\dedupe_impact_registry.py
 # note: Phase14.6 dedupe impact_registry.csv (preserve order, remove exact duplicates)
+# note: offline repair tool. 通常の append は impact_registry_index.append_row が重複を弾くので不要
+#       既定は従来通り行全体の完全一致（timestamp_utc が違う再 append は正当な履歴として残す）
+#       --normalized のときだけ sidecar と同じ正規化（timestamp_utc 以外の列）で判定する。最後に sidecar を作り直す
 
 import os
+import sys
+from impact_registry_index import line_key, rebuild_index
 
 ROOT = r"C:\Users\sirok\MoCKA"
 CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "impact_registry.csv")
 
-def main():
+def main(argv) -> int:
+    if len(argv) > 2 or (len(argv) == 2 and argv[1] != "--normalized"):
+        print("USAGE:")
+        print("  python dedupe_impact_registry.py                (remove exact duplicate lines)")
+        print("  python dedupe_impact_registry.py --normalized   (also remove rows differing only in timestamp_utc)")
+        return 2
+    normalized = len(argv) == 2
+
     if not os.path.exists(CSV_PATH):
         print("CSV_NOT_FOUND")
-        return
+        return 0
 
     with open(CSV_PATH, "r", encoding="utf-8", errors="replace") as f:
         lines = f.read().replace("\r\n", "\n").replace("\r", "\n").split("\n")
@@ -24,7 +36,7 @@ def main():
             continue
 
         # keep header + init note always (but still avoid duplicates)
-        key = s
+        key = line_key(s) if normalized else s
         if key in seen:
             removed += 1
             continue
@@ -34,8 +46,12 @@ def main():
     with open(CSV_PATH, "w", encoding="utf-8", newline="\n") as f:
         f.write("\n".join(out) + "\n")
 
+    _, hashes = rebuild_index(CSV_PATH)
+
     print("OK: impact_registry deduped")
     print("REMOVED_LINES:", removed)
+    print("INDEX_ROW_HASHES:", hashes)
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main(sys.argv))
\ No newline at end of file
@@ -1,7 +1,11 @@
 # C:\Users\sirok\MoCKA\audit\ed25519\governance\fix_impact_registry_csv.py
 # note: Phase14.6 normalize impact_registry.csv
+# note: tail-only repair from the last-known-good offset (governance_csv_repair). --full で全体を正規化
 
 import os
+import sys
+from governance_csv_repair import repair_main
+from impact_registry_index import rebuild_index, sync_index
 
 ROOT = r"C:\Users\sirok\MoCKA"
 CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "impact_registry.csv")
@@ -9,42 +13,19 @@ CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "impact_registry
 HEADER = "timestamp_utc,scope,artifact_path,impact_level,event_id,note"
 INIT_NOTE = "note: Phase14.6 CSV init (impact_registry)"
 
-def main():
-    if not os.path.exists(CSV_PATH):
-        print("CSV_NOT_FOUND")
-        return
-
-    with open(CSV_PATH, "r", encoding="utf-8", errors="replace") as f:
-        raw = f.read()
-
-    lines = []
-    for ln in raw.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
-        s = ln.strip()
-        if not s:
-            continue
-        lines.append(s)
-
-    normalized = [HEADER, INIT_NOTE]
-
-    for s in lines:
-        if s == HEADER or s == INIT_NOTE:
-            continue
+def is_data(s: str) -> bool:
+    return s.startswith("20") and s.count(",") >= 5
 
-        if s.startswith(INIT_NOTE + "20") and s.count(",") >= 5:
-            s = s[len(INIT_NOTE):].lstrip()
-
-        if s.startswith("20") and s.count(",") >= 5:
-            normalized.append(s)
-            continue
-
-        normalized.append("note: preserved_unparsed_line: " + s)
-
-    out = "\n".join(normalized) + "\n"
-    with open(CSV_PATH, "w", encoding="utf-8", newline="\n") as f:
-        f.write(out)
+def main(argv=None):
+    r = repair_main(argv or sys.argv, CSV_PATH, "impact_registry.csv", HEADER, INIT_NOTE, is_data)
+    if r is None or not r["rewritten"]:
+        return
 
-    print("OK: impact_registry.csv normalized")
-    print("PATH:", CSV_PATH)
+    # 重複判定 sidecar を追従させる（tail 修復なら sync が末尾だけ索引し直す）
+    if r["mode"] == "tail":
+        sync_index(CSV_PATH)
+    else:
+        rebuild_index(CSV_PATH)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
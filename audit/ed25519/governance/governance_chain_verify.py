@@ -1,76 +1,286 @@
 # C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_chain_verify.py
 # note: Phase14.6 Roadmap-2 Governance chain verification
+# note: streaming (fetchmany) + opt-in resumable checkpoint (--incremental) + JSON report + in-process API
 
 import os
+import time
 import sqlite3
 import hashlib
 import json
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 ROOT = r"C:\Users\sirok\MoCKA"
 DB_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
+CHECKPOINT_SCHEMA = "mocka.governance.verify.checkpoint.v1"
+REPORT_SCHEMA = "mocka.governance.verify.report.v1"
+FETCH_ROWS = 1000
 
 def sha256_hex(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
-def main():
-    if not os.path.exists(DB_PATH):
-        print("DB_NOT_FOUND")
-        return
+def utc_now_z() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+# -------------------------
+# checkpoint
+# -------------------------
+
+def default_checkpoint_path(db_path: str) -> str:
+    return db_path + ".verify_checkpoint.json"
+
+def checkpoint_digest(body: Dict[str, Any]) -> str:
+    # 破損検出用（鍵なし）。resume の根拠は checkpoint 行の event_id / chain_hash が DB と一致することだけ
+    return sha256_hex(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8"))
 
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8-sig") as f:
+        cp = json.load(f)
+    if not isinstance(cp, dict):
+        raise ValueError(f"CHECKPOINT INVALID: {path} (rerun with --full)")
+    expected = cp.pop("checkpoint_hash", "")
+    if cp.get("schema") != CHECKPOINT_SCHEMA or expected != checkpoint_digest(cp):
+        raise ValueError(f"CHECKPOINT INVALID: {path} (rerun with --full)")
+    return cp
 
+def write_checkpoint(path: str, last_rowid: int, last_event_id: str, last_chain_hash: str, rows_verified: int) -> None:
+    body = {
+        "schema": CHECKPOINT_SCHEMA,
+        "last_rowid": last_rowid,
+        "last_event_id": last_event_id,
+        "last_chain_hash": last_chain_hash,
+        "rows_verified": rows_verified,
+        "verified_at_utc": utc_now_z(),
+    }
+    body["checkpoint_hash"] = checkpoint_digest(body)
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(json.dumps(body, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+# -------------------------
+# verification
+# -------------------------
+
+def iter_rows(cur: sqlite3.Cursor, after_rowid: int, fetch_rows: int):
+    # fetchall() せず fetchmany 窓で流す
     cur.execute("""
-        SELECT event_id, prev_event_id, timestamp_utc, event_type, payload_json, note, chain_hash
+        SELECT rowid, event_id, prev_event_id, timestamp_utc, event_type, payload_json, note, chain_hash
         FROM governance_ledger_event
+        WHERE rowid > ?
         ORDER BY rowid ASC
-    """)
-    rows = cur.fetchall()
-    conn.close()
+    """, (after_rowid,))
+    while True:
+        batch = cur.fetchmany(fetch_rows)
+        if not batch:
+            return
+        yield batch
 
-    if not rows:
-        print("EMPTY")
-        return
+def verify_chain(
+    db_path: str = "",
+    checkpoint_path: str = "",
+    incremental: bool = False,
+    collect_all: bool = False,
+    fetch_rows: int = FETCH_ROWS,
+    update_checkpoint: bool = True,
+) -> Dict[str, Any]:
+    # in-process API: 例外ではなく report dict を返す（status: OK / FAIL / EMPTY / DB_NOT_FOUND）
+    # 既定は genesis からの全件検証。incremental=True のときだけ checkpoint を読み書きする
+    db_path = db_path or DB_PATH
+    checkpoint_path = checkpoint_path or default_checkpoint_path(db_path)
+    t0 = time.perf_counter()
 
-    ok = True
+    report: Dict[str, Any] = {
+        "schema": REPORT_SCHEMA,
+        "db": db_path,
+        "status": "OK",
+        "mode": "full",
+        "resumed_from_rowid": 0,
+        "rows_checked": 0,
+        "rows_verified": 0,
+        "tip_event_id": None,
+        "tip_chain_hash": None,
+        "failures": [],
+        "checkpoint": None,
+    }
+    failures: List[Dict[str, Any]] = report["failures"]
 
-    for i, r in enumerate(rows):
-        event_id, prev_event_id, ts, event_type, payload_json, note, chain_hash = r
+    def finish() -> Dict[str, Any]:
+        elapsed = time.perf_counter() - t0
+        report["failure_count"] = len(failures)
+        report["elapsed_sec"] = round(elapsed, 6)
+        report["rows_per_sec"] = round(report["rows_checked"] / elapsed, 1) if elapsed > 0 else None
+        return report
 
-        if i == 0:
-            if prev_event_id != "GENESIS" or event_type != "GOVERNANCE_GENESIS":
-                print("FAIL: bad genesis header")
-                ok = False
-                break
-            expected_chain = sha256_hex((event_id + "GENESIS").encode("utf-8"))
-            if chain_hash != expected_chain:
-                print("FAIL: genesis chain_hash mismatch")
-                print("EXPECTED:", expected_chain)
-                print("GOT:", chain_hash)
-                ok = False
-                break
-        else:
-            prev_chain = rows[i - 1][6]
-            expected_chain = sha256_hex((prev_chain + event_id + prev_event_id).encode("utf-8"))
-            if chain_hash != expected_chain:
-                print("FAIL: chain_hash mismatch at index", i)
-                print("EXPECTED:", expected_chain)
-                print("GOT:", chain_hash)
-                ok = False
+    if not os.path.exists(db_path):
+        report["status"] = "DB_NOT_FOUND"
+        return finish()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        after_rowid = 0
+        rows_before = 0
+        prev_event_id = None
+        prev_chain = None
+
+        if incremental:
+            try:
+                cp = load_checkpoint(checkpoint_path)
+            except Exception as e:
+                failures.append({"kind": "CHECKPOINT_INVALID", "rowid": None, "detail": str(e)})
+                report["status"] = "FAIL"
+                return finish()
+
+            if cp is not None:
+                # checkpoint 位置の行が今も同じ event_id / chain_hash を持つこと
+                cur.execute(
+                    "SELECT event_id, chain_hash FROM governance_ledger_event WHERE rowid = ?",
+                    (int(cp["last_rowid"]),),
+                )
+                row = cur.fetchone()
+                if not row or row[0] != cp["last_event_id"] or row[1] != cp["last_chain_hash"]:
+                    failures.append({
+                        "kind": "CHECKPOINT_MISMATCH",
+                        "rowid": int(cp["last_rowid"]),
+                        "detail": "ledger rewritten? rerun with --full",
+                    })
+                    report["status"] = "FAIL"
+                    return finish()
+                after_rowid = int(cp["last_rowid"])
+                rows_before = int(cp["rows_verified"])
+                prev_event_id, prev_chain = cp["last_event_id"], cp["last_chain_hash"]
+                report["mode"] = "incremental"
+                report["resumed_from_rowid"] = after_rowid
+
+        index = rows_before
+        last_rowid = after_rowid
+        stop = False
+
+        def fail(kind: str, rowid: int, event_id: str, expected: str = "", got: str = "") -> None:
+            nonlocal stop
+            failures.append({"kind": kind, "rowid": rowid, "index": index, "event_id": event_id, "expected": expected, "got": got})
+            if not collect_all:
+                stop = True
+
+        for batch in iter_rows(cur, after_rowid, fetch_rows):
+            for rowid, event_id, prev_db, ts, event_type, payload_json, note, chain_hash in batch:
+                if index == 0:
+                    if prev_db != "GENESIS" or event_type != "GOVERNANCE_GENESIS":
+                        fail("BAD_GENESIS_HEADER", rowid, event_id, "GENESIS/GOVERNANCE_GENESIS", f"{prev_db}/{event_type}")
+                    expected_chain = sha256_hex((event_id + "GENESIS").encode("utf-8"))
+                    if not stop and chain_hash != expected_chain:
+                        fail("GENESIS_CHAIN_HASH_MISMATCH", rowid, event_id, expected_chain, chain_hash)
+                else:
+                    expected_chain = sha256_hex((prev_chain + event_id + prev_db).encode("utf-8"))
+                    if chain_hash != expected_chain:
+                        fail("CHAIN_HASH_MISMATCH", rowid, event_id, expected_chain, chain_hash)
+
+                if not stop:
+                    try:
+                        json.loads(payload_json)
+                    except Exception:
+                        fail("PAYLOAD_JSON_INVALID", rowid, event_id)
+
+                if stop:
+                    break
+
+                # collect-all では保存値で前進し、後続行はそれぞれ独立に判定する
+                prev_event_id, prev_chain = event_id, chain_hash
+                last_rowid = rowid
+                index += 1
+                report["rows_checked"] += 1
+            if stop:
                 break
 
-        try:
-            json.loads(payload_json)
-        except Exception:
-            print("FAIL: payload_json invalid at index", i)
-            ok = False
-            break
+        report["rows_verified"] = index
+        report["tip_event_id"] = prev_event_id
+        report["tip_chain_hash"] = prev_chain
+
+        if failures:
+            report["status"] = "FAIL"
+        elif index == 0:
+            report["status"] = "EMPTY"
+        elif incremental and update_checkpoint and last_rowid != after_rowid:
+            write_checkpoint(checkpoint_path, last_rowid, prev_event_id, prev_chain, index)
+            report["checkpoint"] = checkpoint_path
+    finally:
+        conn.close()
+
+    return finish()
+
+LEGACY_FAIL_TEXT = {
+    "BAD_GENESIS_HEADER": "bad genesis header",
+    "GENESIS_CHAIN_HASH_MISMATCH": "genesis chain_hash mismatch",
+    "CHAIN_HASH_MISMATCH": "chain_hash mismatch at index",
+    "PAYLOAD_JSON_INVALID": "payload_json invalid at index",
+}
 
-    if ok:
+def print_report(report: Dict[str, Any]) -> None:
+    # 従来の出力形式そのまま（FAIL: 行の文言、at index の位置、EXPECTED/GOT は chain_hash 不一致のみ）
+    status = report["status"]
+    if status in ("DB_NOT_FOUND", "EMPTY"):
+        print(status)
+        return
+    for f in report["failures"]:
+        kind = f["kind"]
+        if kind in ("CHECKPOINT_INVALID", "CHECKPOINT_MISMATCH"):
+            # --incremental のときだけ起きる
+            print("FAIL: checkpoint", "invalid" if kind == "CHECKPOINT_INVALID" else f"mismatch at rowid {f['rowid']}")
+            print("DETAIL:", f["detail"])
+            continue
+        text = LEGACY_FAIL_TEXT[kind]
+        if text.endswith("at index"):
+            print("FAIL:", text, f["index"])
+        else:
+            print("FAIL:", text)
+        if kind in ("GENESIS_CHAIN_HASH_MISMATCH", "CHAIN_HASH_MISMATCH"):
+            print("EXPECTED:", f["expected"])
+            print("GOT:", f["got"])
+    if status == "OK":
         print("OK: governance chain verified")
-        print("ROWS:", len(rows))
-        print("TIP_EVENT_ID:", rows[-1][0])
-        print("TIP_CHAIN_HASH:", rows[-1][6])
+        print("ROWS:", report["rows_verified"])
+        print("TIP_EVENT_ID:", report["tip_event_id"])
+        print("TIP_CHAIN_HASH:", report["tip_chain_hash"])
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--checkpoint", default="", help="checkpoint path (default: <db>.verify_checkpoint.json)")
+    ap.add_argument("--incremental", action="store_true", help="resume from the checkpoint and verify only new rows (writes the checkpoint)")
+    ap.add_argument("--full", action="store_true", help="verify from genesis (default; overrides --incremental)")
+    ap.add_argument("--collect-all", action="store_true", help="report every failure instead of stopping at the first")
+    ap.add_argument("--fetch-rows", type=int, default=FETCH_ROWS, help="rows per fetchmany window")
+    ap.add_argument("--no-checkpoint", action="store_true", help="do not write/update the checkpoint")
+    ap.add_argument("--report", default="", help="write JSON report to this path")
+    ap.add_argument("--json", action="store_true", help="print JSON report instead of text")
+    args = ap.parse_args(argv)
+
+    report = verify_chain(
+        db_path=args.db,
+        checkpoint_path=args.checkpoint,
+        incremental=args.incremental and not args.full,
+        collect_all=args.collect_all,
+        fetch_rows=args.fetch_rows,
+        update_checkpoint=not args.no_checkpoint,
+    )
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", newline="\n") as f:
+            f.write(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print_report(report)
+
+    # FAIL は exit code 1（以前は出力のみで常に 0）
+    return 1 if report["status"] == "FAIL" else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
@@ -3,18 +3,20 @@
 
 import sys
 import json
-import subprocess
 import os
 from typing import Dict, Any
-from governance_writer import append_event
+from governance_client import append_event, append_events
+from governance_writer import open_db, migrate_append_schema
+import governance_chain_verify
 
 ROOT = r"C:\Users\sirok\MoCKA"
-VERIFY_PY = os.path.join(ROOT, "audit", "ed25519", "governance", "governance_chain_verify.py")
 
 def usage() -> int:
     print("USAGE:")
-    print("  python governance_cli.py verify")
+    print("  python governance_cli.py verify [--incremental] [--collect-all] [--json] [--report PATH]")
     print("  python governance_cli.py append EVENT_TYPE PAYLOAD NOTE")
+    print("  python governance_cli.py append-batch EVENTS_JSONL")
+    print("  python governance_cli.py migrate   (lookup indexes + prev_event_id fork guard)")
     print("")
     print("PAYLOAD forms:")
     print("  1) inline JSON string")
@@ -23,11 +25,14 @@ def usage() -> int:
     print("")
     print("EXAMPLE (file):")
     print("  python governance_cli.py append TIP_RESELECT_DECISION @payload.json \"note: ...\"")
+    print("")
+    print("EVENTS_JSONL: @path or - ; one JSON object per line:")
+    print("  {\"event_type\": \"...\", \"payload\": {...}, \"note\": \"note: ...\"}")
     return 2
 
-def cmd_verify() -> int:
-    r = subprocess.run([sys.executable, VERIFY_PY], cwd=ROOT)
-    return r.returncode
+def cmd_verify(argv) -> int:
+    # subprocess を起こさず in-process で検証する
+    return governance_chain_verify.main(argv[2:])
 
 def read_payload_arg(payload_arg: str) -> str:
     if payload_arg == "-":
@@ -69,13 +74,67 @@ def cmd_append(argv) -> int:
     print("EVENT_ID:", eid)
     return 0
 
+def cmd_append_batch(argv) -> int:
+    if len(argv) < 3:
+        return usage()
+
+    text = read_payload_arg(argv[2])
+    batch = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            ev = json.loads(line)
+        except Exception as e:
+            print("BAD_EVENT_JSON at line", lineno)
+            print("ERR:", str(e))
+            return 2
+        if not isinstance(ev, dict) or not isinstance(ev.get("event_type"), str) or not isinstance(ev.get("payload"), dict) or not isinstance(ev.get("note"), str):
+            print("BAD_EVENT at line", lineno, "(need event_type, payload object, note)")
+            return 2
+        if "note:" not in ev["note"]:
+            print("REJECTED: note must include 'note:' prefix at line", lineno)
+            return 2
+        batch.append((ev["event_type"], ev["payload"], ev["note"]))
+
+    if not batch:
+        print("EMPTY_BATCH")
+        return 2
+
+    eids = append_events(batch)
+    print("OK: appended", len(eids), "events")
+    for (event_type, _, _), eid in zip(batch, eids):
+        print("EVENT_ID:", eid, event_type)
+    return 0
+
+def cmd_migrate(argv) -> int:
+    conn = open_db()
+    try:
+        out = migrate_append_schema(conn)
+    finally:
+        conn.close()
+    if out["fork_guard"]:
+        print("OK: governance schema migrated")
+        print("FORK_GUARD: unique prev_event_id index")
+        return 0
+    # fork 済み台帳は cleanup まで一意 index を張れない。append は BEGIN IMMEDIATE + tip 再確認で継続する
+    print("WARN: governance schema migrated without fork guard")
+    print("FORKS:", len(out["forks"]))
+    for prev_event_id, n in out["forks"]:
+        print("FORK_AT:", prev_event_id, "children=", n)
+    return 0
+
 def main(argv) -> int:
     if len(argv) < 2:
         return usage()
     if argv[1] == "verify":
-        return cmd_verify()
+        return cmd_verify(argv)
     if argv[1] == "append":
         return cmd_append(argv)
+    if argv[1] == "append-batch":
+        return cmd_append_batch(argv)
+    if argv[1] == "migrate":
+        return cmd_migrate(argv)
     return usage()
 
 if __name__ == "__main__":
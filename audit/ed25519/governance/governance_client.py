@@ -0,0 +1,104 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_client.py
+# note: Phase14.6 governance service client (falls back to direct write when the service is not running)
+
+import json
+import socket
+from typing import Any, Dict, List, Optional, Tuple
+
+import governance_writer
+from governance_service import SOCKET_PATH
+
+class ServiceUnavailable(Exception):
+    pass
+
+class GovernanceClient:
+    # 1 接続で複数リクエストを順に送れる（長寿命クライアント向け）
+    def __init__(self, socket_path: str = ""):
+        self.socket_path = socket_path or SOCKET_PATH
+        self.sock: Optional[socket.socket] = None
+        self.f = None
+
+    def connect(self) -> "GovernanceClient":
+        if not hasattr(socket, "AF_UNIX"):
+            raise ServiceUnavailable("AF_UNIX not available")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sock.close()
+            raise ServiceUnavailable(str(e))
+        self.sock = sock
+        self.f = sock.makefile("rwb")
+        return self
+
+    def request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        self.f.write(json.dumps(req, ensure_ascii=True).encode("utf-8") + b"\n")
+        self.f.flush()
+        line = self.f.readline()
+        if not line:
+            raise RuntimeError("governance service closed the connection")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError("governance service error: " + str(reply.get("error")))
+        return reply
+
+    def append(self, event_type: str, payload: Dict[str, Any], note: str) -> str:
+        reply = self.request({"op": "append", "event_type": event_type, "payload": payload, "note": note})
+        return reply["event_id"]
+
+    def append_batch(self, batch: List[Tuple[str, Dict[str, Any], str]]) -> List[str]:
+        events = [{"event_type": t, "payload": p, "note": n} for t, p, n in batch]
+        reply = self.request({"op": "append_batch", "events": events})
+        return reply["event_ids"]
+
+    def tip(self) -> Dict[str, Any]:
+        return self.request({"op": "tip"})
+
+    def close(self) -> None:
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self) -> "GovernanceClient":
+        return self.connect()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def append_event(event_type: str, payload: Dict[str, Any], note: str) -> str:
+    # service が起動していればそちら経由、いなければ従来通り governance_writer で直接 append
+    # 接続後のエラーは fallback しない（二重 append を避ける）
+    try:
+        client = GovernanceClient().connect()
+    except ServiceUnavailable:
+        return governance_writer.append_event(event_type, payload, note)
+    try:
+        return client.append(event_type, payload, note)
+    finally:
+        client.close()
+
+def append_events(batch: List[Tuple[str, Dict[str, Any], str]]) -> List[str]:
+    if not batch:
+        return []
+    try:
+        client = GovernanceClient().connect()
+    except ServiceUnavailable:
+        return governance_writer.append_events(batch)
+    try:
+        return client.append_batch(batch)
+    finally:
+        client.close()
+
+def service_tip() -> Optional[Dict[str, Any]]:
+    # service が起動していなければ None
+    try:
+        client = GovernanceClient().connect()
+    except ServiceUnavailable:
+        return None
+    try:
+        return client.tip()
+    finally:
+        client.close()
@@ -5,6 +5,7 @@ import os
 import csv
 import sqlite3
 from datetime import datetime, timezone
+from governance_client import service_tip
 
 ROOT = r"C:\Users\sirok\MoCKA"
 DB_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
@@ -14,6 +15,11 @@ def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 def get_tip() -> tuple[str, str]:
+    # service 起動中は service に tip を問い合わせる（service は毎回 DB の末尾を読むので、直接 append された分も反映される）
+    tip = service_tip()
+    if tip is not None:
+        return tip["event_id"], tip["prev_event_id"]
+
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
     cur.execute("""
@@ -0,0 +1,281 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_csv_mirror.py
+# note: Phase14.6 SQLite mirror of the CSV governance layer (change_log / backup_index / impact_registry)
+#
+# CSV が正（authoritative）。mirror はいつでも CSV から作り直せる検索用のコピー。
+#   mirror: governance_csv_mirror.db
+#     csv_<name>       : CSV 1 行 = 1 row（line_offset = CSV 内の byte offset）
+#     csv_mirror_state : どこまで取り込んだか（byte offset）と fingerprint（csv_tail_sync）、取り込み済み行数
+# CSV が伸びていれば末尾だけ取り込み、縮んだ/書き換えられていれば（fix_*_csv.py の full 修復など）作り直す。
+
+import os
+import csv
+import sys
+import json
+import sqlite3
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+from csv_tail_sync import fingerprint, plan_sync, read_complete
+
+ROOT = r"C:\Users\sirok\MoCKA"
+GOVERNANCE_DIR = os.path.join(ROOT, "audit", "ed25519", "governance")
+MIRROR_PATH = os.path.join(GOVERNANCE_DIR, "governance_csv_mirror.db")
+
+BUSY_TIMEOUT_SEC = 5.0
+
+# name -> CSV columns（各 CSV の header と同じ順）
+CSV_TABLES = {
+    "change_log": ("timestamp_utc", "event_type", "event_id", "prev_event_id", "note"),
+    "backup_index": ("timestamp_utc", "backup_id", "artifact_path", "sha256_hex", "event_id", "note"),
+    "impact_registry": ("timestamp_utc", "scope", "artifact_path", "impact_level", "event_id", "note"),
+}
+
+# name -> indexed column tuples
+CSV_INDEXES = {
+    "change_log": [("event_id",), ("prev_event_id",)],
+    "backup_index": [("event_id",), ("artifact_key", "timestamp_utc"), ("sha256_hex",), ("backup_id",)],
+    "impact_registry": [("event_id",), ("artifact_key", "timestamp_utc")],
+}
+
+def csv_path_for(name: str, csv_dir: str = "") -> str:
+    return os.path.join(csv_dir or GOVERNANCE_DIR, name + ".csv")
+
+def artifact_key(path: str) -> str:
+    # normalize_impact_registry_paths.py と同じ \.\ 除去（同じファイルの表記揺れを 1 つにまとめる）
+    return path.strip().replace(r"\.\audit", r"\audit").replace(r"\.\docs", r"\docs")
+
+# -------------------------
+# schema
+# -------------------------
+
+def ensure_schema(cur: sqlite3.Cursor) -> None:
+    for name, cols in CSV_TABLES.items():
+        extra = ", artifact_key TEXT NOT NULL" if "artifact_path" in cols else ""
+        col_sql = ", ".join(f"{c} TEXT NOT NULL" for c in cols)
+        cur.execute(f"CREATE TABLE IF NOT EXISTS csv_{name} (line_offset INTEGER PRIMARY KEY, {col_sql}{extra})")
+        for idx_cols in CSV_INDEXES[name]:
+            cur.execute(f"CREATE INDEX IF NOT EXISTS idx_csv_{name}_{'_'.join(idx_cols)} ON csv_{name}({', '.join(idx_cols)})")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS csv_mirror_state (
+            csv_name TEXT PRIMARY KEY,
+            indexed_offset INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            row_count INTEGER
+        )
+    """)
+    # row_count 追加前の mirror: 列だけ足す（NULL の間は次の sync で 1 回だけ数える）
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(csv_mirror_state)").fetchall()]
+    if "row_count" not in cols:
+        cur.execute("ALTER TABLE csv_mirror_state ADD COLUMN row_count INTEGER")
+
+def open_mirror(mirror_path: str = "") -> sqlite3.Connection:
+    conn = sqlite3.connect(mirror_path or MIRROR_PATH, timeout=BUSY_TIMEOUT_SEC, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SEC * 1000)}")
+    ensure_schema(conn.cursor())
+    return conn
+
+# -------------------------
+# tailing
+# -------------------------
+
+def parse_line(name: str, s: str) -> Optional[List[str]]:
+    # data 行だけ返す。header / init note / preserved_unparsed_line は None
+    if not s.startswith("20"):
+        return None
+    cols = CSV_TABLES[name]
+    fields = next(csv.reader([s]))
+    if len(fields) < len(cols):
+        return None
+    if len(fields) > len(cols):
+        # note に quote されていない , が入っている行
+        fields = fields[:len(cols) - 1] + [",".join(fields[len(cols) - 1:])]
+    return fields
+
+def mirror_range(cur: sqlite3.Cursor, name: str, f, start: int) -> Tuple[int, int]:
+    # start から最後の改行までを取り込み、(取り込み済み offset, 追加行数) を返す（改行で終わらない末尾行は次回）
+    data = read_complete(f, start)
+    end = len(data)
+    if end == 0:
+        return start, 0
+
+    cols = CSV_TABLES[name]
+    has_key = "artifact_path" in cols
+    rows = []
+    pos = 0
+    while pos < end:
+        nl = data.index(b"\n", pos)
+        line = data[pos:nl]
+        line_offset = start + pos
+        pos = nl + 1
+        # 修復前の CSV に残っている単独 \r も行区切りとして扱う
+        for part in line.split(b"\r"):
+            fields = parse_line(name, part.decode("utf-8", errors="replace").strip())
+            if fields is not None:
+                row = [line_offset] + [x.strip() for x in fields]
+                if has_key:
+                    row.append(artifact_key(fields[cols.index("artifact_path")]))
+                rows.append(row)
+            line_offset += len(part) + 1
+
+    names = ("line_offset",) + cols + (("artifact_key",) if has_key else ())
+    sql = f"INSERT OR REPLACE INTO csv_{name} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+    cur.executemany(sql, rows)
+    return start + end, len(rows)
+
+def sync_table(cur: sqlite3.Cursor, name: str, csv_path: str, rebuild: bool = False) -> Dict[str, Any]:
+    # 呼び出し側のトランザクション内で使う
+    # 行数は state に持ち、rows_added で更新する（毎回の COUNT(*) はしない）
+    cur.execute("SELECT indexed_offset, fingerprint, row_count FROM csv_mirror_state WHERE csv_name = ?", (name,))
+    state = cur.fetchone()
+
+    if not os.path.exists(csv_path):
+        cur.execute(f"DELETE FROM csv_{name}")
+        cur.execute("DELETE FROM csv_mirror_state WHERE csv_name = ?", (name,))
+        return {"mode": "missing", "offset": 0, "rows_added": 0, "rows": 0}
+
+    with open(csv_path, "rb") as f:
+        mode, start = plan_sync(f, state[:2] if state else None, rebuild)
+        rows = 0
+        if mode != "rebuild":
+            rows = state[2]
+            if rows is None:
+                rows = cur.execute(f"SELECT COUNT(*) FROM csv_{name}").fetchone()[0]
+        if mode == "current":
+            if state[2] is None:
+                cur.execute("UPDATE csv_mirror_state SET row_count = ? WHERE csv_name = ?", (rows, name))
+            return {"mode": mode, "offset": start, "rows_added": 0, "rows": rows}
+        if mode == "rebuild":
+            cur.execute(f"DELETE FROM csv_{name}")
+        offset, added = mirror_range(cur, name, f, start)
+        rows += added
+        cur.execute("""
+            INSERT INTO csv_mirror_state (csv_name, indexed_offset, fingerprint, row_count) VALUES (?, ?, ?, ?)
+            ON CONFLICT(csv_name) DO UPDATE SET indexed_offset = excluded.indexed_offset, fingerprint = excluded.fingerprint, row_count = excluded.row_count
+        """, (name, offset, fingerprint(f, offset), rows))
+    return {"mode": mode, "offset": offset, "rows_added": added, "rows": rows}
+
+def sync_mirror(conn: sqlite3.Connection, csv_dir: str = "", rebuild: bool = False) -> Dict[str, Dict[str, Any]]:
+    # 3 CSV を 1 トランザクションで追いつかせる
+    cur = conn.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        out = {name: sync_table(cur, name, csv_path_for(name, csv_dir), rebuild) for name in CSV_TABLES}
+        cur.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+    return out
+
+def connect(mirror_path: str = "", csv_dir: str = "", sync: bool = True) -> sqlite3.Connection:
+    conn = open_mirror(mirror_path)
+    if sync:
+        sync_mirror(conn, csv_dir)
+    return conn
+
+# -------------------------
+# queries
+# -------------------------
+
+def rows_as_dicts(cur: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    names = [d[0] for d in cur.description]
+    return [dict(zip(names, r)) for r in cur.fetchall()]
+
+def bound_to_tip(conn: sqlite3.Connection, event_id: str) -> Dict[str, Any]:
+    # TIP（event_id）に紐づいた change_log / backup_index / impact_registry 行
+    out = {"event_id": event_id}
+    for name in CSV_TABLES:
+        cur = conn.execute(f"SELECT * FROM csv_{name} WHERE event_id = ? ORDER BY line_offset", (event_id,))
+        out[name] = rows_as_dicts(cur)
+    return out
+
+def latest_backup(conn: sqlite3.Connection, path: str) -> Optional[Dict[str, Any]]:
+    cur = conn.execute("""
+        SELECT * FROM csv_backup_index
+        WHERE artifact_key = ?
+        ORDER BY timestamp_utc DESC, line_offset DESC
+        LIMIT 1
+    """, (artifact_key(path),))
+    rows = rows_as_dicts(cur)
+    return rows[0] if rows else None
+
+def artifact_history(conn: sqlite3.Connection, path: str) -> Dict[str, Any]:
+    key = artifact_key(path)
+    out = {"artifact_path": key}
+    for name in ("backup_index", "impact_registry"):
+        cur = conn.execute(f"SELECT * FROM csv_{name} WHERE artifact_key = ? ORDER BY timestamp_utc, line_offset", (key,))
+        out[name] = rows_as_dicts(cur)
+    return out
+
+def backups_by_sha256(conn: sqlite3.Connection, sha256: str) -> List[Dict[str, Any]]:
+    cur = conn.execute("SELECT * FROM csv_backup_index WHERE sha256_hex = ? ORDER BY line_offset", (sha256,))
+    return rows_as_dicts(cur)
+
+def query_plans(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    plans = {}
+    probes = {
+        "bound_to_tip(change_log)": ("SELECT * FROM csv_change_log WHERE event_id = ? ORDER BY line_offset", ("x",)),
+        "bound_to_tip(backup_index)": ("SELECT * FROM csv_backup_index WHERE event_id = ? ORDER BY line_offset", ("x",)),
+        "bound_to_tip(impact_registry)": ("SELECT * FROM csv_impact_registry WHERE event_id = ? ORDER BY line_offset", ("x",)),
+        "latest_backup": ("SELECT * FROM csv_backup_index WHERE artifact_key = ? ORDER BY timestamp_utc DESC, line_offset DESC LIMIT 1", ("x",)),
+        "artifact_history(impact_registry)": ("SELECT * FROM csv_impact_registry WHERE artifact_key = ? ORDER BY timestamp_utc, line_offset", ("x",)),
+        "backups_by_sha256": ("SELECT * FROM csv_backup_index WHERE sha256_hex = ? ORDER BY line_offset", ("x",)),
+    }
+    for label, (sql, params) in probes.items():
+        plans[label] = [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+    return plans
+
+def resolve_path(path: str) -> str:
+    # backup_index_append_file.py と同じく、相対パスは ROOT 基準
+    return path if os.path.isabs(path) or path.startswith(ROOT) else os.path.join(ROOT, path)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mirror", default=MIRROR_PATH)
+    ap.add_argument("--csv-dir", default=GOVERNANCE_DIR)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("sync", help="mirror bytes appended to the CSVs since the last sync")
+    sub.add_parser("rebuild", help="drop the mirror tables and re-read every CSV")
+    sub.add_parser("plan", help="print EXPLAIN QUERY PLAN for every lookup")
+
+    p_tip = sub.add_parser("tip", help="rows bound to a TIP event_id")
+    p_tip.add_argument("event_id")
+
+    p_latest = sub.add_parser("latest-backup", help="latest backup_index row for an artifact path")
+    p_latest.add_argument("path")
+
+    p_hist = sub.add_parser("history", help="backup_index / impact_registry rows for an artifact path")
+    p_hist.add_argument("path")
+
+    p_sha = sub.add_parser("sha256", help="backup_index rows with this sha256")
+    p_sha.add_argument("sha256_hex")
+
+    args = ap.parse_args(argv)
+
+    conn = open_mirror(args.mirror)
+    try:
+        synced = sync_mirror(conn, args.csv_dir, rebuild=args.cmd == "rebuild")
+        if args.cmd in ("sync", "rebuild"):
+            out: Any = {"status": "OK", "mirror": args.mirror, "tables": synced}
+        elif args.cmd == "plan":
+            out = query_plans(conn)
+        elif args.cmd == "tip":
+            out = bound_to_tip(conn, args.event_id)
+        elif args.cmd == "latest-backup":
+            out = latest_backup(conn, resolve_path(args.path))
+            if out is None:
+                print("NOT_FOUND:", args.path)
+                return 1
+        elif args.cmd == "history":
+            out = artifact_history(conn, resolve_path(args.path))
+        else:
+            out = backups_by_sha256(conn, args.sha256_hex)
+    finally:
+        conn.close()
+
+    print(json.dumps(out, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
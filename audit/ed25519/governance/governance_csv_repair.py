@@ -0,0 +1,165 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_csv_repair.py
+# note: Phase14.6 shared repair for governance CSVs (change_log / backup_index / impact_registry)
+#
+# 破損は常に追記側（末尾）に出るので、前回修復後の last-known-good offset を sidecar に残し、
+# 次回はそこから先だけを正規化する。
+#   sidecar: <csv>.repair_state.json
+#     offset       : 正規化済みの末尾 byte offset
+#     fingerprint  : offset と直前の bytes の sha256（csv_tail_sync。prefix が変わっていないことの確認）
+# prefix が一致しない / sidecar が無い場合は従来通り全体を正規化する。
+
+import os
+import json
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from csv_tail_sync import fingerprint, plan_sync
+
+STATE_SCHEMA = "mocka.governance.csv_repair_state.v1"
+COPY_CHUNK = 8 * 1024 * 1024
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def state_path(csv_path: str) -> str:
+    return csv_path + ".repair_state.json"
+
+def load_state(csv_path: str) -> Optional[Dict[str, Any]]:
+    p = state_path(csv_path)
+    if not os.path.exists(p):
+        return None
+    try:
+        with open(p, "r", encoding="utf-8") as f:
+            st = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(st, dict) or st.get("schema") != STATE_SCHEMA:
+        return None
+    return st
+
+def save_state(csv_path: str, offset: int, fingerprint: str) -> None:
+    body = {
+        "schema": STATE_SCHEMA,
+        "offset": offset,
+        "fingerprint": fingerprint,
+        "repaired_at_utc": utc_now_iso(),
+    }
+    write_atomic(state_path(csv_path), [(json.dumps(body, indent=2, sort_keys=True) + "\n").encode("utf-8")])
+
+def write_atomic(path: str, chunks, prefix_from: Optional[str] = None, prefix_len: int = 0) -> None:
+    # temp file に書いて fsync -> os.replace（途中で落ちても元ファイルは壊れない）
+    d = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=d)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            if prefix_from is not None and prefix_len > 0:
+                with open(prefix_from, "rb") as src:
+                    remaining = prefix_len
+                    while remaining > 0:
+                        b = src.read(min(COPY_CHUNK, remaining))
+                        if not b:
+                            raise RuntimeError("prefix shrank during repair: " + prefix_from)
+                        out.write(b)
+                        remaining -= len(b)
+            for c in chunks:
+                out.write(c)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+# -------------------------
+# normalization
+# -------------------------
+
+def split_lines(raw: str) -> List[str]:
+    out = []
+    for ln in raw.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        s = ln.strip()
+        if s:
+            out.append(s)
+    return out
+
+def normalize_lines(lines: List[str], header: str, init_note: str, is_data: Callable[[str], bool]) -> List[str]:
+    # header / init note はここでは出さない（full 修復時に先頭へ付ける）
+    out = []
+    for s in lines:
+        if s == header or s == init_note:
+            continue
+
+        # header+initnote+data が1行に潰れているケースを救済
+        if s.startswith(init_note + "20") and is_data(s[len(init_note):].lstrip()):
+            s = s[len(init_note):].lstrip()
+
+        if is_data(s):
+            out.append(s)
+            continue
+
+        # 想定外行は note として保持（証跡を捨てない）
+        out.append("note: preserved_unparsed_line: " + s)
+    return out
+
+# -------------------------
+# repair
+# -------------------------
+
+def repair_full(csv_path: str, header: str, init_note: str, is_data: Callable[[str], bool]) -> Dict[str, Any]:
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    normalized = [header, init_note] + normalize_lines(split_lines(raw.decode("utf-8", errors="replace")), header, init_note, is_data)
+    data = ("\n".join(normalized) + "\n").encode("utf-8")
+    if data != raw:
+        write_atomic(csv_path, [data])
+
+    with open(csv_path, "rb") as f:
+        fp = fingerprint(f, len(data))
+    save_state(csv_path, len(data), fp)
+    return {"mode": "full", "rewritten": data != raw, "offset": len(data), "tail_bytes": len(raw), "tail_lines": len(normalized)}
+
+def repair_tail(csv_path: str, header: str, init_note: str, is_data: Callable[[str], bool], full: bool = False) -> Dict[str, Any]:
+    # sidecar の offset より後ろだけを正規化する。prefix が一致しなければ full に落とす
+    st = None if full else load_state(csv_path)
+    if st is None:
+        return repair_full(csv_path, header, init_note, is_data)
+
+    with open(csv_path, "rb") as f:
+        mode, offset = plan_sync(f, (st["offset"], st["fingerprint"]))
+        if mode != "rebuild":
+            f.seek(offset)
+            tail_raw = f.read()
+    if mode == "rebuild":
+        r = repair_full(csv_path, header, init_note, is_data)
+        r["mode"] = "full_fallback"
+        return r
+
+    tail_lines = normalize_lines(split_lines(tail_raw.decode("utf-8", errors="replace")), header, init_note, is_data)
+    tail = ("\n".join(tail_lines) + "\n").encode("utf-8") if tail_lines else b""
+
+    rewritten = tail != tail_raw
+    if rewritten:
+        write_atomic(csv_path, [tail], prefix_from=csv_path, prefix_len=offset)
+
+    end = offset + len(tail)
+    with open(csv_path, "rb") as f:
+        fp = fingerprint(f, end)
+    save_state(csv_path, end, fp)
+    return {"mode": "tail", "rewritten": rewritten, "offset": end, "tail_bytes": len(tail_raw), "tail_lines": len(tail_lines)}
+
+def repair_main(argv: List[str], csv_path: str, name: str, header: str, init_note: str, is_data: Callable[[str], bool]) -> Optional[Dict[str, Any]]:
+    # fix_*_csv.py 共通の入口。--full で sidecar を無視して全体を正規化する
+    if not os.path.exists(csv_path):
+        print("CSV_NOT_FOUND")
+        return None
+
+    r = repair_tail(csv_path, header, init_note, is_data, full="--full" in argv[1:])
+
+    print(f"OK: {name} normalized")
+    print("PATH:", csv_path)
+    print("MODE:", r["mode"])
+    print("REWRITTEN:", r["rewritten"])
+    print("TAIL_BYTES:", r["tail_bytes"])
+    return r
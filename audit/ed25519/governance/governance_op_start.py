@@ -1,7 +1,7 @@
 # C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_op_start.py
 # note: Phase14.6 Roadmap-3 Operation start event
 
-from governance_writer import append_event
+from governance_client import append_event
 
 def main():
     payload = {
@@ -4,7 +4,7 @@
 import sys
 import os
 import json
-from governance_writer import append_event
+from governance_client import append_event
 
 ROOT = r"C:\Users\sirok\MoCKA"
 
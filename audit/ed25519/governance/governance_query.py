@@ -0,0 +1,180 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_query.py
+# note: Phase15 governance decision lookups via governance_payload_index (index probes, no JSON full scan)
+
+import sys
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from governance_writer import (
+    DB_PATH,
+    PAYLOAD_INDEX_KEYS,
+    PAYLOAD_INDEX_STATE_TABLE,
+    PAYLOAD_INDEX_TABLE,
+    ensure_payload_index_schema,
+    open_db,
+    sync_payload_index,
+)
+
+DECISION_TYPES = ("CLASSIFICATION_CHANGE_DECISION", "QUARANTINE_ACTION_DECISION")
+EVENT_COLUMNS = "e.rowid, e.event_id, e.prev_event_id, e.timestamp_utc, e.event_type, e.payload_json, e.note, e.chain_hash"
+
+def sync_index(conn: sqlite3.Connection) -> int:
+    # writer 以外で書かれた行があれば追いつかせる（通常は 0 行）
+    cur = conn.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        ensure_payload_index_schema(cur)
+        n = sync_payload_index(cur)
+        cur.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+    return n
+
+def connect(db_path: str = "", sync: bool = False) -> sqlite3.Connection:
+    # 既定は read-only（lookup は writer を止めず、読み取り専用の台帳 copy にも使える）
+    # sync=True のときだけ書き込み可能で開き、索引を追いつかせる
+    if sync:
+        conn = open_db(db_path or DB_PATH)
+        sync_index(conn)
+        return conn
+    db_path = db_path or DB_PATH
+    if not Path(db_path).exists():
+        raise RuntimeError("governance.db not found: " + db_path)
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+def index_lag(conn: sqlite3.Connection) -> Optional[int]:
+    # 書き込まずに、索引にまだ入っていない台帳行の数を返す（索引が未作成なら None）
+    # rowid の範囲検索なので、コストは遅れている行数に比例する（通常は 0）
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (PAYLOAD_INDEX_STATE_TABLE,))
+    if cur.fetchone() is None:
+        return None
+    cur.execute(f"SELECT last_rowid FROM {PAYLOAD_INDEX_STATE_TABLE} WHERE id = 1")
+    row = cur.fetchone()
+    if row is None:
+        return None
+    cur.execute("SELECT COUNT(*) FROM governance_ledger_event WHERE rowid > ?", (row[0],))
+    return cur.fetchone()[0]
+
+def row_to_event(row) -> Dict[str, Any]:
+    rowid, event_id, prev_event_id, ts, event_type, payload_json, note, chain_hash = row
+    return {
+        "rowid": rowid,
+        "event_id": event_id,
+        "prev_event_id": prev_event_id,
+        "timestamp_utc": ts,
+        "event_type": event_type,
+        "payload": json.loads(payload_json),
+        "note": note,
+        "chain_hash": chain_hash,
+    }
+
+# -------------------------
+# lookups
+# -------------------------
+
+def payload_lookup_sql(event_types: Optional[Sequence[str]]) -> str:
+    sql = f"""
+        SELECT {EVENT_COLUMNS}
+        FROM {PAYLOAD_INDEX_TABLE} AS i
+        JOIN governance_ledger_event AS e ON e.rowid = i.event_rowid
+        WHERE i.key = ? AND i.value = ?
+    """
+    if event_types:
+        sql += " AND i.event_type IN (" + ",".join("?" for _ in event_types) + ")"
+    return sql + " ORDER BY i.event_rowid ASC"
+
+def events_by_payload(conn: sqlite3.Connection, key: str, value: str, event_types: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    # payload[key] == value の行を台帳順で返す。key は PAYLOAD_INDEX_KEYS のいずれか
+    if key not in PAYLOAD_INDEX_KEYS:
+        raise ValueError(f"payload key not indexed: {key} (indexed: {', '.join(PAYLOAD_INDEX_KEYS)})")
+    cur = conn.cursor()
+    cur.execute(payload_lookup_sql(event_types), [key, value] + list(event_types or []))
+    return [row_to_event(r) for r in cur.fetchall()]
+
+def decisions_for_target(conn: sqlite3.Connection, target_event_id: str, event_types: Sequence[str] = DECISION_TYPES) -> List[Dict[str, Any]]:
+    return events_by_payload(conn, "target_event_id", target_event_id, event_types)
+
+def decision_targets(conn: sqlite3.Connection, event_types: Sequence[str] = DECISION_TYPES) -> List[str]:
+    # decision が 1 件以上ある target_event_id の一覧（索引のみで完結）
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT DISTINCT value
+        FROM {PAYLOAD_INDEX_TABLE}
+        WHERE key = 'target_event_id' AND event_type IN ({",".join("?" for _ in event_types)})
+        ORDER BY value ASC
+    """, list(event_types))
+    return [r[0] for r in cur.fetchall()]
+
+def query_plans(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    # 各 lookup の EXPLAIN QUERY PLAN（governance_ledger_event の全件 SCAN が無いことの確認用）
+    probes = {
+        "decisions_for_target": (payload_lookup_sql(DECISION_TYPES), ["target_event_id", "x"] + list(DECISION_TYPES)),
+        "events_by_payload": (payload_lookup_sql(None), ["proof_tip", "x"]),
+        "events_by_type": ("SELECT rowid FROM governance_ledger_event WHERE event_type IN (?, ?)", list(DECISION_TYPES)),
+    }
+    cur = conn.cursor()
+    out = {}
+    for name, (sql, params) in probes.items():
+        cur.execute("EXPLAIN QUERY PLAN " + sql, params)
+        out[name] = [r[-1] for r in cur.fetchall()]
+    return out
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DB_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("sync", help="index rows not yet in governance_payload_index")
+    sub.add_parser("plan", help="print EXPLAIN QUERY PLAN for every lookup")
+    sub.add_parser("targets", help="target_event_id values that have decisions")
+
+    p_target = sub.add_parser("target", help="decisions for a target_event_id")
+    p_target.add_argument("--event-id", required=True)
+    p_target.add_argument("--event-type", action="append", default=[], help="repeatable (default: classification/quarantine decisions)")
+
+    p_key = sub.add_parser("by-key", help="events whose payload[key] == value")
+    p_key.add_argument("--key", required=True, choices=PAYLOAD_INDEX_KEYS)
+    p_key.add_argument("--value", required=True)
+    p_key.add_argument("--event-type", action="append", default=[], help="repeatable (default: any)")
+
+    args = ap.parse_args(argv)
+
+    # 索引の更新（書き込み）は sync だけが行う。lookup は read-only で開き、索引の遅れは警告だけ出す
+    try:
+        conn = open_db(args.db) if args.cmd == "sync" else connect(args.db)
+    except RuntimeError as e:
+        print("ERROR:", str(e))
+        return 2
+    try:
+        if args.cmd != "sync":
+            lag = index_lag(conn)
+            if lag is None:
+                print(f"ERROR: {PAYLOAD_INDEX_TABLE} not built (run: governance_query.py --db {args.db} sync)")
+                return 2
+            if lag:
+                print(f"WARN: {lag} ledger row(s) not in {PAYLOAD_INDEX_TABLE} yet; results may be incomplete (run: governance_query.py --db {args.db} sync)", file=sys.stderr)
+
+        if args.cmd == "sync":
+            out: Any = {"status": "OK", "indexed_rows": sync_index(conn)}
+        elif args.cmd == "plan":
+            out = query_plans(conn)
+        elif args.cmd == "targets":
+            out = decision_targets(conn)
+        elif args.cmd == "target":
+            out = decisions_for_target(conn, args.event_id, args.event_type or DECISION_TYPES)
+        else:
+            out = events_by_payload(conn, args.key, args.value, args.event_type or None)
+    finally:
+        conn.close()
+
+    print(json.dumps(out, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\governance_service.py
+# note: Phase14.6 governance ledger service (long-lived writer, queued appends, group commit)
+#
+# 1 プロセスが governance.db の接続を保持し、Unix socket で受けた append を
+# 単一 writer thread で直列化する。キューに溜まった分はまとめて 1 トランザクションで commit する。
+#
+# protocol: 1 行 1 JSON（改行区切り）。1 接続で複数リクエスト可。
+#   {"op": "append", "event_type": "...", "payload": {...}, "note": "note: ..."} -> {"ok": true, "event_id": "..."}
+#   {"op": "append_batch", "events": [{"event_type": ..., "payload": ..., "note": ...}, ...]} -> {"ok": true, "event_ids": [...]}
+#   {"op": "tip"}  -> {"ok": true, "event_id": "...", "prev_event_id": "...", "chain_hash": "..."}
+#   {"op": "ping"} -> {"ok": true}
+#   エラー時は {"ok": false, "error": "..."}
+
+import os
+import sys
+import json
+import queue
+import signal
+import socket
+import sqlite3
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from governance_writer import DB_PATH, BUSY_TIMEOUT_SEC, open_db, append_in_transaction, event_item_error
+
+ROOT = r"C:\Users\sirok\MoCKA"
+SOCKET_PATH = os.environ.get(
+    "MOCKA_GOVERNANCE_SOCKET",
+    os.path.join(ROOT, "audit", "ed25519", "governance", "governance.sock"),
+)
+GROUP_MAX = 256
+
+class PendingAppend:
+    # items: [(event_type, payload, note)]。batch は分割せず同じトランザクションに入れる
+    def __init__(self, items: List[Tuple[str, Dict[str, Any], str]], batch: bool = False):
+        self.items = items
+        self.batch = batch
+        self.done = threading.Event()
+        self.reply: Dict[str, Any] = {}
+
+    def finish(self, reply: Dict[str, Any]) -> None:
+        self.reply = reply
+        self.done.set()
+
+def event_error(ev: Any) -> str:
+    if not isinstance(ev, dict):
+        return "event must be object"
+    if not isinstance(ev.get("event_type"), str) or not ev.get("event_type"):
+        return "event_type must be non-empty string"
+    if not isinstance(ev.get("payload"), dict):
+        return "payload must be object"
+    if not isinstance(ev.get("note"), str):
+        return "note must be string"
+    # queue に入れる前（BEGIN IMMEDIATE の前）に弾き、そのリクエストだけを失敗させる
+    return event_item_error(ev["event_type"], ev["payload"], ev["note"])
+
+class GovernanceService:
+    def __init__(self, db_path: str, socket_path: str, group_max: int = GROUP_MAX):
+        if not os.path.exists(db_path):
+            raise RuntimeError("governance.db not found: " + db_path)
+        self.db_path = db_path
+        self.socket_path = socket_path
+        self.group_max = group_max
+        self.queue: "queue.Queue[Optional[PendingAppend]]" = queue.Queue()
+        self.stopping = threading.Event()
+        self.server: Optional[socket.socket] = None
+        self.stats = {"appended": 0, "commits": 0}
+
+        # 接続は writer thread だけが使う（WAL / busy_timeout は open_db が設定）
+        self.conn = open_db(db_path, check_same_thread=False)
+        # "tip" 応答用の読み取り接続。WAL なので writer の commit を待たない
+        self.read_conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SEC, check_same_thread=False)
+        self.read_lock = threading.Lock()
+        self.read_tip()
+
+    # -------------------------
+    # tip
+    # -------------------------
+
+    def read_tip(self) -> Dict[str, str]:
+        # 他プロセス（governance_writer / CLI）が直接 append していても最新を返すよう、毎回 DB から読む
+        # rowid の末尾 1 行なので index seek 1 回
+        with self.read_lock:
+            cur = self.read_conn.cursor()
+            cur.execute("""
+                SELECT event_id, prev_event_id, chain_hash
+                FROM governance_ledger_event
+                ORDER BY rowid DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+        if not row:
+            raise RuntimeError("governance ledger empty")
+        return {"event_id": row[0], "prev_event_id": row[1], "chain_hash": row[2]}
+
+    # -------------------------
+    # writer side
+    # -------------------------
+
+    def next_group(self) -> List[PendingAppend]:
+        item = self.queue.get()
+        if item is None:
+            return []
+        group = [item]
+        n = len(item.items)
+        while n < self.group_max:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.queue.put(None)
+                break
+            group.append(item)
+            n += len(item.items)
+        return group
+
+    def commit_group(self, group: List[PendingAppend]) -> None:
+        # 他プロセスが直接 append している可能性があるので、tip は BEGIN IMMEDIATE 内で読み直す
+        try:
+            rows = append_in_transaction(self.conn, [it for p in group for it in p.items])
+        except Exception as e:
+            if len(group) > 1:
+                # 事前検査をすり抜けた失敗でも他のリクエストを巻き添えにしない: 1 リクエストずつ commit し直す
+                for p in group:
+                    self.commit_group([p])
+                return
+            for p in group:
+                p.finish({"ok": False, "error": f"{type(e).__name__}: {e}"})
+            return
+
+        self.stats["appended"] += len(rows)
+        self.stats["commits"] += 1
+        pos = 0
+        for p in group:
+            event_ids = [row[0] for row in rows[pos:pos + len(p.items)]]
+            pos += len(p.items)
+            p.finish({"ok": True, "event_ids": event_ids} if p.batch else {"ok": True, "event_id": event_ids[0]})
+
+    def writer_loop(self) -> None:
+        while True:
+            group = self.next_group()
+            if not group:
+                return
+            self.commit_group(group)
+
+    # -------------------------
+    # socket side
+    # -------------------------
+
+    def handle_request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        op = req.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "tip":
+            return dict(self.read_tip(), ok=True)
+        if op in ("append", "append_batch"):
+            events = req.get("events") if op == "append_batch" else [req]
+            if not isinstance(events, list) or not events:
+                return {"ok": False, "error": "events must be non-empty list"}
+            items = []
+            for i, ev in enumerate(events):
+                err = event_error(ev)
+                if err:
+                    return {"ok": False, "error": err if op == "append" else f"events[{i}]: {err}"}
+                items.append((ev["event_type"], ev["payload"], ev["note"]))
+            if self.stopping.is_set():
+                return {"ok": False, "error": "service stopping"}
+            p = PendingAppend(items, batch=(op == "append_batch"))
+            self.queue.put(p)
+            p.done.wait()
+            return p.reply
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def client_loop(self, sock: socket.socket) -> None:
+        with sock:
+            f = sock.makefile("rwb")
+            for line in f:
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        raise ValueError("request must be object")
+                    reply = self.handle_request(req)
+                except Exception as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                try:
+                    f.write(json.dumps(reply, ensure_ascii=True).encode("utf-8") + b"\n")
+                    f.flush()
+                except OSError:
+                    return
+
+    def bind(self) -> None:
+        if os.path.exists(self.socket_path):
+            # 生きている service がいれば二重起動しない。応答が無ければ残骸として消す
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                probe.close()
+                raise RuntimeError("governance service already running: " + self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.socket_path)
+            finally:
+                probe.close()
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen(128)
+
+    def serve_forever(self) -> None:
+        self.bind()
+        writer = threading.Thread(target=self.writer_loop, name="governance-writer", daemon=True)
+        writer.start()
+        try:
+            while not self.stopping.is_set():
+                try:
+                    sock, _ = self.server.accept()
+                except OSError:
+                    break
+                threading.Thread(target=self.client_loop, args=(sock,), daemon=True).start()
+        finally:
+            self.stopping.set()
+            self.queue.put(None)
+            writer.join()
+            self.conn.close()
+            self.read_conn.close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        self.stopping.set()
+        if self.server is not None:
+            try:
+                self.server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.server.close()
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--socket", default=SOCKET_PATH)
+    ap.add_argument("--group-max", type=int, default=GROUP_MAX, help="max appends per commit")
+    args = ap.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("ERROR: AF_UNIX sockets not available on this platform")
+        return 2
+
+    svc = GovernanceService(args.db, args.socket, args.group_max)
+
+    def on_signal(signum, frame):
+        svc.shutdown()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    print("OK: governance service listening")
+    print("SOCKET:", args.socket)
+    print("TIP_EVENT_ID:", svc.read_tip()["event_id"])
+    sys.stdout.flush()
+
+    svc.serve_forever()
+
+    print("OK: governance service stopped")
+    print("APPENDED:", svc.stats["appended"])
+    print("COMMITS:", svc.stats["commits"])
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,25 +2,168 @@
 # note: Phase14.6 Roadmap-2 Governance Ledger Writer (append-only)
 
 import os
+import sys
+import time
+import random
 import sqlite3
 import hashlib
 import json
 from datetime import datetime, timezone
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 
 ROOT = r"C:\Users\sirok\MoCKA"
 DB_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
 
+# 同時 append 対策: WAL + BEGIN IMMEDIATE で tip を予約し、busy はリトライする
+BUSY_TIMEOUT_SEC = 5.0
+RETRY_MAX = 8
+RETRY_BASE_SEC = 0.01
+APPEND_STATS = {"retries": 0}
+
+# payload_json 内で照合に使うキーは side table に (key, value) で展開しておく（append と同じトランザクションで更新）
+PAYLOAD_INDEX_TABLE = "governance_payload_index"
+PAYLOAD_INDEX_STATE_TABLE = "governance_payload_index_state"
+PAYLOAD_INDEX_KEYS = ("target_event_id", "proof_tip", "proof_tip_selected", "action", "proof_action")
+
 def sha256_hex(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def open_db() -> sqlite3.Connection:
-    if not os.path.exists(DB_PATH):
-        raise RuntimeError("governance.db not found: " + DB_PATH)
-    return sqlite3.connect(DB_PATH)
+PREV_EVENT_ID_UNIQUE_INDEX = "idx_governance_ledger_event_prev_event_id"
+PREV_EVENT_ID_LOOKUP_INDEX = "idx_governance_ledger_event_prev_event_id_lookup"
+_FORK_GUARD_WARNED = False
+
+def enable_wal(cur: sqlite3.Cursor) -> None:
+    # 書き込み側（append / migrate）だけが呼ぶ。トランザクションの外で実行する
+    # journal_mode は DB ファイルに残る設定なので、切り替え済みなら読むだけ
+    cur.execute("PRAGMA journal_mode=WAL")
+
+def ensure_append_schema(cur: sqlite3.Cursor) -> None:
+    # append のたびに BEGIN IMMEDIATE 内で通る。append が更新する side table だけを用意し、index は作らない
+    # （index は migrate_append_schema で明示的に作る。既存の fork/orphan 行があっても append は止めない）
+    ensure_payload_index_schema(cur)
+
+def find_forks(cur: sqlite3.Cursor) -> List[Tuple[str, int]]:
+    # 同じ prev_event_id から 2 本以上の枝が生えている箇所（docs/ORPHAN_EVENTS_20260223.md 参照）
+    cur.execute("""
+        SELECT prev_event_id, COUNT(*)
+        FROM governance_ledger_event
+        GROUP BY prev_event_id
+        HAVING COUNT(*) > 1
+    """)
+    return [(r[0], r[1]) for r in cur.fetchall()]
+
+def has_fork_guard(cur: sqlite3.Cursor) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (PREV_EVENT_ID_UNIQUE_INDEX,))
+    return cur.fetchone() is not None
+
+def migrate_append_schema(conn: sqlite3.Connection) -> Dict[str, Any]:
+    # 明示的な migration（governance_cli.py migrate）。conn は open_db() で開いたもの
+    # fork が無ければ prev_event_id に一意 index を張り、DB 側でも 2 本目の枝を拒否する
+    # fork が既にある台帳では一意 index は張れないので、tip 再確認用の通常 index だけを張って警告を返す
+    cur = conn.cursor()
+    enable_wal(cur)
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        ensure_append_schema(cur)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_governance_ledger_event_event_type
+            ON governance_ledger_event(event_type)
+        """)
+        forks = find_forks(cur)
+        if forks:
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {PREV_EVENT_ID_LOOKUP_INDEX} ON governance_ledger_event(prev_event_id)")
+        else:
+            cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {PREV_EVENT_ID_UNIQUE_INDEX} ON governance_ledger_event(prev_event_id)")
+            cur.execute(f"DROP INDEX IF EXISTS {PREV_EVENT_ID_LOOKUP_INDEX}")
+        sync_payload_index(cur)
+        cur.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+    return {"fork_guard": not forks, "forks": forks}
+
+def warn_no_fork_guard(cur: sqlite3.Cursor) -> None:
+    # 一意 index が無い（未 migrate / fork 済み台帳）ことを 1 プロセス 1 回だけ stderr に出す
+    global _FORK_GUARD_WARNED
+    if _FORK_GUARD_WARNED or has_fork_guard(cur):
+        return
+    _FORK_GUARD_WARNED = True
+    print("WARN: prev_event_id unique index not installed (not migrated, or ledger already forked); "
+          "appends rely on BEGIN IMMEDIATE + tip re-check. run: python governance_cli.py migrate", file=sys.stderr)
+
+def ensure_payload_index_schema(cur: sqlite3.Cursor) -> None:
+    # governance_ledger_event 本体の列は変えない。索引は別表で、rowid で本体に戻る
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PAYLOAD_INDEX_TABLE} (
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            event_rowid INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            PRIMARY KEY (key, value, event_rowid)
+        ) WITHOUT ROWID
+    """)
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PAYLOAD_INDEX_STATE_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_rowid INTEGER NOT NULL
+        )
+    """)
+    cur.execute(f"SELECT 1 FROM {PAYLOAD_INDEX_STATE_TABLE} WHERE id = 1")
+    if cur.fetchone() is None:
+        cur.execute(f"INSERT OR IGNORE INTO {PAYLOAD_INDEX_STATE_TABLE} (id, last_rowid) VALUES (1, 0)")
+
+def payload_index_entries(payload_json: str) -> List[Tuple[str, str]]:
+    # 文字列値のみ索引する（壊れた payload は索引しないだけで append/verify 側の判定に任せる）
+    try:
+        payload = json.loads(payload_json)
+    except ValueError:
+        return []
+    if not isinstance(payload, dict):
+        return []
+    return [(k, payload[k]) for k in PAYLOAD_INDEX_KEYS if isinstance(payload.get(k), str) and payload[k]]
+
+def sync_payload_index(cur: sqlite3.Cursor, fetch_rows: int = 1000) -> int:
+    # last_rowid より後の行を索引する。通常は append 直後の新規行だけ。
+    # writer を経由せずに書かれた行（init_governance_db 等）や索引導入前の行もここで追いつく
+    # 呼び出し側のトランザクション内で使う（commit はしない）
+    cur.execute(f"SELECT last_rowid FROM {PAYLOAD_INDEX_STATE_TABLE} WHERE id = 1")
+    last_rowid = cur.fetchone()[0]
+    n = 0
+    while True:
+        cur.execute("""
+            SELECT rowid, event_type, payload_json
+            FROM governance_ledger_event
+            WHERE rowid > ?
+            ORDER BY rowid ASC
+            LIMIT ?
+        """, (last_rowid, fetch_rows))
+        rows = cur.fetchall()
+        if not rows:
+            break
+        entries = [(k, v, rowid, event_type) for rowid, event_type, payload_json in rows for k, v in payload_index_entries(payload_json)]
+        cur.executemany(f"""
+            INSERT OR IGNORE INTO {PAYLOAD_INDEX_TABLE} (key, value, event_rowid, event_type)
+            VALUES (?, ?, ?, ?)
+        """, entries)
+        last_rowid = rows[-1][0]
+        n += len(rows)
+    if n:
+        cur.execute(f"UPDATE {PAYLOAD_INDEX_STATE_TABLE} SET last_rowid = ? WHERE id = 1", (last_rowid,))
+    return n
+
+def open_db(db_path: str = "", check_same_thread: bool = True) -> sqlite3.Connection:
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        raise RuntimeError("governance.db not found: " + db_path)
+    # isolation_level=None: トランザクションは BEGIN IMMEDIATE で明示的に張る
+    # 開くだけでは DB に書かない（WAL 切替と side table 作成は append / migrate 側で行う）
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SEC, isolation_level=None, check_same_thread=check_same_thread)
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SEC * 1000)}")
+    return conn
 
 def get_tip(cur: sqlite3.Cursor) -> Tuple[str, str]:
     cur.execute("""
@@ -34,14 +177,18 @@ def get_tip(cur: sqlite3.Cursor) -> Tuple[str, str]:
         raise RuntimeError("governance ledger empty")
     return row[0], row[1]
 
-def append_event(event_type: str, payload: Dict[str, Any], note: str) -> str:
-    ts = utc_now_iso()
-    payload_json = json.dumps(payload, sort_keys=True, ensure_ascii=True)
-
-    conn = open_db()
-    cur = conn.cursor()
+def ensure_tip_unextended(cur: sqlite3.Cursor, tip_event_id: str) -> None:
+    # BEGIN IMMEDIATE 内での tip 再確認: tip に既に子があれば、ここに連結すると新しい fork になる
+    # 一意 index が無い台帳でも fork を増やさないための確認（migrate 済みなら index seek 1 回）
+    cur.execute("SELECT event_id FROM governance_ledger_event WHERE prev_event_id = ? LIMIT 1", (tip_event_id,))
+    row = cur.fetchone()
+    if row is not None:
+        raise RuntimeError(f"TIP ALREADY EXTENDED: {tip_event_id} has child {row[0]} (ledger order inconsistent; append refused)")
 
-    prev_event_id, prev_chain_hash = get_tip(cur)
+def build_event(prev_event_id: str, prev_chain_hash: str, event_type: str, payload: Dict[str, Any], note: str, ts: str = "") -> Tuple[str, str, str, str, str, str, str]:
+    # (event_id, prev_event_id, timestamp_utc, event_type, payload_json, note, chain_hash)
+    ts = ts or utc_now_iso()
+    payload_json = json.dumps(payload, sort_keys=True, ensure_ascii=True)
 
     material = (
         prev_event_id +
@@ -61,23 +208,86 @@ def append_event(event_type: str, payload: Dict[str, Any], note: str) -> str:
 
     chain_hash = sha256_hex(chain_material)
 
+    return (event_id, prev_event_id, ts, event_type, payload_json, note, chain_hash)
+
+def event_item_error(event_type: str, payload: Dict[str, Any], note: str) -> str:
+    # build_event が BEGIN IMMEDIATE 内で落ちる入力（JSON 化できない payload、UTF-8 にできない文字列）を事前に検出する
+    # group commit で 1 件の不正が同じトランザクションの他の append を巻き添えにしないため
+    try:
+        build_event("", "", event_type, payload, note, ts="-")
+    except (TypeError, ValueError) as e:
+        return f"{type(e).__name__}: {e}"
+    return ""
+
+def insert_event(cur: sqlite3.Cursor, row: Tuple[str, str, str, str, str, str, str]) -> None:
     cur.execute("""
         INSERT INTO governance_ledger_event
         (event_id, prev_event_id, timestamp_utc, event_type, payload_json, note, chain_hash)
         VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        event_id,
-        prev_event_id,
-        ts,
-        event_type,
-        payload_json,
-        note,
-        chain_hash
-    ))
-
-    conn.commit()
-    conn.close()
-    return event_id
+    """, row)
+
+def is_retryable(e: Exception) -> bool:
+    if isinstance(e, sqlite3.IntegrityError):
+        # prev_event_id の一意制約違反 = 他の writer に tip を取られた
+        return "prev_event_id" in str(e)
+    if isinstance(e, sqlite3.OperationalError):
+        msg = str(e).lower()
+        return "locked" in msg or "busy" in msg
+    return False
+
+def append_in_transaction(conn: sqlite3.Connection, items: List[Tuple[str, Dict[str, Any], str]]) -> List[Tuple[str, str, str, str, str, str, str]]:
+    # items: [(event_type, payload, note)] を BEGIN IMMEDIATE 内で tip から順に連結して 1 回で commit する
+    # conn は open_db() で開いたもの（isolation_level=None）
+    cur = conn.cursor()
+    warn_no_fork_guard(cur)
+    attempt = 0
+    while True:
+        try:
+            enable_wal(cur)
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                ensure_append_schema(cur)
+                prev_event_id, prev_chain_hash = get_tip(cur)
+                ensure_tip_unextended(cur, prev_event_id)
+                rows = []
+                for event_type, payload, note in items:
+                    row = build_event(prev_event_id, prev_chain_hash, event_type, payload, note)
+                    insert_event(cur, row)
+                    rows.append(row)
+                    prev_event_id, prev_chain_hash = row[0], row[6]
+                sync_payload_index(cur)
+                cur.execute("COMMIT")
+                return rows
+            except BaseException:
+                if conn.in_transaction:
+                    cur.execute("ROLLBACK")
+                raise
+        except (sqlite3.OperationalError, sqlite3.IntegrityError) as e:
+            attempt += 1
+            if not is_retryable(e) or attempt > RETRY_MAX:
+                raise
+            APPEND_STATS["retries"] += 1
+            time.sleep(RETRY_BASE_SEC * (2 ** (attempt - 1)) * (0.5 + random.random()))
+
+def append_event(event_type: str, payload: Dict[str, Any], note: str) -> str:
+    conn = open_db()
+    try:
+        rows = append_in_transaction(conn, [(event_type, payload, note)])
+    finally:
+        conn.close()
+    return rows[0][0]
+
+def append_events(batch: List[Tuple[str, Dict[str, Any], str]]) -> List[str]:
+    # batch: [(event_type, payload, note)] を tip 1 回読みで連結し、1 トランザクションで書く
+    # hash 規則は append_event を 1 件ずつ呼んだ場合と同一
+    if not batch:
+        return []
+    conn = open_db()
+    try:
+        rows = append_in_transaction(conn, list(batch))
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
 
 def main():
     payload = {
@@ -2,10 +2,10 @@
 # note: Phase14.6 impact_registry append helper (arbitrary artifact, bind latest TIP)
 
 import os
-import csv
 import sys
 import sqlite3
 from datetime import datetime, timezone
+from impact_registry_index import append_row
 
 ROOT = r"C:\Users\sirok\MoCKA"
 DB_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
@@ -56,9 +56,12 @@ def main(argv) -> int:
 
     note = "note: Phase14.6 impact_registry append (artifact bound to latest TIP)"
 
-    with open(CSV_PATH, "a", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        w.writerow([ts, scope, artifact_path, impact_level, tip, note])
+    # 同じ scope / artifact / impact_level / TIP / note の行が既にあれば追記しない
+    if not append_row([ts, scope, artifact_path, impact_level, tip, note], CSV_PATH):
+        print("SKIP: impact_registry row already recorded (duplicate)")
+        print("TIP_EVENT_ID:", tip)
+        print("ARTIFACT:", artifact_path)
+        return 0
 
     print("OK: impact_registry appended")
     print("TIP_EVENT_ID:", tip)
@@ -2,9 +2,9 @@
 # note: Phase14.6 institutional completion document registry (chain-safe version)
 
 import os
-import csv
 import sqlite3
 from datetime import datetime, timezone
+from impact_registry_index import append_row
 
 ROOT = r"C:\Users\sirok\MoCKA"
 CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "impact_registry.csv")
@@ -45,9 +45,10 @@ def main():
         "note: Phase14.6 completion document sealed and TIP-anchored"
     ]
 
-    with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(row)
+    if not append_row(row, CSV_PATH):
+        print("SKIP: impact_registry row already recorded (duplicate)")
+        print("TIP_EVENT_ID:", tip)
+        return
 
     print("OK: impact_registry appended (completion document)")
     print("TIP_EVENT_ID:", tip)
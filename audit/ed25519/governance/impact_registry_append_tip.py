@@ -2,9 +2,9 @@
 # note: Phase14.6 impact_registry append helper (bind latest TIP)
 
 import os
-import csv
 import sqlite3
 from datetime import datetime, timezone
+from impact_registry_index import append_row
 
 ROOT = r"C:\Users\sirok\MoCKA"
 DB_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
@@ -37,9 +37,11 @@ def main():
     impact_level = "info"
     note = "note: Phase14.6 impact_registry append (latest TIP anchored)"
 
-    with open(CSV_PATH, "a", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        w.writerow([ts, scope, artifact_path, impact_level, tip, note])
+    # 同じ TIP での再実行は重複として追記しない
+    if not append_row([ts, scope, artifact_path, impact_level, tip, note], CSV_PATH):
+        print("SKIP: impact_registry row already recorded (duplicate)")
+        print("TIP_EVENT_ID:", tip)
+        return
 
     print("OK: impact_registry appended")
     print("TIP_EVENT_ID:", tip)
@@ -0,0 +1,234 @@
+# C:\Users\sirok\MoCKA\audit\ed25519\governance\impact_registry_index.py
+# note: Phase14.6 impact_registry.csv duplicate guard (persistent sha256 index sidecar)
+#
+# sidecar: impact_registry.csv.hashidx.db (SQLite)
+#   row_hash : 正規化した行の sha256（PRIMARY KEY なので重複判定は index 1 回）
+#   state    : どこまで索引したか（byte offset）と fingerprint（csv_tail_sync）
+# CSV が索引より伸びていれば末尾だけ追加索引し、縮んだ/書き換えられていれば作り直す。
+
+import os
+import io
+import csv
+import sys
+import hashlib
+import sqlite3
+from typing import List, Optional, Tuple
+
+from csv_tail_sync import fingerprint, plan_sync, read_complete
+
+ROOT = r"C:\Users\sirok\MoCKA"
+CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "impact_registry.csv")
+
+BUSY_TIMEOUT_SEC = 5.0
+
+def default_index_path(csv_path: str) -> str:
+    return csv_path + ".hashidx.db"
+
+def sha256_hex(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+# -------------------------
+# normalization
+# -------------------------
+
+def normalize_fields(fields: List[str]) -> str:
+    # timestamp_utc は除外する（同じ artifact / TIP / note の再 append を重複とみなす）
+    # 新規 append の判定にだけ使う。既存行は消さない（dedupe_impact_registry.py の既定は完全一致）
+    # artifact_path は normalize_impact_registry_paths.py と同じ \.\ 除去
+    scope, artifact_path, impact_level, event_id, note = [f.strip() for f in fields[1:6]]
+    artifact_path = artifact_path.replace(r"\.\audit", r"\audit").replace(r"\.\docs", r"\docs")
+    return "\x1f".join([scope, artifact_path, impact_level, event_id, note])
+
+def line_key(line: str) -> Optional[str]:
+    s = line.strip()
+    if not s:
+        return None
+    if s.startswith("20") and s.count(",") >= 5:
+        fields = next(csv.reader([s]))
+        if len(fields) >= 6:
+            return normalize_fields(fields)
+    # header / note 行など data 以外は行そのもの
+    return s
+
+def row_hash(key: str) -> str:
+    return sha256_hex(key.encode("utf-8"))
+
+# -------------------------
+# sidecar
+# -------------------------
+
+def ensure_schema(cur: sqlite3.Cursor) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS impact_registry_row_hash (
+            row_hash TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS impact_registry_index_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            indexed_offset INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL
+        )
+    """)
+
+def index_range(cur: sqlite3.Cursor, f, start: int) -> int:
+    # start から最後の改行までを索引し、索引済み offset を返す（改行で終わらない末尾行は次回）
+    data = read_complete(f, start)
+    if not data:
+        return start
+    text = data.decode("utf-8", errors="replace")
+    hashes = []
+    for ln in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        key = line_key(ln)
+        if key is not None:
+            hashes.append((row_hash(key),))
+    cur.executemany("INSERT OR IGNORE INTO impact_registry_row_hash (row_hash) VALUES (?)", hashes)
+    return start + len(data)
+
+def sync(conn: sqlite3.Connection, csv_path: str, rebuild: bool = False) -> Tuple[str, int]:
+    # 呼び出し側のトランザクション内で使う。返り値は (mode, indexed_offset)
+    cur = conn.cursor()
+    cur.execute("SELECT indexed_offset, fingerprint FROM impact_registry_index_state WHERE id = 1")
+    state = cur.fetchone()
+
+    if not os.path.exists(csv_path):
+        cur.execute("DELETE FROM impact_registry_row_hash")
+        cur.execute("DELETE FROM impact_registry_index_state")
+        return "empty", 0
+
+    with open(csv_path, "rb") as f:
+        mode, start = plan_sync(f, state, rebuild)
+        if mode == "current":
+            return mode, start
+        if mode == "rebuild":
+            cur.execute("DELETE FROM impact_registry_row_hash")
+        offset = index_range(cur, f, start)
+        save_state(cur, offset, fingerprint(f, offset))
+    return mode, offset
+
+def save_state(cur: sqlite3.Cursor, offset: int, fp: str) -> None:
+    cur.execute("""
+        INSERT INTO impact_registry_index_state (id, indexed_offset, fingerprint) VALUES (1, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET indexed_offset = excluded.indexed_offset, fingerprint = excluded.fingerprint
+    """, (offset, fp))
+
+def open_index(index_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(index_path, timeout=BUSY_TIMEOUT_SEC, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SEC * 1000)}")
+    ensure_schema(conn.cursor())
+    return conn
+
+def in_transaction(conn: sqlite3.Connection, fn):
+    # BEGIN IMMEDIATE で sidecar を書き込みロックし、CSV append も含めて append 同士を直列化する
+    cur = conn.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        out = fn(cur)
+        cur.execute("COMMIT")
+        return out
+    except BaseException:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+
+# -------------------------
+# API
+# -------------------------
+
+def append_row(row: List[str], csv_path: str = "", index_path: str = "") -> bool:
+    # True: appended / False: 同一の正規化行が既にある（no-op）
+    csv_path = csv_path or CSV_PATH
+    index_path = index_path or default_index_path(csv_path)
+    h = row_hash(normalize_fields([str(x) for x in row]))
+
+    # 既存の append スクリプト（csv.writer の既定）と同じ \r\n で終える
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\r\n").writerow(row)
+    line = buf.getvalue().encode("utf-8")
+
+    def do(cur: sqlite3.Cursor) -> bool:
+        _, offset = sync(cur.connection, csv_path)
+        cur.execute("SELECT 1 FROM impact_registry_row_hash WHERE row_hash = ?", (h,))
+        if cur.fetchone() is not None:
+            return False
+        with open(csv_path, "ab+") as f:
+            # 改行で終わっていない末尾行に連結しない
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\r\n")
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            # 追記した行（と未索引だった末尾行）だけを索引する
+            end = index_range(cur, f, offset)
+            save_state(cur, end, fingerprint(f, end))
+        return True
+
+    conn = open_index(index_path)
+    try:
+        return in_transaction(conn, do)
+    finally:
+        conn.close()
+
+def contains_row(row: List[str], csv_path: str = "", index_path: str = "") -> bool:
+    csv_path = csv_path or CSV_PATH
+    h = row_hash(normalize_fields([str(x) for x in row]))
+    conn = open_index(index_path or default_index_path(csv_path))
+    try:
+        def do(cur: sqlite3.Cursor) -> bool:
+            sync(cur.connection, csv_path)
+            cur.execute("SELECT 1 FROM impact_registry_row_hash WHERE row_hash = ?", (h,))
+            return cur.fetchone() is not None
+        return in_transaction(conn, do)
+    finally:
+        conn.close()
+
+def sync_index(csv_path: str = "", index_path: str = "") -> Tuple[str, int]:
+    # (mode, indexed_offset)。CSV が外部で追記/書き換えされた後に呼ぶ
+    csv_path = csv_path or CSV_PATH
+    conn = open_index(index_path or default_index_path(csv_path))
+    try:
+        return in_transaction(conn, lambda cur: sync(cur.connection, csv_path))
+    finally:
+        conn.close()
+
+def rebuild_index(csv_path: str = "", index_path: str = "") -> Tuple[int, int]:
+    # (indexed_offset, row_hash 件数)
+    csv_path = csv_path or CSV_PATH
+    conn = open_index(index_path or default_index_path(csv_path))
+    try:
+        def do(cur: sqlite3.Cursor) -> Tuple[int, int]:
+            _, offset = sync(cur.connection, csv_path, rebuild=True)
+            cur.execute("SELECT COUNT(*) FROM impact_registry_row_hash")
+            return offset, cur.fetchone()[0]
+        return in_transaction(conn, do)
+    finally:
+        conn.close()
+
+def main(argv) -> int:
+    if len(argv) < 2 or argv[1] not in ("rebuild", "sync"):
+        print("USAGE:")
+        print("  python impact_registry_index.py rebuild   (re-index impact_registry.csv from scratch)")
+        print("  python impact_registry_index.py sync      (index rows appended outside the helpers)")
+        return 2
+
+    if argv[1] == "rebuild":
+        offset, n = rebuild_index()
+        print("OK: impact_registry index rebuilt")
+    else:
+        mode, offset = sync_index()
+        conn = open_index(default_index_path(CSV_PATH))
+        try:
+            n = conn.execute("SELECT COUNT(*) FROM impact_registry_row_hash").fetchone()[0]
+        finally:
+            conn.close()
+        print("OK: impact_registry index synced")
+        print("MODE:", mode)
+    print("INDEXED_OFFSET:", offset)
+    print("ROW_HASHES:", n)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -2,6 +2,7 @@
 # note: Phase14.6 normalize impact_registry artifact_path (remove \.\)
 
 import os
+from impact_registry_index import rebuild_index
 
 ROOT = r"C:\Users\sirok\MoCKA"
 CSV_PATH = os.path.join(ROOT, "audit", "ed25519", "governance", "impact_registry.csv")
@@ -27,6 +28,9 @@ def main():
     with open(CSV_PATH, "w", encoding="utf-8", newline="\n") as f:
         f.write("\n".join(out) + "\n")
 
+    # 全体を書き換えたので重複判定 sidecar も作り直す
+    rebuild_index(CSV_PATH)
+
     print("OK: impact_registry paths normalized")
     print("CHANGED_LINES:", changed)
 
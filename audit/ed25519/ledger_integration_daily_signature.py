@@ -4,6 +4,7 @@ import json
 import sqlite3
 import hashlib
 from daily_signature import sign_daily, build_daily_message
+from ledger_merkle_index import index_exists, sync_index
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
@@ -83,6 +84,9 @@ def insert_daily_signature_event(
                 utc_now_z(),
             ),
         )
+        # Merkle index が有効化済みの DB では同一トランザクションで追随させる
+        if index_exists(conn):
+            sync_index(conn, table_name)
         conn.commit()
 
         return {
@@ -0,0 +1,255 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+
+# note: Merkle tree index over audit_ledger_event (RFC 6962 style tree, O(log n) inclusion proofs)
+# leaf  = SHA256(0x00 || event_id)
+# node  = SHA256(0x01 || left || right)
+# node table holds every complete (perfect) subtree; nodes never change once written (append-only)
+
+PROOF_SCHEMA = "mocka.audit.merkle.inclusion.v1"
+LEAF_TABLE = "audit_merkle_leaf"
+NODE_TABLE = "audit_merkle_node"
+FETCH_ROWS = 1000
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def leaf_hash(event_id: str) -> bytes:
+    return hashlib.sha256(b"\x00" + event_id.encode("utf-8")).digest()
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def largest_pow2_below(n: int) -> int:
+    # n >= 2
+    return 1 << ((n - 1).bit_length() - 1)
+
+def ensure_index_tables(cur):
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS {LEAF_TABLE} (
+      leaf_index INTEGER PRIMARY KEY,
+      ledger_id INTEGER NOT NULL UNIQUE,
+      event_id TEXT NOT NULL
+    )
+    """)
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{LEAF_TABLE}_event_id ON {LEAF_TABLE}(event_id)")
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS {NODE_TABLE} (
+      level INTEGER NOT NULL,
+      idx INTEGER NOT NULL,
+      hash TEXT NOT NULL,
+      PRIMARY KEY (level, idx)
+    ) WITHOUT ROWID
+    """)
+
+def index_exists(conn: sqlite3.Connection) -> bool:
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (NODE_TABLE,))
+    return cur.fetchone() is not None
+
+def tree_size(cur) -> int:
+    cur.execute(f"SELECT MAX(leaf_index) FROM {LEAF_TABLE}")
+    row = cur.fetchone()
+    return 0 if row[0] is None else int(row[0]) + 1
+
+def get_node(cur, level: int, idx: int) -> bytes:
+    cur.execute(f"SELECT hash FROM {NODE_TABLE} WHERE level = ? AND idx = ?", (level, idx))
+    row = cur.fetchone()
+    if not row:
+        raise RuntimeError(f"MERKLE NODE MISSING level={level} idx={idx}")
+    return bytes.fromhex(row[0])
+
+def peaks(cur, size: int):
+    # size の 2 進分解に対応する完全部分木の根（左 = 最大）
+    out = []
+    start = 0
+    for level in range(size.bit_length() - 1, -1, -1):
+        if size & (1 << level):
+            out.append((level, get_node(cur, level, start >> level)))
+            start += 1 << level
+    return out
+
+def subtree_hash(cur, start: int, size: int) -> bytes:
+    if size & (size - 1) == 0:
+        level = size.bit_length() - 1
+        return get_node(cur, level, start >> level)
+    k = largest_pow2_below(size)
+    return node_hash(subtree_hash(cur, start, k), subtree_hash(cur, start + k, size - k))
+
+def root_hash(cur, size: int) -> bytes:
+    if size <= 0:
+        return hashlib.sha256(b"").digest()
+    ps = peaks(cur, size)
+    h = ps[-1][1]
+    for _, p in reversed(ps[:-1]):
+        h = node_hash(p, h)
+    return h
+
+def sync_index(conn: sqlite3.Connection, table_name: str = "audit_ledger_event") -> int:
+    # audit_ledger_event の未索引行を追記する。commit は呼び出し側で行う。
+    cur = conn.cursor()
+    ensure_index_tables(cur)
+
+    size = tree_size(cur)
+    last_ledger_id = 0
+    if size > 0:
+        cur.execute(f"SELECT ledger_id, event_id FROM {LEAF_TABLE} WHERE leaf_index = ?", (size - 1,))
+        last_ledger_id, last_event_id = cur.fetchone()
+        cur.execute(f"SELECT event_id FROM {table_name} WHERE id = ?", (last_ledger_id,))
+        row = cur.fetchone()
+        if not row or row[0] != last_event_id:
+            raise RuntimeError(f"MERKLE INDEX DIVERGED at ledger id={last_ledger_id} (rebuild the index)")
+
+    stack = peaks(cur, size)
+    added = 0
+
+    read = conn.cursor()
+    read.execute(f"SELECT id, event_id FROM {table_name} WHERE id > ? ORDER BY id ASC", (last_ledger_id,))
+    while True:
+        batch = read.fetchmany(FETCH_ROWS)
+        if not batch:
+            break
+
+        leaves = []
+        nodes = []
+        for ledger_id, event_id in batch:
+            i = size + added
+            h = leaf_hash(event_id)
+            leaves.append((i, ledger_id, event_id))
+            nodes.append((0, i, h.hex()))
+
+            level = 0
+            while stack and stack[-1][0] == level:
+                _, left = stack.pop()
+                h = node_hash(left, h)
+                level += 1
+                nodes.append((level, i >> level, h.hex()))
+            stack.append((level, h))
+            added += 1
+
+        cur.executemany(f"INSERT INTO {LEAF_TABLE} (leaf_index, ledger_id, event_id) VALUES (?, ?, ?)", leaves)
+        cur.executemany(f"INSERT INTO {NODE_TABLE} (level, idx, hash) VALUES (?, ?, ?)", nodes)
+
+    return added
+
+def audit_path(cur, m: int, start: int, n: int):
+    # RFC 6962 PATH(m, D[start:start+n])
+    if n == 1:
+        return []
+    k = largest_pow2_below(n)
+    if m < k:
+        return audit_path(cur, m, start, k) + [subtree_hash(cur, start + k, n - k)]
+    return audit_path(cur, m - k, start + k, n - k) + [subtree_hash(cur, start, k)]
+
+def inclusion_proof(conn: sqlite3.Connection, event_id: str, size: int = 0) -> dict:
+    cur = conn.cursor()
+    current = tree_size(cur)
+    size = size or current
+    if size > current:
+        raise ValueError(f"tree_size {size} exceeds indexed size {current}")
+
+    cur.execute(f"SELECT leaf_index, ledger_id FROM {LEAF_TABLE} WHERE event_id = ? AND leaf_index < ? ORDER BY leaf_index ASC LIMIT 1", (event_id, size))
+    row = cur.fetchone()
+    if not row:
+        raise LookupError(f"event_id not indexed: {event_id}")
+    leaf_index, ledger_id = row
+
+    return {
+        "schema": PROOF_SCHEMA,
+        "event_id": event_id,
+        "ledger_id": ledger_id,
+        "leaf_index": leaf_index,
+        "tree_size": size,
+        "root_hash": root_hash(cur, size).hex(),
+        "audit_path": [h.hex() for h in audit_path(cur, leaf_index, 0, size)],
+    }
+
+def verify_inclusion_proof(proof: dict, root_hex: str = "") -> bool:
+    # DB 不要: event_id / audit_path / tree_size だけから root を再構成する（RFC 9162 2.1.3.2）
+    if proof.get("schema") != PROOF_SCHEMA:
+        return False
+
+    fn = int(proof["leaf_index"])
+    sn = int(proof["tree_size"]) - 1
+    if fn < 0 or fn > sn:
+        return False
+
+    r = leaf_hash(proof["event_id"])
+    for p_hex in proof["audit_path"]:
+        p = bytes.fromhex(p_hex)
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while fn & 1 == 0 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+
+    expected = root_hex or proof["root_hash"]
+    return sn == 0 and r.hex() == expected.lower()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default="audit.db")
+    ap.add_argument("--table", default="audit_ledger_event")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("sync", help="append unindexed ledger rows to the Merkle index")
+    sub.add_parser("root", help="print current tree size and root hash")
+
+    p_proof = sub.add_parser("proof", help="print inclusion proof for an event_id")
+    p_proof.add_argument("--event-id", required=True)
+    p_proof.add_argument("--tree-size", type=int, default=0, help="prove against an earlier published root")
+    p_proof.add_argument("--out", default="")
+
+    p_verify = sub.add_parser("verify", help="verify an inclusion proof file (no DB access)")
+    p_verify.add_argument("--proof", required=True)
+    p_verify.add_argument("--root", default="", help="trusted root hash (default: root_hash inside the proof)")
+
+    args = ap.parse_args()
+
+    if args.cmd == "verify":
+        with open(args.proof, "r", encoding="utf-8-sig") as f:
+            proof = json.load(f)
+        ok = verify_inclusion_proof(proof, args.root)
+        print(json.dumps({
+            "status": "OK" if ok else "FAIL",
+            "event_id": proof.get("event_id"),
+            "tree_size": proof.get("tree_size"),
+            "root_trusted": bool(args.root),
+        }, indent=2))
+        raise SystemExit(0 if ok else 1)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        added = sync_index(conn, args.table)
+        conn.commit()
+
+        if args.cmd in ("sync", "root"):
+            cur = conn.cursor()
+            size = tree_size(cur)
+            print(json.dumps({
+                "status": "OK",
+                "leaves_added": added,
+                "tree_size": size,
+                "root_hash": root_hash(cur, size).hex(),
+            }, indent=2))
+            return
+
+        proof = inclusion_proof(conn, args.event_id, args.tree_size)
+        text = json.dumps(proof, indent=2, sort_keys=True)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8", newline="\n") as f:
+                f.write(text + "\n")
+        print(text)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import datetime
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+# note: managed schema migrations + indexed lookups over audit_ledger_event
+# every lookup below is an index seek (O(log n)); check with: python ledger_query.py plan
+
+MIGRATION_TABLE = "audit_schema_migration"
+EVENT_COLUMNS = "id, event_type, schema_version, event_content, event_id, prev_chain_hash, chain_hash, created_at_utc"
+
+# (version, name, statements) — 追加のみ。適用済み version の内容は変更しない
+MIGRATIONS = [
+    (1, "ledger_lookup_indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_{table}_event_id ON {table}(event_id)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_chain_hash ON {table}(chain_hash)",
+        # (event_type) 単独 index は (event_type) + 暗黙の rowid 順なので、event_type = ? ORDER BY id DESC LIMIT n
+        # （latest_events / --since-last-signature の直近 daily_signature 探索）が先頭から n 件読むだけで済む。
+        # event_type_created だけだと同じ検索が USE TEMP B-TREE FOR ORDER BY（該当 type 全件を sort）になる
+        "CREATE INDEX IF NOT EXISTS idx_{table}_event_type ON {table}(event_type)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_event_type_created ON {table}(event_type, created_at_utc)",
+    ]),
+]
+
+def utc_now_z() -> str:
+    return datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+def ensure_migration_table(cur):
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS {MIGRATION_TABLE} (
+      table_name TEXT NOT NULL,
+      version INTEGER NOT NULL,
+      name TEXT NOT NULL,
+      applied_at_utc TEXT NOT NULL,
+      PRIMARY KEY (table_name, version)
+    )
+    """)
+
+def applied_versions(cur, table_name: str):
+    cur.execute(f"SELECT version FROM {MIGRATION_TABLE} WHERE table_name = ? ORDER BY version ASC", (table_name,))
+    return [r[0] for r in cur.fetchall()]
+
+def pending_migrations(conn: sqlite3.Connection, table_name: str = "audit_ledger_event"):
+    # 書き込まずに未適用 version を返す（migration table が無ければ全件未適用）
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (MIGRATION_TABLE,))
+    done = set(applied_versions(cur, table_name)) if cur.fetchone() else set()
+    return [version for version, _, _ in MIGRATIONS if version not in done]
+
+def migrate(conn: sqlite3.Connection, table_name: str = "audit_ledger_event"):
+    # 未適用の migration を version 順に 1 つずつ（各 1 トランザクションで）適用する
+    cur = conn.cursor()
+    ensure_migration_table(cur)
+    conn.commit()
+
+    done = set(applied_versions(cur, table_name))
+    applied = []
+    for version, name, statements in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            for stmt in statements:
+                cur.execute(stmt.format(table=table_name))
+            cur.execute(
+                f"INSERT INTO {MIGRATION_TABLE} (table_name, version, name, applied_at_utc) VALUES (?, ?, ?, ?)",
+                (table_name, version, name, utc_now_z()),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+def row_to_event(row):
+    if row is None:
+        return None
+    keys = [c.strip() for c in EVENT_COLUMNS.split(",")]
+    return dict(zip(keys, row))
+
+# -------------------------
+# lookups
+# -------------------------
+
+def event_by_id(conn: sqlite3.Connection, event_id: str, table_name: str = "audit_ledger_event"):
+    cur = conn.cursor()
+    cur.execute(f"SELECT {EVENT_COLUMNS} FROM {table_name} WHERE event_id = ? ORDER BY id ASC LIMIT 1", (event_id,))
+    return row_to_event(cur.fetchone())
+
+def chain_position(conn: sqlite3.Connection, chain_hash: str, table_name: str = "audit_ledger_event"):
+    # chain_hash を持つ行の台帳上の位置（id）と、その直前・直後の行 id
+    cur = conn.cursor()
+    cur.execute(f"SELECT id, event_id, prev_chain_hash FROM {table_name} WHERE chain_hash = ? ORDER BY id ASC LIMIT 1", (chain_hash,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    row_id, event_id, prev_chain_hash = row
+
+    cur.execute(f"SELECT id FROM {table_name} WHERE id < ? ORDER BY id DESC LIMIT 1", (row_id,))
+    prev_row = cur.fetchone()
+    cur.execute(f"SELECT id FROM {table_name} WHERE id > ? ORDER BY id ASC LIMIT 1", (row_id,))
+    next_row = cur.fetchone()
+
+    return {
+        "id": row_id,
+        "event_id": event_id,
+        "chain_hash": chain_hash,
+        "prev_chain_hash": prev_chain_hash,
+        "prev_id": prev_row[0] if prev_row else None,
+        "next_id": next_row[0] if next_row else None,
+    }
+
+def events_by_type(conn: sqlite3.Connection, event_type: str, since: str = "", until: str = "", limit: int = 0, table_name: str = "audit_ledger_event"):
+    # created_at_utc は保存されている文字列のまま比較する（since <= t < until）
+    sql = f"SELECT {EVENT_COLUMNS} FROM {table_name} WHERE event_type = ?"
+    params = [event_type]
+    if since:
+        sql += " AND created_at_utc >= ?"
+        params.append(since)
+    if until:
+        sql += " AND created_at_utc < ?"
+        params.append(until)
+    sql += " ORDER BY created_at_utc ASC, id ASC"
+    if limit > 0:
+        sql += " LIMIT ?"
+        params.append(limit)
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    return [row_to_event(r) for r in cur.fetchall()]
+
+def latest_events(conn: sqlite3.Connection, event_type: str, n: int = 1, table_name: str = "audit_ledger_event"):
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {EVENT_COLUMNS} FROM {table_name} WHERE event_type = ? ORDER BY id DESC LIMIT ?",
+        (event_type, n),
+    )
+    return [row_to_event(r) for r in cur.fetchall()]
+
+def event_exists(conn: sqlite3.Connection, event_id: str, table_name: str = "audit_ledger_event") -> bool:
+    cur = conn.cursor()
+    cur.execute(f"SELECT 1 FROM {table_name} WHERE event_id = ? LIMIT 1", (event_id,))
+    return cur.fetchone() is not None
+
+def query_plans(conn: sqlite3.Connection, table_name: str = "audit_ledger_event"):
+    # 各 lookup の EXPLAIN QUERY PLAN（全件 SCAN が無いことの確認用）
+    probes = {
+        "event_by_id": (f"SELECT {EVENT_COLUMNS} FROM {table_name} WHERE event_id = ? ORDER BY id ASC LIMIT 1", ("x",)),
+        "chain_position": (f"SELECT id, event_id, prev_chain_hash FROM {table_name} WHERE chain_hash = ? ORDER BY id ASC LIMIT 1", ("x",)),
+        "events_by_type": (f"SELECT {EVENT_COLUMNS} FROM {table_name} WHERE event_type = ? AND created_at_utc >= ? AND created_at_utc < ? ORDER BY created_at_utc ASC, id ASC", ("x", "a", "b")),
+        "latest_events": (f"SELECT {EVENT_COLUMNS} FROM {table_name} WHERE event_type = ? ORDER BY id DESC LIMIT ?", ("x", 1)),
+        "event_exists": (f"SELECT 1 FROM {table_name} WHERE event_id = ? LIMIT 1", ("x",)),
+    }
+    cur = conn.cursor()
+    out = {}
+    for name, (sql, params) in probes.items():
+        cur.execute("EXPLAIN QUERY PLAN " + sql, params)
+        out[name] = [r[-1] for r in cur.fetchall()]
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default="audit.db")
+    ap.add_argument("--table", default="audit_ledger_event")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("migrate", help="apply pending schema migrations (lookup indexes)")
+    sub.add_parser("plan", help="print EXPLAIN QUERY PLAN for every lookup")
+
+    p_get = sub.add_parser("get", help="event by event_id")
+    p_get.add_argument("--event-id", required=True)
+
+    p_pos = sub.add_parser("position", help="ledger position of a chain_hash")
+    p_pos.add_argument("--chain-hash", required=True)
+
+    p_type = sub.add_parser("by-type", help="events of a type within [since, until)")
+    p_type.add_argument("--event-type", required=True)
+    p_type.add_argument("--since", default="")
+    p_type.add_argument("--until", default="")
+    p_type.add_argument("--limit", type=int, default=0)
+
+    p_latest = sub.add_parser("latest", help="latest N events of a type")
+    p_latest.add_argument("--event-type", required=True)
+    p_latest.add_argument("-n", type=int, default=10)
+
+    p_exists = sub.add_parser("exists", help="whether an event_id already exists")
+    p_exists.add_argument("--event-id", required=True)
+
+    args = ap.parse_args()
+
+    # index 作成（書き込み）は migrate だけが行う。lookup は read-only で開くので読み取り専用の台帳 copy にも使える
+    if args.cmd == "migrate":
+        conn = sqlite3.connect(args.db)
+    else:
+        conn = sqlite3.connect(Path(args.db).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        if args.cmd != "migrate":
+            pending = pending_migrations(conn, args.table)
+            if pending:
+                print(f"WARN: pending migration(s) {pending}; lookups may scan the table (run: ledger_query.py --db {args.db} migrate)", file=sys.stderr)
+
+        if args.cmd == "migrate":
+            applied = migrate(conn, args.table)
+            out = {"status": "OK", "applied": applied, "versions": applied_versions(conn.cursor(), args.table)}
+        elif args.cmd == "plan":
+            out = query_plans(conn, args.table)
+        elif args.cmd == "get":
+            out = event_by_id(conn, args.event_id, args.table)
+        elif args.cmd == "position":
+            out = chain_position(conn, args.chain_hash, args.table)
+        elif args.cmd == "by-type":
+            out = events_by_type(conn, args.event_type, args.since, args.until, args.limit, args.table)
+        elif args.cmd == "latest":
+            out = latest_events(conn, args.event_type, args.n, args.table)
+        else:
+            out = {"event_id": args.event_id, "exists": event_exists(conn, args.event_id, args.table)}
+
+        print(json.dumps(out, indent=2, ensure_ascii=False))
+        if out is None:
+            raise SystemExit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
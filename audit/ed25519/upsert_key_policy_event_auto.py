@@ -5,6 +5,8 @@ import datetime
 import os
 import sys
 
+from ledger_query import latest_events
+
 DB_PATH = "audit.db"
 TABLE = "audit_ledger_event"
 
@@ -224,9 +226,10 @@ def main():
     print("INFERRED chain_hash rule:", chain_rule_name)
 
     # Idempotency: if a key_policy row already exists for this key_id, skip
-    cur.execute(f"SELECT id,event_type,event_content,event_id FROM {TABLE} WHERE event_type=? ORDER BY id DESC LIMIT 1", (TARGET_EVENT_TYPE,))
-    last_kp = cur.fetchone()
-    if last_kp and isinstance(last_kp[2], str) and KEY_ID in last_kp[2]:
+    # ledger_query.py migrate 済みなら event_type index の seek で済む
+    latest = latest_events(conn, TARGET_EVENT_TYPE, 1, TABLE)
+    last_kp = latest[0] if latest else None
+    if last_kp and isinstance(last_kp["event_content"], str) and KEY_ID in last_kp["event_content"]:
         print("SKIP: key_policy already exists. last=", last_kp)
         conn.close()
         return
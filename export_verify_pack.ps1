@@ -84,6 +84,7 @@ $items = @(
   @{ src = $canonPath;                                                           rel = "config\phase12_audit_canonical.json" },
   @{ src = (Join-Path $rootAbs "verify_full_chain.py");                          rel = "verify_full_chain.py" },
   @{ src = (Join-Path $rootAbs "verify_full_chain_and_signature.py");            rel = "verify_full_chain_and_signature.py" },
+  @{ src = (Join-Path $rootAbs "verify_common.py");                              rel = "verify_common.py" },
   @{ src = (Join-Path $rootAbs "README_verify.txt");                             rel = "README_verify.txt" },
   @{ src = (Join-Path $rootAbs "verify.bat");                                    rel = "verify.bat" }
 )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from verify import wrapper_v3  # noqa: E402
+from verify_common import canonical_json_bytes, canonical_json_sha256  # noqa: E402
+
+KEY_ID = "ab" * 32
+PAYLOAD = {"pack_no": 0}
+
+
+def write_v3(path: Path, sk: Ed25519PrivateKey, msgs: list) -> None:
+    # One key, one signed row per msg (the signature is always valid for the stored bytes).
+    meta = canonical_json_bytes({"payload": PAYLOAD})
+    with path.open("wb") as out:
+        out.write(wrapper_v3.MAGIC)
+        out.write(bytes.fromhex(canonical_json_sha256(PAYLOAD)))
+        out.write(wrapper_v3._U32.pack(len(meta)))
+        out.write(meta)
+        out.write(wrapper_v3._U16.pack(1))
+        out.write(bytes.fromhex(KEY_ID))
+        out.write(wrapper_v3._U32.pack(len(msgs)))
+        for msg in msgs:
+            out.write(wrapper_v3._ROW_HEAD.pack(0, sk.sign(msg), len(msg)))
+            out.write(msg)
+
+
+@pytest.fixture
+def sk() -> Ed25519PrivateKey:
+    return Ed25519PrivateKey.generate()
+
+
+def verify(path: Path, sk: Ed25519PrivateKey) -> list:
+    rows: list = []
+    wrapper_v3.verify_wrapper_v3(path, lambda key_id: sk.public_key(), rows.append)
+    return rows
+
+
+def test_canonical_msg_passes(tmp_path: Path, sk: Ed25519PrivateKey) -> None:
+    path = tmp_path / "ok.v3"
+    write_v3(path, sk, [canonical_json_bytes({"row_id": "r0", "v": 1})])
+    rows = verify(path, sk)
+    assert rows[0]["row_id"] == "r0" and rows[0]["key_id"] == KEY_ID
+
+
+def test_non_canonical_msg_fails(tmp_path: Path, sk: Ed25519PrivateKey) -> None:
+    path = tmp_path / "spaced.v3"
+    write_v3(path, sk, [canonical_json_bytes({"row_id": "r0"}), b'{"row_id": "r1", "v": 1}'])
+    with pytest.raises(ValueError, match=r"row\[1\] msg is not canonical JSON"):
+        verify(path, sk)
+    with pytest.raises(ValueError, match=r"row\[1\] msg is not canonical JSON"):
+        wrapper_v3.convert_v3_to_v2(path, tmp_path / "spaced.json")
+
+
+def test_msg_with_sig_fields_fails(tmp_path: Path, sk: Ed25519PrivateKey) -> None:
+    path = tmp_path / "sigfields.v3"
+    write_v3(path, sk, [canonical_json_bytes({"key_id": "cd" * 32, "row_id": "r0"})])
+    with pytest.raises(ValueError, match=r"row\[0\] msg carries signature fields"):
+        verify(path, sk)
+    with pytest.raises(ValueError, match=r"row\[0\] msg carries signature fields"):
+        wrapper_v3.convert_v3_to_v2(path, tmp_path / "sigfields.json")
+
+
+def test_non_object_msg_fails(tmp_path: Path, sk: Ed25519PrivateKey) -> None:
+    path = tmp_path / "list.v3"
+    write_v3(path, sk, [b"[1,2]"])
+    with pytest.raises(ValueError, match=r"row\[0\] msg must be object"):
+        verify(path, sk)
@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# note: governance_ledger_event concurrent append stress benchmark
+# N 個の writer プロセスが同時に append し、fork / orphan が 0 件であることと appends/sec を報告する
+# --legacy は旧実装（plain SELECT で tip を読んでから INSERT）での比較用
+
+REPORT_SCHEMA = "mocka.bench.governance_concurrency.v1"
+REPO = Path(__file__).resolve().parents[1]
+GOVERNANCE_DIR = REPO / "audit" / "ed25519" / "governance"
+sys.path.insert(0, str(GOVERNANCE_DIR))
+
+import governance_writer  # noqa: E402
+
+
+def create_db(db_path: Path) -> None:
+    # init_governance_db.py と同じ genesis 形式
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE governance_ledger_event (
+        event_id TEXT PRIMARY KEY,
+        prev_event_id TEXT NOT NULL,
+        timestamp_utc TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        payload_json TEXT NOT NULL,
+        note TEXT NOT NULL,
+        chain_hash TEXT NOT NULL
+    )
+    """)
+    ts = governance_writer.utc_now_iso()
+    payload_json = json.dumps({"phase": "bench", "reason": "concurrency bench"}, sort_keys=True)
+    event_id = governance_writer.sha256_hex(("GENESIS" + ts + "GOVERNANCE_GENESIS" + payload_json).encode("utf-8"))
+    chain_hash = governance_writer.sha256_hex((event_id + "GENESIS").encode("utf-8"))
+    cur.execute("""
+    INSERT INTO governance_ledger_event
+    (event_id, prev_event_id, timestamp_utc, event_type, payload_json, note, chain_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (event_id, "GENESIS", ts, "GOVERNANCE_GENESIS", payload_json, "note: bench genesis", chain_hash))
+    conn.commit()
+    conn.close()
+
+
+# -------------------------
+# worker
+# -------------------------
+
+def legacy_append(db_path: str, event_type: str, payload: dict, note: str) -> str:
+    # 旧 governance_writer.append_event と同じ手順（tip 読みと INSERT が別トランザクション）
+    conn = sqlite3.connect(db_path, timeout=governance_writer.BUSY_TIMEOUT_SEC)
+    cur = conn.cursor()
+    prev_event_id, prev_chain_hash = governance_writer.get_tip(cur)
+    row = governance_writer.build_event(prev_event_id, prev_chain_hash, event_type, payload, note)
+    governance_writer.insert_event(cur, row)
+    conn.commit()
+    conn.close()
+    return row[0]
+
+
+def worker_main(args) -> int:
+    governance_writer.DB_PATH = args.db
+    delay = args.start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+    appended = 0
+    errors = []
+    t0 = time.perf_counter()
+    for i in range(args.appends):
+        payload = {"writer": args.tag, "seq": i}
+        try:
+            if args.legacy:
+                legacy_append(args.db, "BENCH_APPEND", payload, "note: concurrency bench")
+            else:
+                governance_writer.append_event("BENCH_APPEND", payload, "note: concurrency bench")
+            appended += 1
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    elapsed = time.perf_counter() - t0
+
+    print(json.dumps({
+        "writer": args.tag,
+        "appended": appended,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+        "retries": governance_writer.APPEND_STATS["retries"],
+        "elapsed_sec": round(elapsed, 6),
+    }))
+    return 0
+
+
+# -------------------------
+# analysis
+# -------------------------
+
+def analyze(db_path: Path) -> dict:
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("SELECT event_id, prev_event_id, chain_hash FROM governance_ledger_event ORDER BY rowid ASC")
+    rows = cur.fetchall()
+    conn.close()
+
+    children = {}
+    chain_of = {}
+    genesis = None
+    for event_id, prev_event_id, chain_hash in rows:
+        chain_of[event_id] = chain_hash
+        if prev_event_id == "GENESIS":
+            genesis = event_id
+        children.setdefault(prev_event_id, []).append(event_id)
+
+    # fork = 同じ prev_event_id を持つ 2 本目以降の子
+    forks = sum(len(c) - 1 for c in children.values() if len(c) > 1)
+
+    # genesis から子が 1 本の間だけ辿る。chain_hash も再計算して確認する
+    reachable = 0
+    chain_ok = genesis is not None
+    cur_id = genesis
+    prev_chain = None
+    while cur_id is not None:
+        reachable += 1
+        if prev_chain is None:
+            expected = governance_writer.sha256_hex((cur_id + "GENESIS").encode("utf-8"))
+        else:
+            expected = governance_writer.sha256_hex((prev_chain + cur_id + prev_id).encode("utf-8"))
+        if chain_of[cur_id] != expected:
+            chain_ok = False
+        prev_chain, prev_id = chain_of[cur_id], cur_id
+        nxt = children.get(cur_id, [])
+        cur_id = nxt[0] if len(nxt) == 1 else None
+
+    return {
+        "rows": len(rows),
+        "forks": forks,
+        "reachable": reachable,
+        "orphans": len(rows) - reachable,
+        "chain_ok": chain_ok,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--writers", type=int, default=4, help="writer processes")
+    ap.add_argument("--appends", type=int, default=200, help="appends per writer")
+    ap.add_argument("--db", default="", help="governance.db to create (default: temp dir)")
+    ap.add_argument("--legacy", action="store_true", help="use the pre-WAL append path (expect forks)")
+    ap.add_argument("--out", default="", help="report JSON path")
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--tag", type=int, default=0, help=argparse.SUPPRESS)
+    ap.add_argument("--start-at", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        return worker_main(args)
+
+    tmp = None
+    if args.db:
+        db_path = Path(args.db).resolve()
+        if db_path.exists():
+            raise SystemExit(f"refusing to overwrite existing db: {db_path}")
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="mocka_gov_bench_")
+        db_path = Path(tmp.name) / "governance.db"
+
+    try:
+        create_db(db_path)
+        if not args.legacy:
+            # WAL 切替と index 作成（migrate）は 1 回だけ先に済ませておく
+            conn = governance_writer.open_db(str(db_path))
+            governance_writer.migrate_append_schema(conn)
+            conn.close()
+
+        start_at = time.time() + 0.5 + 0.05 * args.writers
+        procs = [
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "--worker", "--db", str(db_path),
+                 "--appends", str(args.appends), "--tag", str(k), "--start-at", str(start_at)]
+                + (["--legacy"] if args.legacy else []),
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            for k in range(args.writers)
+        ]
+
+        workers = []
+        for p in procs:
+            out, err = p.communicate()
+            lines = [ln for ln in out.splitlines() if ln.strip()]
+            if p.returncode != 0 or not lines:
+                workers.append({"appended": 0, "errors": args.appends, "first_error": (err.strip().splitlines() or ["worker failed"])[-1], "retries": 0, "elapsed_sec": 0.0})
+            else:
+                workers.append(json.loads(lines[-1]))
+        wall = time.time() - start_at
+
+        result = analyze(db_path)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    appended = sum(w["appended"] for w in workers)
+    expected_rows = 1 + args.writers * args.appends
+    ok = result["forks"] == 0 and result["orphans"] == 0 and result["chain_ok"] and result["rows"] == expected_rows
+
+    report = {
+        "schema": REPORT_SCHEMA,
+        "status": "OK" if ok else "FAIL",
+        "mode": "legacy" if args.legacy else "wal_begin_immediate",
+        "writers": args.writers,
+        "appends_per_writer": args.appends,
+        "expected_rows": expected_rows,
+        "appended": appended,
+        "failed_appends": sum(w["errors"] for w in workers),
+        "busy_retries": sum(w["retries"] for w in workers),
+        "wall_sec": round(wall, 6),
+        "appends_per_sec": round(appended / wall, 1) if wall > 0 else None,
+        "first_error": next((w["first_error"] for w in workers if w.get("first_error")), ""),
+    }
+    report.update(result)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+import argparse
+import importlib.util
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# note: normalize_json_bytes canonical fast path benchmark
+# 同じ event_content 列に対して、従来の loads/dumps 再シリアライズと fast path の時間を比べる
+# 出力 bytes が全行で一致することも確認する（不一致なら FAIL）
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+
+def load_verifier(rel_path: str):
+    spec = importlib.util.spec_from_file_location("bench_normalize_target", str(REPO / rel_path))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def normalize_json_bytes_reserialize(text: str) -> bytes:
+    obj = json.loads(text)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def load_contents(db: str, table: str, limit: int):
+    conn = sqlite3.connect(db)
+    try:
+        sql = f"SELECT event_content FROM {table} ORDER BY id ASC"
+        if limit > 0:
+            sql += f" LIMIT {int(limit)}"
+        return [r[0] for r in conn.execute(sql)]
+    finally:
+        conn.close()
+
+
+def best_of(fn, contents, repeat: int) -> float:
+    best = None
+    for _ in range(max(repeat, 1)):
+        t0 = time.perf_counter()
+        for text in contents:
+            fn(text)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", required=True, help="audit.db (e.g. <bench root>/audit/ed25519/audit.db)")
+    ap.add_argument("--table", default="audit_ledger_event")
+    ap.add_argument("--limit", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--verifier", default="verify_common.py", help="module providing normalize_json_bytes / is_canonical_json")
+    args = ap.parse_args()
+
+    mod = load_verifier(args.verifier)
+    contents = load_contents(args.db, args.table, args.limit)
+
+    canonical = sum(1 for text in contents if mod.is_canonical_json(text))
+    for text in contents:
+        if mod.normalize_json_bytes(text) != normalize_json_bytes_reserialize(text):
+            raise SystemExit("FAIL: fast path output differs from re-serialization")
+
+    slow = best_of(normalize_json_bytes_reserialize, contents, args.repeat)
+    fast = best_of(mod.normalize_json_bytes, contents, args.repeat)
+    n = len(contents)
+
+    print(json.dumps({
+        "status": "OK",
+        "rows": n,
+        "canonical_rows": canonical,
+        "reserialize_sec": round(slow, 6),
+        "fast_path_sec": round(fast, 6),
+        "reserialize_rows_per_sec": round(n / slow, 1) if slow > 0 else None,
+        "fast_path_rows_per_sec": round(n / fast, 1) if fast > 0 else None,
+        "speedup": round(slow / fast, 3) if fast > 0 else None,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,196 @@
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# note: Phase15 reconciliation engine benchmark (tools/phase15_auto_sync.py)
+# サイズごとに proof / governance DB を合成し、dry-run → apply → apply(2 回目, 0 件のはず) を計測する
+# per_row_usec がサイズによらずほぼ一定なら線形
+
+REPORT_SCHEMA = "mocka.bench.phase15_sync.v1"
+REPO = Path(__file__).resolve().parents[1]
+GOVERNANCE_DIR = REPO / "audit" / "ed25519" / "governance"
+sys.path.insert(0, str(GOVERNANCE_DIR))
+sys.path.insert(0, str(REPO / "tools"))
+
+import governance_writer  # noqa: E402
+import phase15_auto_sync  # noqa: E402
+
+INSERT_CHUNK = 10000
+
+
+def ts_at(i: int) -> str:
+    return f"2026-01-01T00:00:{i % 60:02d}.{i:06d}+00:00"
+
+
+def build_proof(db_path: Path, rows: int) -> list:
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE audit_ledger_event (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      event_type TEXT NOT NULL,
+      schema_version TEXT NOT NULL,
+      event_content TEXT NOT NULL,
+      event_id TEXT NOT NULL,
+      prev_chain_hash TEXT,
+      chain_hash TEXT NOT NULL,
+      created_at_utc TEXT NOT NULL
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE branch_registry (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      created_utc TEXT NOT NULL,
+      tip_event_id TEXT NOT NULL,
+      orphan_event_id TEXT,
+      orphan_prev_id TEXT,
+      classification TEXT NOT NULL
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE proof_anchor (
+      anchor_id TEXT PRIMARY KEY,
+      governance_event_id TEXT NOT NULL,
+      anchor_hash TEXT NOT NULL,
+      created_utc TEXT NOT NULL
+    )
+    """)
+    event_ids = []
+    prev = None
+    batch = []
+    for i in range(rows):
+        content = json.dumps({"seq": i, "kind": "bench"}, separators=(",", ":"), sort_keys=True)
+        event_id = governance_writer.sha256_hex(content.encode("utf-8"))
+        chain_hash = governance_writer.sha256_hex(((prev or "") + event_id).encode("utf-8"))
+        batch.append(("bench_event", "v1", content, event_id, prev, chain_hash, ts_at(i)))
+        event_ids.append(event_id)
+        prev = chain_hash
+        if len(batch) >= INSERT_CHUNK:
+            cur.executemany("INSERT INTO audit_ledger_event (event_type, schema_version, event_content, event_id, prev_chain_hash, chain_hash, created_at_utc) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        cur.executemany("INSERT INTO audit_ledger_event (event_type, schema_version, event_content, event_id, prev_chain_hash, chain_hash, created_at_utc) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+    return event_ids
+
+
+def decision(i: int, event_ids: list, tip: str):
+    # decision の型を順に回す。target は proof 台帳の実在 event_id
+    target = event_ids[(i * 7919) % len(event_ids)]
+    k = i % 5
+    if k in (0, 1):
+        return "CLASSIFICATION_CHANGE_DECISION", {"target_event_id": target, "from": "historical_test", "to": "quarantined", "reason": "bench"}
+    if k == 2:
+        return "QUARANTINE_ACTION_DECISION", {"target_event_id": target, "action": "quarantine", "reason": "bench"}
+    if k == 3:
+        return "REGISTER_BRANCH", {"tip_event_id": tip, "orphan_event_id": target, "orphan_prev_id": None, "classification": "quarantined"}
+    return "ANCHOR_PROOF", {"anchor_id": f"anchor_{i:09d}"}
+
+
+def build_governance(db_path: Path, decisions: int, event_ids: list) -> None:
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE governance_ledger_event (
+        event_id TEXT PRIMARY KEY,
+        prev_event_id TEXT NOT NULL,
+        timestamp_utc TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        payload_json TEXT NOT NULL,
+        note TEXT NOT NULL,
+        chain_hash TEXT NOT NULL
+    )
+    """)
+    ts = ts_at(0)
+    payload_json = json.dumps({"phase": "bench", "reason": "phase15 bench"}, sort_keys=True)
+    event_id = governance_writer.sha256_hex(("GENESIS" + ts + "GOVERNANCE_GENESIS" + payload_json).encode("utf-8"))
+    chain_hash = governance_writer.sha256_hex((event_id + "GENESIS").encode("utf-8"))
+    batch = [(event_id, "GENESIS", ts, "GOVERNANCE_GENESIS", payload_json, "note: bench genesis", chain_hash)]
+    prev_event_id, prev_chain_hash = event_id, chain_hash
+    tip = event_ids[-1]
+    for i in range(1, decisions + 1):
+        event_type, payload = decision(i, event_ids, tip)
+        row = governance_writer.build_event(prev_event_id, prev_chain_hash, event_type, payload, f"note: bench decision {i}", ts=ts_at(i))
+        batch.append(row)
+        prev_event_id, prev_chain_hash = row[0], row[6]
+        if len(batch) >= INSERT_CHUNK:
+            cur.executemany("INSERT INTO governance_ledger_event VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        cur.executemany("INSERT INTO governance_ledger_event VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+    cur.execute("CREATE INDEX idx_governance_ledger_event_event_type ON governance_ledger_event(event_type)")
+    conn.commit()
+    conn.close()
+
+
+def run_size(rows: int, decisions: int, fetch_rows: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="mocka_phase15_bench_") as tmp:
+        proof_db = Path(tmp) / "audit.db"
+        gov_db = Path(tmp) / "governance.db"
+        event_ids = build_proof(proof_db, rows)
+        build_governance(gov_db, decisions, event_ids)
+        del event_ids
+
+        out = {"proof_rows": rows, "decisions": decisions}
+        for label, apply in (("dry_run", False), ("apply", True), ("apply_again", True)):
+            t0 = time.perf_counter()
+            r = phase15_auto_sync.reconcile(str(gov_db), str(proof_db), apply, fetch_rows)
+            wall = time.perf_counter() - t0
+            out[label] = {
+                "wall_sec": round(wall, 6),
+                "per_row_usec": round(wall / (rows + decisions) * 1e6, 3),
+                "planned_inserts": sum(r["planned_inserts"].values()),
+                "applied": len(r["applied"]),
+                "noop": r["noop"],
+                "mismatches": len(r["mismatches"]),
+                "timings_sec": r["timings_sec"],
+            }
+        return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,1000000", help="comma separated proof ledger row counts")
+    ap.add_argument("--decision-ratio", type=float, default=0.1, help="governance decisions per proof row")
+    ap.add_argument("--fetch-rows", type=int, default=phase15_auto_sync.FETCH_ROWS)
+    ap.add_argument("--out", default="", help="report JSON path")
+    args = ap.parse_args()
+
+    results = []
+    for s in [int(x) for x in args.sizes.split(",") if x]:
+        r = run_size(s, max(int(s * args.decision_ratio), 1), args.fetch_rows)
+        results.append(r)
+        print(f"SIZE: proof_rows={s} decisions={r['decisions']} dry_run={r['dry_run']['wall_sec']}s "
+              f"apply={r['apply']['wall_sec']}s applied={r['apply']['applied']} "
+              f"apply_again={r['apply_again']['wall_sec']}s applied={r['apply_again']['applied']} "
+              f"per_row_usec={r['dry_run']['per_row_usec']}")
+
+    per_row = [r["dry_run"]["per_row_usec"] for r in results]
+    idempotent = all(r["apply_again"]["applied"] == 0 for r in results)
+    report = {
+        "schema": REPORT_SCHEMA,
+        "status": "OK" if idempotent else "FAIL",
+        "idempotent": idempotent,
+        "decision_ratio": args.decision_ratio,
+        "fetch_rows": args.fetch_rows,
+        # 最大サイズと最小サイズの行あたり時間の比。1 付近なら線形
+        "per_row_ratio": round(per_row[-1] / per_row[0], 3) if per_row and per_row[0] else None,
+        "sizes": results,
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print("REPORT:", args.out)
+    else:
+        print(text)
+    return 0 if idempotent else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,331 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+# note: synthetic, fully valid fixtures for tools/bench_verifiers.py
+# layout under --out mirrors the repo root so every verifier can be pointed at it:
+#   audit/ed25519/audit.db                      audit_ledger_event (+ signed daily_signature rows)
+#   audit/ed25519/keys/ed25519_public.key       raw 32-byte public key
+#   audit/ed25519/governance/governance.db      governance_ledger_event chain
+#   keys/public_keys.json, keys/public/*.pem    registry v2
+#   acceptance/bench/pack_NNNN.json             mocka.pack.wrapper.signed.v2
+#   acceptance/quarantine/inbox_consumed/*.json outfield PASS rows
+#   freeze_manifest.json
+
+GEN_SCHEMA = "mocka.bench.synth.v1"
+BASE_TS = datetime(2026, 1, 1, tzinfo=timezone.utc)
+INSERT_CHUNK = 10000
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from verify_common import canonical_json_bytes, canonical_json_sha256
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def ledger_json_bytes(obj) -> bytes:
+    # verify_common.normalize_json_bytes と同一の正規形
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def ts_at(i: int) -> str:
+    return (BASE_TS + timedelta(seconds=i)).isoformat()
+
+def make_key(seed: str) -> Ed25519PrivateKey:
+    return Ed25519PrivateKey.from_private_bytes(hashlib.sha256(seed.encode("utf-8")).digest())
+
+def raw_public_bytes(sk: Ed25519PrivateKey) -> bytes:
+    return sk.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+def chunked(it, n: int):
+    buf = []
+    for x in it:
+        buf.append(x)
+        if len(buf) >= n:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+# -------------------------
+# audit_ledger_event
+# -------------------------
+
+def ledger_rows(rows: int, sig_every: int, pad: int, sk: Ed25519PrivateKey):
+    prev = ""
+    for i in range(rows):
+        if sig_every and i % sig_every == sig_every - 1:
+            event_type = "daily_signature"
+            msg = ledger_json_bytes({
+                "date": ts_at(i)[:10],
+                "final_chain_hash": prev,
+                "file_chain_length": i,
+                "ledger_count": i,
+            })
+            payload = {
+                "date": ts_at(i)[:10],
+                "final_chain_hash": prev,
+                "file_chain_length": i,
+                "ledger_count": i,
+                "signature_hex": sk.sign(msg).hex(),
+                "message_canonical": msg.decode("utf-8"),
+            }
+        else:
+            event_type = "bench_event"
+            payload = {"seq": i, "kind": "bench", "payload": "x" * pad}
+
+        content = ledger_json_bytes(payload)
+        event_id = sha256_hex(content)
+        chain_hash = sha256_hex((prev + event_id).encode("utf-8"))
+        yield (event_type, "v1", content.decode("utf-8"), event_id, prev if prev != "" else None, chain_hash, ts_at(i))
+        prev = chain_hash
+
+def build_ledger(db_path: Path, rows: int, sig_every: int, pad: int, sk: Ed25519PrivateKey) -> str:
+    if db_path.exists():
+        db_path.unlink()
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE audit_ledger_event (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      event_type TEXT NOT NULL,
+      schema_version TEXT NOT NULL,
+      event_content TEXT NOT NULL,
+      event_id TEXT NOT NULL,
+      prev_chain_hash TEXT,
+      chain_hash TEXT NOT NULL,
+      created_at_utc TEXT NOT NULL
+    )
+    """)
+    last = ""
+    for batch in chunked(ledger_rows(rows, sig_every, pad, sk), INSERT_CHUNK):
+        cur.executemany("""
+            INSERT INTO audit_ledger_event
+            (event_type, schema_version, event_content, event_id, prev_chain_hash, chain_hash, created_at_utc)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, batch)
+        last = batch[-1][5]
+    conn.commit()
+    conn.close()
+    return last
+
+# -------------------------
+# governance_ledger_event
+# -------------------------
+
+DECISION_TYPES = ("CLASSIFICATION_CHANGE_DECISION", "QUARANTINE_ACTION_DECISION", "TIP_RESELECT_DECISION")
+
+def governance_rows(rows: int, target_rows: int):
+    genesis_ts = ts_at(0)
+    genesis_payload = json.dumps({"phase": "bench", "proof_tip_hash": "0" * 64, "reason": "synthetic genesis"}, sort_keys=True)
+    event_id = sha256_hex(("GENESIS" + genesis_ts + "GOVERNANCE_GENESIS" + genesis_payload).encode("utf-8"))
+    chain_hash = sha256_hex((event_id + "GENESIS").encode("utf-8"))
+    yield (event_id, "GENESIS", genesis_ts, "GOVERNANCE_GENESIS", genesis_payload, "synthetic genesis", chain_hash)
+
+    prev_event_id, prev_chain_hash = event_id, chain_hash
+    for i in range(1, rows):
+        event_type = DECISION_TYPES[i % len(DECISION_TYPES)]
+        target = sha256_hex(str((i * 7919) % max(target_rows, 1)).encode("utf-8"))
+        if event_type == "CLASSIFICATION_CHANGE_DECISION":
+            payload = {"target_event_id": target, "from": "historical_test", "to": "quarantined", "reason": "bench"}
+        elif event_type == "QUARANTINE_ACTION_DECISION":
+            payload = {"target_event_id": target, "action": "quarantine", "reason": "bench"}
+        else:
+            payload = {"proof_tip": target, "method": "bench", "reason": "bench"}
+
+        ts = ts_at(i)
+        payload_json = json.dumps(payload, sort_keys=True, ensure_ascii=True)
+        note = f"note: bench decision {i}"
+        event_id = sha256_hex((prev_event_id + ts + event_type + payload_json + note).encode("utf-8"))
+        chain_hash = sha256_hex((prev_chain_hash + event_id + prev_event_id).encode("utf-8"))
+        yield (event_id, prev_event_id, ts, event_type, payload_json, note, chain_hash)
+        prev_event_id, prev_chain_hash = event_id, chain_hash
+
+def build_governance(db_path: Path, rows: int, target_rows: int) -> None:
+    if db_path.exists():
+        db_path.unlink()
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE governance_ledger_event (
+        event_id TEXT PRIMARY KEY,
+        prev_event_id TEXT NOT NULL,
+        timestamp_utc TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        payload_json TEXT NOT NULL,
+        note TEXT NOT NULL,
+        chain_hash TEXT NOT NULL
+    )
+    """)
+    for batch in chunked(governance_rows(max(rows, 1), target_rows), INSERT_CHUNK):
+        cur.executemany("""
+            INSERT INTO governance_ledger_event
+            (event_id, prev_event_id, timestamp_utc, event_type, payload_json, note, chain_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, batch)
+    conn.commit()
+    conn.close()
+
+# -------------------------
+# signed pack wrappers (v2) + registry + freeze_manifest
+# -------------------------
+
+def write_registry(out: Path, sk: Ed25519PrivateKey) -> str:
+    key_id = sha256_hex(raw_public_bytes(sk))
+    pem_rel = f"keys/public/ed25519_{key_id}.pem"
+    pem = sk.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    (out / "keys" / "public").mkdir(parents=True, exist_ok=True)
+    (out / pem_rel).write_bytes(pem)
+
+    registry = {
+        "schema": "mocka.keys.ed25519.registry.v2",
+        "policy": {"require_active_keys": True},
+        "keys": {
+            key_id: {
+                "key_id": key_id,
+                "key_version": 1,
+                "public_pem_path": pem_rel,
+                "created_at_utc": ts_at(0),
+                "status": "active",
+                "revoked_at_utc": None,
+                "revoked_reason": None,
+            }
+        },
+    }
+    (out / "keys" / "public_keys.json").write_text(json.dumps(registry, indent=2) + "\n", encoding="utf-8")
+    return key_id
+
+def write_pack(path: Path, pack_no: int, rows: int, sk: Ed25519PrivateKey, key_id: str) -> str:
+    # rows を 1 行ずつ書き出す（10^7 行でもメモリは一定）
+    payload = {"bench": True, "pack_no": pack_no, "rows": rows, "generator": GEN_SCHEMA}
+    # verifier と同じ payload_hash（verify_common）。synthetic pack では pack_sha256 も同じ値
+    payload_hash = canonical_json_sha256(payload)
+    pack_sha256 = payload_hash
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="\n") as f:
+        f.write("{\n")
+        f.write(f'  "pack_sha256": {json.dumps(pack_sha256)},\n')
+        f.write(f'  "payload": {json.dumps(payload, sort_keys=True)},\n')
+        f.write(f'  "payload_hash": {json.dumps(payload_hash)},\n')
+        f.write('  "rows": [')
+        for i in range(rows):
+            row = {
+                "row_id": f"bench:{pack_no:04d}:{i:09d}",
+                "pack_sha256": pack_sha256,
+                "payload_hash": payload_hash,
+                "seq": i,
+            }
+            row["row_sig"] = sk.sign(canonical_json_bytes(row)).hex()
+            row["row_sig_alg"] = "ed25519"
+            row["key_id"] = key_id
+            f.write(("\n    " if i == 0 else ",\n    ") + json.dumps(row, sort_keys=True))
+        f.write("\n  ],\n")
+        f.write('  "schema": "mocka.pack.wrapper.signed.v2"\n}\n')
+
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def write_inbox(out: Path, files: int, zip_name: str, sha: str) -> None:
+    consumed = out / "acceptance" / "quarantine" / "inbox_consumed"
+    consumed.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        fn = f"bench_outfield_{i:08d}.json"
+        row = {
+            "file": fn,
+            "kind": "outfield",
+            "pack_zip_name": zip_name,
+            "pack_sha256": sha,
+            "os": "BenchOS",
+            "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+            "machine": "bench",
+            "submitted_utc": ts_at(i),
+            "overall_status": "PASS",
+            "started_utc": ts_at(i),
+            "run_id": f"bench_{i:08d}",
+        }
+        (consumed / fn).write_text(json.dumps(row, indent=2) + "\n", encoding="utf-8")
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True, help="synthetic root directory")
+    ap.add_argument("--rows", type=int, default=1000, help="audit + governance ledger rows (10^3 .. 10^7)")
+    ap.add_argument("--governance-rows", type=int, default=-1, help="default: --rows")
+    ap.add_argument("--sig-every", type=int, default=100, help="every Nth ledger row is a signed daily_signature (0 = none)")
+    ap.add_argument("--pad", type=int, default=200, help="payload padding bytes per ledger row")
+    ap.add_argument("--packs", type=int, default=4)
+    ap.add_argument("--pack-rows", type=int, default=-1, help="signed rows per pack (default: --rows / --packs)")
+    ap.add_argument("--inbox-files", type=int, default=-1, help="consumed inbox files (default: min(--rows, 10000))")
+    ap.add_argument("--seed", default="mocka-bench", help="deterministic key seed")
+    args = ap.parse_args()
+
+    out = Path(args.out).resolve()
+    gov_rows = args.rows if args.governance_rows < 0 else args.governance_rows
+    pack_rows = max(args.rows // max(args.packs, 1), 1) if args.pack_rows < 0 else args.pack_rows
+    inbox_files = min(args.rows, 10000) if args.inbox_files < 0 else args.inbox_files
+
+    sk = make_key(args.seed)
+
+    ed_dir = out / "audit" / "ed25519"
+    (ed_dir / "keys").mkdir(parents=True, exist_ok=True)
+    (ed_dir / "governance").mkdir(parents=True, exist_ok=True)
+    (ed_dir / "keys" / "ed25519_public.key").write_bytes(raw_public_bytes(sk))
+
+    final_chain_hash = build_ledger(ed_dir / "audit.db", args.rows, args.sig_every, args.pad, sk)
+    build_governance(ed_dir / "governance" / "governance.db", gov_rows, args.rows)
+
+    key_id = write_registry(out, sk)
+    packs = []
+    for p in range(args.packs):
+        rel = f"acceptance/bench/pack_{p:04d}.json"
+        sha = write_pack(out / rel, p, pack_rows, sk, key_id)
+        packs.append({
+            "zip_name": f"bench_pack_{p:04d}.zip",
+            "sha256": sha,
+            "path": rel,
+            "authoritative": p == 0,
+        })
+
+    manifest = {
+        "note": ["NOTE: synthetic freeze_manifest generated by tools/bench_synth_generate.py"],
+        "phase": "Bench",
+        "freeze_utc": ts_at(0),
+        "verify_packs": packs,
+    }
+    (out / "freeze_manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+    if packs:
+        write_inbox(out, inbox_files, packs[0]["zip_name"], packs[0]["sha256"])
+
+    meta = {
+        "schema": GEN_SCHEMA,
+        "rows": args.rows,
+        "governance_rows": gov_rows,
+        "sig_every": args.sig_every,
+        "pad": args.pad,
+        "packs": args.packs,
+        "pack_rows": pack_rows,
+        "inbox_files": inbox_files if packs else 0,
+        "seed": args.seed,
+        "key_id": key_id,
+        "final_chain_hash": final_chain_hash,
+    }
+    (out / "bench_meta.json").write_text(json.dumps(meta, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    print("OK: synthetic fixtures generated")
+    print("ROOT:", out)
+    print(json.dumps(meta, sort_keys=True))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,255 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# note: verifier benchmark harness (fixtures: tools/bench_synth_generate.py)
+# 各 verifier を子プロセスで 1 本ずつ実行し、wall time / rows/sec / peak RSS を JSON に記録する
+# 子プロセスに分けるのは peak RSS を verifier ごとに独立して測るため
+
+REPORT_SCHEMA = "mocka.bench.report.v1"
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+VERIFIERS = (
+    "verify_full_chain",
+    "verify_full_chain_and_signature",
+    "governance_chain_verify",
+    "rebuild_summary_matrix",
+    "build_summary_matrix",
+)
+
+
+def utc_now_z() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def load_module(name: str, rel_path: str):
+    spec = importlib.util.spec_from_file_location(name, str(REPO / rel_path))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def call_main(fn, *args):
+    # verifier は SystemExit / print で結果を返すので両方拾う
+    try:
+        fn(*args)
+        return "OK", ""
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return "OK", ""
+        return "FAIL", str(e.code)
+    except Exception as e:
+        return "FAIL", f"{type(e).__name__}:{e}"
+
+
+# -------------------------
+# child: run exactly one verifier against --root
+# -------------------------
+
+def run_one(name: str, root: Path, meta: dict):
+    audit_db = str(root / "audit" / "ed25519" / "audit.db")
+
+    if name == "verify_full_chain":
+        mod = load_module("bench_verify_full_chain", "verify_full_chain.py")
+        rows = meta["rows"]
+        return rows, lambda: call_main(mod.main, ["--db", audit_db, "--full"])
+
+    if name == "verify_full_chain_and_signature":
+        mod = load_module("bench_verify_full_chain_and_signature", "verify_full_chain_and_signature.py")
+        pubkey = str(root / "audit" / "ed25519" / "keys" / "ed25519_public.key")
+        rows = meta["rows"]
+        return rows, lambda: call_main(mod.main, ["--db", audit_db, "--pubkey", pubkey])
+
+    if name == "governance_chain_verify":
+        mod = load_module("bench_governance_chain_verify", "audit/ed25519/governance/governance_chain_verify.py")
+        mod.DB_PATH = str(root / "audit" / "ed25519" / "governance" / "governance.db")
+        rows = meta["governance_rows"]
+        return rows, lambda: call_main(mod.main, [])
+
+    if name == "rebuild_summary_matrix":
+        mod = load_module("bench_manifest_resolver", "verify/manifest_resolver.py")
+        mod.ROOT = root
+        mod.FREEZE_MANIFEST_PATH = root / "freeze_manifest.json"
+        mod.SUMMARY_PATH = root / "acceptance" / "summary_matrix.json"
+        mod.REGISTRY_PATH = root / "keys" / "public_keys.json"
+        mod.VERIFY_CACHE_DIR = root / ".verify_cache"
+        rows = meta["packs"] * meta["pack_rows"]
+        # 検証そのものを測るので verification cache は使わない
+        return rows, lambda: call_main(mod.rebuild_summary_matrix, True, 1, mod.CHUNK_ROWS, False)
+
+    if name == "build_summary_matrix":
+        mod = load_module("bench_accept_outfield_pass", "verify/accept_outfield_pass.py")
+        mod.ROOT = str(root)
+        mod.ACCEPTANCE_DIR = os.path.join(mod.ROOT, "acceptance")
+        mod.INBOX_DIR = os.path.join(mod.ACCEPTANCE_DIR, "inbox")
+        mod.QUARANTINE_DIR = os.path.join(mod.ACCEPTANCE_DIR, "quarantine")
+        mod.CONSUMED_DIR = os.path.join(mod.QUARANTINE_DIR, "inbox_consumed")
+        mod.SUMMARY_MATRIX_PATH = os.path.join(mod.ACCEPTANCE_DIR, "summary_matrix.json")
+        mod.FREEZE_MANIFEST_PATH = os.path.join(mod.ROOT, "freeze_manifest.json")
+        rows = meta["inbox_files"]
+        return rows, lambda: call_main(mod.build_summary_matrix)
+
+    raise SystemExit(f"unknown verifier: {name}")
+
+
+def child_main(name: str, root: Path) -> int:
+    meta = json.loads((root / "bench_meta.json").read_text(encoding="utf-8"))
+    rss = load_module("bench_rss", "verify_common.py").peak_rss_bytes
+
+    rows, fn = run_one(name, root, meta)
+    out = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        status, error = fn()
+    wall = time.perf_counter() - t0
+
+    text = out.getvalue()
+    if status == "OK" and name == "governance_chain_verify" and "OK: governance chain verified" not in text:
+        status, error = "FAIL", text.strip().splitlines()[0] if text.strip() else "no output"
+
+    print(json.dumps({
+        "verifier": name,
+        "status": status,
+        "error": error,
+        "rows": rows,
+        "wall_sec": round(wall, 6),
+        "peak_rss_bytes": rss(),
+    }))
+    return 0
+
+
+# -------------------------
+# parent: spawn children, aggregate, compare
+# -------------------------
+
+def git_commit() -> str:
+    try:
+        r = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(REPO), capture_output=True, text=True, timeout=30)
+        return r.stdout.strip() if r.returncode == 0 else ""
+    except Exception:
+        return ""
+
+
+def spawn(name: str, root: Path) -> dict:
+    r = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--run-one", name, "--root", str(root)],
+        capture_output=True, text=True,
+    )
+    lines = [ln for ln in r.stdout.splitlines() if ln.strip()]
+    if r.returncode != 0 or not lines:
+        return {"verifier": name, "status": "ERROR", "error": (r.stderr.strip().splitlines() or ["child failed"])[-1]}
+    return json.loads(lines[-1])
+
+
+def summarize(name: str, runs: list) -> dict:
+    ok = [r for r in runs if r.get("status") == "OK"]
+    entry = {"verifier": name, "status": "OK" if len(ok) == len(runs) else "FAIL", "runs": runs}
+    if not ok:
+        return entry
+    walls = [r["wall_sec"] for r in ok]
+    median = statistics.median(walls)
+    rows = ok[0]["rows"]
+    entry.update({
+        "rows": rows,
+        "wall_sec_min": min(walls),
+        "wall_sec_median": round(median, 6),
+        "rows_per_sec": round(rows / median, 1) if median > 0 else None,
+        "peak_rss_bytes": max(r["peak_rss_bytes"] or 0 for r in ok),
+    })
+    return entry
+
+
+def compare(report: dict, base: dict) -> list:
+    base_by_name = {v["verifier"]: v for v in base.get("verifiers", [])}
+    out = []
+    for v in report["verifiers"]:
+        b = base_by_name.get(v["verifier"])
+        if not b or "wall_sec_median" not in v or "wall_sec_median" not in b:
+            continue
+        row = {
+            "verifier": v["verifier"],
+            "wall_sec_base": b["wall_sec_median"],
+            "wall_sec_now": v["wall_sec_median"],
+            "wall_ratio": round(v["wall_sec_median"] / b["wall_sec_median"], 3) if b["wall_sec_median"] else None,
+            "peak_rss_base": b.get("peak_rss_bytes"),
+            "peak_rss_now": v.get("peak_rss_bytes"),
+        }
+        if b.get("peak_rss_bytes"):
+            row["rss_ratio"] = round(v["peak_rss_bytes"] / b["peak_rss_bytes"], 3)
+        out.append(row)
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", required=True, help="fixture root from tools/bench_synth_generate.py")
+    ap.add_argument("--out", default="", help="report JSON path")
+    ap.add_argument("--compare", default="", help="baseline report JSON (e.g. from another commit)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--only", default="", help="comma separated verifier names")
+    ap.add_argument("--run-one", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    root = Path(args.root).resolve()
+    if args.run_one:
+        return child_main(args.run_one, root)
+
+    if not (root / "bench_meta.json").exists():
+        raise SystemExit(f"bench_meta.json not found under {root} (run tools/bench_synth_generate.py first)")
+    meta = json.loads((root / "bench_meta.json").read_text(encoding="utf-8"))
+
+    names = [n for n in args.only.split(",") if n] if args.only else list(VERIFIERS)
+    for n in names:
+        if n not in VERIFIERS:
+            raise SystemExit(f"unknown verifier: {n}")
+
+    results = []
+    for name in names:
+        runs = [spawn(name, root) for _ in range(max(args.repeat, 1))]
+        entry = summarize(name, runs)
+        results.append(entry)
+        print(f"{entry['status']}: {name} rows={entry.get('rows')} median={entry.get('wall_sec_median')}s "
+              f"rows/sec={entry.get('rows_per_sec')} peak_rss={entry.get('peak_rss_bytes')}")
+
+    report = {
+        "schema": REPORT_SCHEMA,
+        "generated_at_utc": utc_now_z(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "fixture": meta,
+        "verifiers": results,
+    }
+
+    if args.compare:
+        base = json.loads(Path(args.compare).read_text(encoding="utf-8-sig"))
+        report["compare"] = {"base_git_commit": base.get("git_commit", ""), "rows": compare(report, base)}
+        for c in report["compare"]["rows"]:
+            print(f"COMPARE: {c['verifier']} wall {c['wall_sec_base']}s -> {c['wall_sec_now']}s (x{c['wall_ratio']}) "
+                  f"rss {c['peak_rss_base']} -> {c['peak_rss_now']}")
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print("REPORT:", args.out)
+    else:
+        print(text)
+
+    return 0 if all(r["status"] == "OK" for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# note: v2 JSON wrapper vs v3 binary wrapper verification benchmark (verify/wrapper_v3.py)
+# bench_synth_generate.py と同じ形式の署名付き pack を作り、v2（load_json + verify_wrapper / streaming）と
+# v3 の strict 検証時間を比べる。v2 -> v3 -> v2 がバイト一致することも確認する
+
+REPORT_SCHEMA = "mocka.bench.wrapper_v3.v1"
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+sys.path.insert(0, str(REPO / "tools"))
+
+import bench_synth_generate  # noqa: E402
+from verify import manifest_resolver, wrapper_v3  # noqa: E402
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def best_of(fn, repeat: int) -> float:
+    return min(timed(fn) for _ in range(repeat))
+
+
+class NoVerifyKey:
+    # 署名検証以外（parse / hex / canonical 化）のコストだけを測るための key
+    def verify(self, sig: bytes, msg: bytes) -> None:
+        return None
+
+
+def run_size(rows: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="mocka_wrapper_v3_bench_") as tmp:
+        root = Path(tmp)
+        sk = bench_synth_generate.make_key("mocka-bench")
+        key_id = bench_synth_generate.write_registry(root, sk)
+        v2 = root / "acceptance" / "bench" / "pack_0000.json"
+        bench_synth_generate.write_pack(v2, 0, rows, sk, key_id)
+
+        manifest_resolver.ROOT = root
+        manifest_resolver.REGISTRY_PATH = root / "keys" / "public_keys.json"
+        manifest_resolver.clear_key_cache()
+
+        v3 = root / "pack_0000.v3"
+        back = root / "pack_0000.v2.json"
+        wrapper_v3.convert_v2_to_v3(v2, v3)
+        wrapper_v3.convert_v3_to_v2(v3, back)
+        expected = json.dumps(manifest_resolver.load_json(v2), ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+        lossless = back.read_text(encoding="utf-8") == expected
+
+        resolve = manifest_resolver.resolve_public_key_strict
+        out = {
+            "rows": rows,
+            "bytes_v2": v2.stat().st_size,
+            "bytes_v3": v3.stat().st_size,
+            "lossless": lossless,
+            "v2_load_sec": round(best_of(lambda: manifest_resolver.verify_wrapper(manifest_resolver.load_json(v2)), repeat), 6),
+            "v2_stream_sec": round(best_of(lambda: manifest_resolver.verify_wrapper_stream(v2), repeat), 6),
+            "v3_sec": round(best_of(lambda: wrapper_v3.verify_wrapper_v3(v3, resolve), repeat), 6),
+        }
+        out["speedup_vs_v2_load"] = round(out["v2_load_sec"] / out["v3_sec"], 3) if out["v3_sec"] else None
+
+        # Ed25519 検証を除いた per-row オーバーヘッド（format の差はここに出る）
+        strict = manifest_resolver.resolve_public_key_strict
+        manifest_resolver.resolve_public_key_strict = lambda k: NoVerifyKey()
+        try:
+            out["v2_load_overhead_sec"] = round(best_of(lambda: manifest_resolver.verify_wrapper(manifest_resolver.load_json(v2)), repeat), 6)
+            out["v3_overhead_sec"] = round(best_of(lambda: wrapper_v3.verify_wrapper_v3(v3, lambda k: NoVerifyKey()), repeat), 6)
+        finally:
+            manifest_resolver.resolve_public_key_strict = strict
+        out["overhead_ratio"] = round(out["v2_load_overhead_sec"] / out["v3_overhead_sec"], 3) if out["v3_overhead_sec"] else None
+        return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000,100000", help="comma separated signed row counts")
+    ap.add_argument("--repeat", type=int, default=3, help="best of N runs per measurement")
+    ap.add_argument("--out", default="", help="report JSON path")
+    args = ap.parse_args()
+
+    results = []
+    for s in [int(x) for x in args.sizes.split(",") if x]:
+        r = run_size(s, max(args.repeat, 1))
+        results.append(r)
+        print(f"SIZE: rows={s} v2_load={r['v2_load_sec']}s v2_stream={r['v2_stream_sec']}s v3={r['v3_sec']}s "
+              f"speedup={r['speedup_vs_v2_load']} overhead_ratio={r['overhead_ratio']} bytes={r['bytes_v2']}->{r['bytes_v3']} lossless={r['lossless']}")
+
+    lossless = all(r["lossless"] for r in results)
+    report = {
+        "schema": REPORT_SCHEMA,
+        "status": "OK" if lossless else "FAIL",
+        "lossless": lossless,
+        "sizes": results,
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print("REPORT:", args.out)
+    else:
+        print(text)
+    return 0 if lossless else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
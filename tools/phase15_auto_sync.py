@@ -1,48 +1,389 @@
 # C:\Users\sirok\MoCKA\tools\phase15_auto_sync.py
 # Phase15 governance->proof reconciliation engine
-# mode: audit-only (default)
+# mode: dry-run (default) / --apply
+# rules: docs/PHASE15_PROOF_DICTIONARY.md
+#
+# hash join:
+#   build  : governance decisions (event_type index) -> {target_id: [decision, ...]}
+#   probe  : audit_ledger_event / branch_registry / proof_anchor を 1 回ずつ fetchmany で流し、target_id が一致する行だけ保持
+#   resolve: target ごとに台帳順で decision を評価 -> insert / noop / mismatch
+# 各表は 1 回しか読まないので行数に対して線形。メモリは decision 数に比例する。
 
 import sqlite3
 import os
 import sys
+import json
+import time
+import hashlib
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
 
 ROOT = r"C:\Users\sirok\MoCKA"
 GOV_DB = os.path.join(ROOT, "audit", "ed25519", "governance", "governance.db")
 PROOF_DB = os.path.join(ROOT, "audit", "ed25519", "audit.db")
 
-def fetch_governance_decisions():
-    conn = sqlite3.connect(GOV_DB)
-    cur = conn.cursor()
+REPORT_SCHEMA = "mocka.phase15.reconcile.report.v1"
+FETCH_ROWS = 5000
 
-    cur.execute("""
-        SELECT event_id, event_type
+RECONCILE_TYPES = (
+    "CLASSIFICATION_CHANGE_DECISION",
+    "QUARANTINE_ACTION_DECISION",
+    "REGISTER_BRANCH",
+    "CLOSE_BRANCH",
+    "ANCHOR_PROOF",
+)
+BRANCH_TYPES = ("CLASSIFICATION_CHANGE_DECISION", "QUARANTINE_ACTION_DECISION", "REGISTER_BRANCH", "CLOSE_BRANCH")
+
+# decision: (gov_rowid, gov_event_id, timestamp_utc, event_type, target_id, args)
+Decision = Tuple[int, str, str, str, str, Tuple[Any, ...]]
+
+def sha256_hex(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+def connect_ro(path: str) -> sqlite3.Connection:
+    # dry-run では DB を一切書き換えない
+    return sqlite3.connect("file:" + path.replace("\\", "/") + "?mode=ro", uri=True)
+
+def table_exists(cur: sqlite3.Cursor, name: str) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cur.fetchone() is not None
+
+def stream(cur: sqlite3.Cursor, sql: str, params=(), fetch_rows: int = FETCH_ROWS):
+    cur.execute(sql, params)
+    while True:
+        batch = cur.fetchmany(fetch_rows)
+        if not batch:
+            return
+        yield from batch
+
+# -------------------------
+# build side: governance decisions
+# -------------------------
+
+def decision_args(event_type: str, payload: Dict[str, Any]) -> Tuple[Optional[str], Tuple[Any, ...]]:
+    # (target_id, args)。target_id が取れない decision は mismatch 扱い
+    if event_type == "CLASSIFICATION_CHANGE_DECISION":
+        return payload.get("target_event_id"), (payload.get("from"), payload.get("to"))
+    if event_type == "QUARANTINE_ACTION_DECISION":
+        return payload.get("target_event_id"), (payload.get("action"), payload.get("to"))
+    if event_type == "REGISTER_BRANCH":
+        return payload.get("orphan_event_id"), (payload.get("tip_event_id"), payload.get("orphan_prev_id"), payload.get("classification"))
+    if event_type == "CLOSE_BRANCH":
+        return payload.get("orphan_event_id") or payload.get("target_event_id"), ()
+    if event_type == "ANCHOR_PROOF":
+        return payload.get("anchor_id"), ()
+    return None, ()
+
+def build_decisions(gov_conn: sqlite3.Connection, fetch_rows: int) -> Tuple[Dict[str, List[Decision]], int, List[Dict[str, Any]]]:
+    by_target: Dict[str, List[Decision]] = {}
+    mismatches: List[Dict[str, Any]] = []
+    n = 0
+    cur = gov_conn.cursor()
+    sql = f"""
+        SELECT rowid, event_id, timestamp_utc, event_type, payload_json
         FROM governance_ledger_event
-        WHERE event_type IN (
-            'CLASSIFICATION_CHANGE_DECISION',
-            'QUARANTINE_ACTION_DECISION'
-        );
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-def main():
-    print("=== Phase15 Auto Sync (Audit Mode) ===")
-
-    if not os.path.exists(GOV_DB):
+        WHERE event_type IN ({",".join("?" for _ in RECONCILE_TYPES)})
+        ORDER BY rowid ASC
+    """
+    for rowid, event_id, ts, event_type, payload_json in stream(cur, sql, RECONCILE_TYPES, fetch_rows):
+        n += 1
+        try:
+            payload = json.loads(payload_json)
+        except ValueError:
+            payload = None
+        target, args = decision_args(event_type, payload) if isinstance(payload, dict) else (None, ())
+        if not isinstance(target, str) or not target:
+            mismatches.append(mismatch("DECISION_TARGET_MISSING", (rowid, event_id, ts, event_type, "", ()), "payload has no target id"))
+            continue
+        by_target.setdefault(target, []).append((rowid, event_id, ts, event_type, target, args))
+    return by_target, n, mismatches
+
+# -------------------------
+# probe side: proof tables
+# -------------------------
+
+def probe_proof(proof_conn: sqlite3.Connection, by_target: Dict[str, List[Decision]], fetch_rows: int) -> Dict[str, Any]:
+    cur = proof_conn.cursor()
+    out: Dict[str, Any] = {
+        "proof_rows_scanned": 0,
+        "proof_tip": None,
+        "ledger": {},
+        "registry": None,
+        "anchors": None,
+    }
+
+    # audit_ledger_event: event_id -> (id, prev_chain_hash)。同一 event_id は最初の行を採用
+    ledger: Dict[str, Tuple[int, Optional[str]]] = out["ledger"]
+    last = None
+    for row_id, event_id, prev_chain_hash in stream(cur, "SELECT id, event_id, prev_chain_hash FROM audit_ledger_event ORDER BY id ASC", (), fetch_rows):
+        out["proof_rows_scanned"] += 1
+        last = event_id
+        if event_id in by_target and event_id not in ledger:
+            ledger[event_id] = (row_id, prev_chain_hash)
+    out["proof_tip"] = last
+
+    if table_exists(cur, "branch_registry"):
+        registry: Dict[str, List[Tuple[int, str, Optional[str], Optional[str], str]]] = {}
+        sql = "SELECT id, tip_event_id, orphan_event_id, orphan_prev_id, classification FROM branch_registry ORDER BY id ASC"
+        for row in stream(cur, sql, (), fetch_rows):
+            if row[2] in by_target:
+                registry.setdefault(row[2], []).append(row)
+        out["registry"] = registry
+
+    if table_exists(cur, "proof_anchor"):
+        anchors: Dict[str, Tuple[str, str]] = {}
+        for anchor_id, governance_event_id, anchor_hash in stream(cur, "SELECT anchor_id, governance_event_id, anchor_hash FROM proof_anchor", (), fetch_rows):
+            if anchor_id in by_target:
+                anchors[anchor_id] = (governance_event_id, anchor_hash)
+        out["anchors"] = anchors
+
+    return out
+
+# -------------------------
+# resolve
+# -------------------------
+
+def mismatch(kind: str, d: Decision, detail: str) -> Dict[str, Any]:
+    return {
+        "kind": kind,
+        "governance_rowid": d[0],
+        "governance_event_id": d[1],
+        "event_type": d[3],
+        "target_id": d[4],
+        "detail": detail,
+    }
+
+def resolve(by_target: Dict[str, List[Decision]], probe: Dict[str, Any]) -> Dict[str, Any]:
+    # 返り値の inserts は (gov_rowid, table, row) で、apply 時は gov_rowid 順に入れる
+    inserts: List[Tuple[int, str, Tuple[Any, ...]]] = []
+    mismatches: List[Dict[str, Any]] = []
+    warnings: List[Dict[str, Any]] = []
+    noop = 0
+    joined = 0
+
+    ledger = probe["ledger"]
+    registry = probe["registry"]
+    anchors = probe["anchors"]
+    proof_tip = probe["proof_tip"]
+
+    for target, decisions in by_target.items():
+        hit = ledger.get(target)
+        if hit is not None:
+            joined += 1
+        orphan_prev_id = (hit[1] or "GENESIS") if hit is not None else None
+
+        rows = registry.get(target, []) if registry is not None else []
+        state = rows[-1][4] if rows else None
+        tuples = {r[1:4]: r[4] for r in rows}
+        anchor = anchors.get(target) if anchors is not None else None
+
+        for d in decisions:
+            rowid, event_id, ts, event_type, _, args = d
+
+            if event_type in BRANCH_TYPES and registry is None:
+                mismatches.append(mismatch("TARGET_TABLE_MISSING", d, "branch_registry not found in proof DB"))
+                continue
+            if event_type in ("CLASSIFICATION_CHANGE_DECISION", "QUARANTINE_ACTION_DECISION") and hit is None:
+                # outbox 由来の孤児など proof 台帳外の target。orphan_prev_id は NULL で登録する
+                warnings.append(mismatch("TARGET_NOT_IN_PROOF", d, "target_event_id not in audit_ledger_event"))
+
+            if event_type == "CLASSIFICATION_CHANGE_DECISION":
+                frm, to = args
+                if not isinstance(to, str) or not to:
+                    mismatches.append(mismatch("DECISION_INVALID", d, "payload.to missing"))
+                elif state == to:
+                    noop += 1
+                elif state is None or state == frm:
+                    inserts.append((rowid, "branch_registry", (ts, proof_tip or "", target, orphan_prev_id, to)))
+                    # 後続の REGISTER_BRANCH が同じ tuple を見るよう、登録済みとして扱う
+                    tuples[(proof_tip or "", target, orphan_prev_id)] = to
+                    state = to
+                else:
+                    mismatches.append(mismatch("CLASSIFICATION_STATE_MISMATCH", d, f"registry={state} decision.from={frm}"))
+
+            elif event_type == "QUARANTINE_ACTION_DECISION":
+                action, to = args
+                if action == "quarantine":
+                    if state == "quarantined":
+                        noop += 1
+                    else:
+                        inserts.append((rowid, "branch_registry", (ts, proof_tip or "", target, orphan_prev_id, "quarantined")))
+                        tuples[(proof_tip or "", target, orphan_prev_id)] = "quarantined"
+                        state = "quarantined"
+                elif action == "release":
+                    if state != "quarantined":
+                        if isinstance(to, str) and state == to:
+                            noop += 1
+                        else:
+                            mismatches.append(mismatch("RELEASE_NOT_QUARANTINED", d, f"registry={state}"))
+                    elif not isinstance(to, str) or not to:
+                        mismatches.append(mismatch("RELEASE_TARGET_UNSPECIFIED", d, "payload.to required for release"))
+                    else:
+                        inserts.append((rowid, "branch_registry", (ts, proof_tip or "", target, orphan_prev_id, to)))
+                        tuples[(proof_tip or "", target, orphan_prev_id)] = to
+                        state = to
+                else:
+                    mismatches.append(mismatch("DECISION_INVALID", d, f"unknown action: {action}"))
+
+            elif event_type == "REGISTER_BRANCH":
+                tip_event_id, prev_id, classification = args
+                key = (tip_event_id, target, prev_id)
+                if not isinstance(tip_event_id, str) or not tip_event_id or not isinstance(classification, str) or not classification:
+                    mismatches.append(mismatch("DECISION_INVALID", d, "tip_event_id / classification required"))
+                elif key not in tuples:
+                    inserts.append((rowid, "branch_registry", (ts, tip_event_id, target, prev_id, classification)))
+                    tuples[key] = classification
+                    state = classification
+                elif tuples[key] == classification:
+                    noop += 1
+                else:
+                    mismatches.append(mismatch("REGISTER_CLASSIFICATION_CONFLICT", d, f"registry={tuples[key]} decision={classification}"))
+
+            elif event_type == "CLOSE_BRANCH":
+                # branch_registry に close 状態の列が無いので常に mismatch（適用しない）
+                mismatches.append(mismatch("CLOSE_STATE_UNSUPPORTED", d, "branch_registry has no close marker"))
+
+            elif event_type == "ANCHOR_PROOF":
+                anchor_hash = sha256_hex((event_id + target).encode("utf-8"))
+                if anchors is None:
+                    mismatches.append(mismatch("TARGET_TABLE_MISSING", d, "proof_anchor not found in proof DB"))
+                elif anchor is None:
+                    inserts.append((rowid, "proof_anchor", (target, event_id, anchor_hash, ts)))
+                    anchor = (event_id, anchor_hash)
+                elif anchor[1] == anchor_hash:
+                    noop += 1
+                else:
+                    mismatches.append(mismatch("ANCHOR_HASH_MISMATCH", d, f"existing governance_event_id={anchor[0]}"))
+
+    inserts.sort(key=lambda x: x[0])
+    mismatches.sort(key=lambda m: m["governance_rowid"])
+    warnings.sort(key=lambda m: m["governance_rowid"])
+    return {"inserts": inserts, "mismatches": mismatches, "warnings": warnings, "noop": noop, "joined_targets": joined}
+
+# -------------------------
+# apply
+# -------------------------
+
+INSERT_SQL = {
+    "branch_registry": "INSERT INTO branch_registry (created_utc, tip_event_id, orphan_event_id, orphan_prev_id, classification) VALUES (?, ?, ?, ?, ?)",
+    "proof_anchor": "INSERT OR IGNORE INTO proof_anchor (anchor_id, governance_event_id, anchor_hash, created_utc) VALUES (?, ?, ?, ?)",
+}
+
+def apply_inserts(cur: sqlite3.Cursor, inserts: List[Tuple[int, str, Tuple[Any, ...]]]) -> List[Dict[str, Any]]:
+    # 呼び出し側のトランザクション内で使う。返り値の id で今回作った行だけを戻せる
+    applied = []
+    for gov_rowid, table, row in inserts:
+        cur.execute(INSERT_SQL[table], row)
+        if cur.rowcount == 1:
+            applied.append({"table": table, "id": row[0] if table == "proof_anchor" else cur.lastrowid, "governance_rowid": gov_rowid})
+    return applied
+
+def reconcile(gov_db: str = "", proof_db: str = "", apply: bool = False, fetch_rows: int = FETCH_ROWS) -> Dict[str, Any]:
+    gov_db = gov_db or GOV_DB
+    proof_db = proof_db or PROOF_DB
+    t0 = time.perf_counter()
+
+    gov_conn = connect_ro(gov_db)
+    try:
+        by_target, n_decisions, bad = build_decisions(gov_conn, fetch_rows)
+    finally:
+        gov_conn.close()
+    t_build = time.perf_counter()
+
+    if apply:
+        proof_conn = sqlite3.connect(proof_db, timeout=5.0, isolation_level=None)
+    else:
+        proof_conn = connect_ro(proof_db)
+    try:
+        # apply 時は probe から insert までを 1 つの書き込みロック下で行う。途中失敗は ROLLBACK
+        cur = proof_conn.cursor()
+        if apply:
+            cur.execute("BEGIN IMMEDIATE")
+        try:
+            probe = probe_proof(proof_conn, by_target, fetch_rows)
+            t_probe = time.perf_counter()
+            plan = resolve(by_target, probe)
+            applied = apply_inserts(cur, plan["inserts"]) if apply else []
+            if apply:
+                cur.execute("COMMIT")
+        except BaseException:
+            if proof_conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+    finally:
+        proof_conn.close()
+    t_end = time.perf_counter()
+
+    mismatches = sorted(bad + plan["mismatches"], key=lambda m: m["governance_rowid"])
+    counts: Dict[str, int] = {}
+    for _, table, _ in plan["inserts"]:
+        counts[table] = counts.get(table, 0) + 1
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "mode": "apply" if apply else "dry_run",
+        "gov_db": gov_db,
+        "proof_db": proof_db,
+        "status": "MISMATCH" if mismatches else "OK",
+        "decisions": n_decisions,
+        "targets": len(by_target),
+        "proof_rows_scanned": probe["proof_rows_scanned"],
+        "proof_tip": probe["proof_tip"],
+        "joined_targets": plan["joined_targets"],
+        "planned_inserts": counts,
+        "noop": plan["noop"],
+        "applied": applied,
+        "mismatches": mismatches,
+        "warnings": plan["warnings"],
+        "timings_sec": {
+            "build": round(t_build - t0, 6),
+            "probe": round(t_probe - t_build, 6),
+            "resolve_apply": round(t_end - t_probe, 6),
+            "total": round(t_end - t0, 6),
+        },
+    }
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--gov-db", default=GOV_DB)
+    ap.add_argument("--proof-db", default=PROOF_DB)
+    ap.add_argument("--apply", action="store_true", help="write planned inserts to the proof DB (default: dry-run)")
+    ap.add_argument("--fetch-rows", type=int, default=FETCH_ROWS)
+    ap.add_argument("--report", default="", help="write JSON report to this path")
+    ap.add_argument("--json", action="store_true", help="print JSON report instead of text")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.gov_db):
         print("FATAL: governance DB not found")
-        sys.exit(2)
+        return 2
 
-    if not os.path.exists(PROOF_DB):
+    if not os.path.exists(args.proof_db):
         print("FATAL: proof DB not found")
-        sys.exit(3)
+        return 3
+
+    report = reconcile(args.gov_db, args.proof_db, args.apply, args.fetch_rows)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", newline="\n") as f:
+            f.write(json.dumps(report, indent=2, sort_keys=True) + "\n")
 
-    decisions = fetch_governance_decisions()
-    print("GOV_DECISION_COUNT:", len(decisions))
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print("=== Phase15 Auto Sync (" + ("Apply" if args.apply else "Dry-Run") + " Mode) ===")
+        print("GOV_DECISION_COUNT:", report["decisions"])
+        print("PROOF_ROWS_SCANNED:", report["proof_rows_scanned"])
+        print("JOINED_TARGETS:", report["joined_targets"], "/", report["targets"])
+        print("PLANNED_INSERTS:", json.dumps(report["planned_inserts"], sort_keys=True))
+        print("NOOP:", report["noop"])
+        print("APPLIED:", len(report["applied"]))
+        for w in report["warnings"]:
+            print("WARN:", w["kind"], w["event_type"], w["target_id"])
+        for m in report["mismatches"]:
+            print("MISMATCH:", m["kind"], m["event_type"], m["target_id"], "-", m["detail"])
+        print("STATUS:", report["status"])
 
-    # 現在は照合未実装
-    print("STATUS: audit-only mode")
-    print("NEXT: implement reconciliation logic")
+    return 1 if report["mismatches"] else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
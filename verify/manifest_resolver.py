@@ -1,20 +1,49 @@
 from __future__ import annotations
 
+import hmac
 import json
 import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from hashlib import sha256
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 from cryptography.hazmat.primitives import serialization
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from verify import wrapper_v3  # noqa: E402
+from verify_common import canonical_json_bytes, canonical_json_sha256  # noqa: E402,F401
 FREEZE_MANIFEST_PATH = ROOT / "freeze_manifest.json"
 SUMMARY_PATH = ROOT / "acceptance" / "summary_matrix.json"
+SUMMARY_SHARD_DIR = ROOT / "acceptance" / "summary_matrix.shards"
 REGISTRY_PATH = ROOT / "keys" / "public_keys.json"
 
+VERIFY_CACHE_DIR = ROOT / ".verify_cache"
+# HMAC key for cache entries; deliberately outside the repository and VERIFY_CACHE_DIR.
+VERIFY_CACHE_KEY_PATH = Path.home() / ".mocka" / "verify_cache.key"
+
+# Parallel rebuild: rows per signature-verification task.
+CHUNK_ROWS = 5000
+
+# Streaming wrapper reader: characters read per refill.
+STREAM_CHUNK_CHARS = 1024 * 1024
+
+# Part of the verification cache key. Bump whenever pack/row verification semantics change.
+VERIFIER_VERSION = "manifest_resolver.strict.v2.1"
+VERIFY_CACHE_SCHEMA = "mocka.verify.pack_cache.v3"
+
+# Sharded summary (alternative to the single-file summary_matrix.json).
+SUMMARY_SHARDED_SCHEMA = "mocka.summary.sharded.v1"
+SUMMARY_SHARD_SCHEMA = "mocka.summary.shard.v1"
+SUMMARY_SHARD_PREFIX_LEN = 2
+
 
 # -------------------------
 # JSON utilities
@@ -39,15 +68,18 @@ def write_json(path: Path, obj: Any) -> None:
 # Canonical + hash
 # -------------------------
 
-def canonical_json_bytes(obj: Any) -> bytes:
-    s = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-    return s.encode("utf-8")
-
-
 def sha256_hex(data: bytes) -> str:
     return sha256(data).hexdigest()
 
 
+def sha256_file_hex(path: Path) -> str:
+    h = sha256()
+    with path.open("rb") as f:
+        for b in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(b)
+    return h.hexdigest()
+
+
 # -------------------------
 # Registry v2 strict-only
 # -------------------------
@@ -78,8 +110,57 @@ def load_registry_v2() -> Dict[str, Any]:
     return reg
 
 
+# -------------------------
+# Registry / public key cache (process-wide)
+# -------------------------
+
+# File identity = (path, size, mtime_ns, inode). Any rewrite of the registry or a PEM
+# file changes it, so a stale entry is never served; policy checks still run per call.
+_REGISTRY_CACHE: Dict[str, Any] = {"identity": None, "registry": None}
+_PUBLIC_KEY_CACHE: Dict[Tuple[str, int, int, int], Ed25519PublicKey] = {}
+
+
+def _file_identity(path: Path) -> Tuple[str, int, int, int]:
+    st = path.stat()
+    return (str(path), st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _load_registry_v2_cached() -> Dict[str, Any]:
+    if not REGISTRY_PATH.exists():
+        raise FileNotFoundError(f"registry not found: {REGISTRY_PATH}")
+
+    ident = _file_identity(REGISTRY_PATH)
+    if _REGISTRY_CACHE["identity"] != ident:
+        reg = load_registry_v2()
+        _REGISTRY_CACHE["identity"] = ident
+        _REGISTRY_CACHE["registry"] = reg
+    return _REGISTRY_CACHE["registry"]
+
+
+def _load_public_key_cached(pub_path: Path) -> Ed25519PublicKey:
+    ident = _file_identity(pub_path)
+    pk = _PUBLIC_KEY_CACHE.get(ident)
+    if pk is not None:
+        return pk
+
+    pem = pub_path.read_bytes()
+    pk = serialization.load_pem_public_key(pem)
+
+    if not isinstance(pk, Ed25519PublicKey):
+        raise TypeError("loaded key is not ed25519")
+
+    _PUBLIC_KEY_CACHE[ident] = pk
+    return pk
+
+
+def clear_key_cache() -> None:
+    _REGISTRY_CACHE["identity"] = None
+    _REGISTRY_CACHE["registry"] = None
+    _PUBLIC_KEY_CACHE.clear()
+
+
 def resolve_public_key_strict(key_id: str) -> Ed25519PublicKey:
-    reg = load_registry_v2()
+    reg = _load_registry_v2_cached()
     keys = reg["keys"]
 
     if key_id not in keys:
@@ -109,30 +190,25 @@ def resolve_public_key_strict(key_id: str) -> Ed25519PublicKey:
     if not pub_path.exists():
         raise FileNotFoundError(f"public key file missing: {pub_path}")
 
-    pem = pub_path.read_bytes()
-    pk = serialization.load_pem_public_key(pem)
-
-    if not isinstance(pk, Ed25519PublicKey):
-        raise TypeError("loaded key is not ed25519")
-
-    return pk
+    return _load_public_key_cached(pub_path)
 
 
 # -------------------------
 # Wrapper verification (strict)
 # -------------------------
 
-def verify_payload_hash(wrapper: Dict[str, Any]) -> None:
+def verify_payload_hash(wrapper: Dict[str, Any], payload_sha256: Optional[str] = None) -> None:
+    # payload_sha256: digest already taken while streaming (the wrapper then has no "payload" member).
     payload = wrapper.get("payload", None)
     expected = wrapper.get("payload_hash", "")
 
-    if payload is None:
+    if payload is None and payload_sha256 is None:
         raise ValueError("wrapper.payload missing")
 
     if not isinstance(expected, str) or len(expected) != 64:
         raise ValueError("wrapper.payload_hash invalid")
 
-    actual = sha256_hex(canonical_json_bytes(payload))
+    actual = payload_sha256 if payload_sha256 is not None else canonical_json_sha256(payload)
     if actual != expected:
         raise ValueError(f"payload_hash mismatch expected={expected} actual={actual}")
 
@@ -142,40 +218,50 @@ def verify_rows_ed25519(wrapper: Dict[str, Any]) -> None:
     if not isinstance(rows, list):
         raise ValueError("wrapper.rows must be list")
 
+    # One strict resolution per key_id per wrapper (rows usually share a single key).
+    resolved: Dict[str, Ed25519PublicKey] = {}
+
     for idx, row in enumerate(rows):
-        if not isinstance(row, dict):
-            raise ValueError(f"row[{idx}] must be object")
+        verify_row_ed25519(idx, row, resolved)
 
-        if row.get("row_sig_alg", "") != "ed25519":
-            raise ValueError(f"row[{idx}] invalid row_sig_alg")
 
-        key_id = row.get("key_id", "")
-        sig_hex = row.get("row_sig", "")
+def verify_row_ed25519(idx: int, row: Any, resolved: Dict[str, Ed25519PublicKey]) -> None:
+    if not isinstance(row, dict):
+        raise ValueError(f"row[{idx}] must be object")
 
-        if not isinstance(key_id, str) or len(key_id) != 64:
-            raise ValueError(f"row[{idx}] invalid key_id")
+    if row.get("row_sig_alg", "") != "ed25519":
+        raise ValueError(f"row[{idx}] invalid row_sig_alg")
 
-        if not isinstance(sig_hex, str) or len(sig_hex) == 0:
-            raise ValueError(f"row[{idx}] invalid row_sig")
+    key_id = row.get("key_id", "")
+    sig_hex = row.get("row_sig", "")
 
-        try:
-            sig = bytes.fromhex(sig_hex)
-        except Exception:
-            raise ValueError(f"row[{idx}] row_sig hex decode failed")
+    if not isinstance(key_id, str) or len(key_id) != 64:
+        raise ValueError(f"row[{idx}] invalid key_id")
+
+    if not isinstance(sig_hex, str) or len(sig_hex) == 0:
+        raise ValueError(f"row[{idx}] invalid row_sig")
 
+    try:
+        sig = bytes.fromhex(sig_hex)
+    except Exception:
+        raise ValueError(f"row[{idx}] row_sig hex decode failed")
+
+    pk = resolved.get(key_id)
+    if pk is None:
         pk = resolve_public_key_strict(key_id)
+        resolved[key_id] = pk
 
-        row_for_verify = dict(row)
-        row_for_verify.pop("row_sig", None)
-        row_for_verify.pop("row_sig_alg", None)
-        row_for_verify.pop("key_id", None)
+    row_for_verify = dict(row)
+    row_for_verify.pop("row_sig", None)
+    row_for_verify.pop("row_sig_alg", None)
+    row_for_verify.pop("key_id", None)
 
-        msg = canonical_json_bytes(row_for_verify)
+    msg = canonical_json_bytes(row_for_verify)
 
-        try:
-            pk.verify(sig, msg)
-        except Exception:
-            raise ValueError(f"row[{idx}] signature verification failed")
+    try:
+        pk.verify(sig, msg)
+    except Exception:
+        raise ValueError(f"row[{idx}] signature verification failed")
 
 
 def verify_wrapper(wrapper: Dict[str, Any]) -> None:
@@ -186,6 +272,222 @@ def verify_wrapper(wrapper: Dict[str, Any]) -> None:
     verify_rows_ed25519(wrapper)
 
 
+# -------------------------
+# Streaming wrapper reader
+# -------------------------
+# Top-level members are decoded one by one; "rows" is walked element by element and "payload"
+# is hashed as it is read, so only the current row (plus the small members) is held in memory.
+
+class WrapperStreamError(ValueError):
+    """File is not a well-formed top-level JSON object; callers fall back to load_json."""
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+
+class _StreamReader:
+    def __init__(self, f, chunk_chars: int) -> None:
+        self.f = f
+        self.chunk_chars = chunk_chars
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, n: int) -> bool:
+        if self.pos >= self.chunk_chars:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        data = self.f.read(n)
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_chars):
+                return ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise WrapperStreamError(f"expected {ch!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        want = self.chunk_chars
+        while True:
+            self.peek()
+            try:
+                v, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number ending at the buffer edge (or at a "." / exponent cut by it) may continue
+                # in the next chunk.
+                if self.eof or (end < len(self.buf) and self.buf[end] not in _NUMBER_TAIL):
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(want)
+            want *= 2
+
+
+def _hash_canonical(r: _StreamReader, h: Any) -> None:
+    # Feeds canonical_json_bytes(value) of the next value to h without building arrays/objects.
+    # Object keys must already be in canonical (sorted, unique) order; anything else raises
+    # WrapperStreamError and the caller re-verifies through load_json.
+    c = r.peek()
+    if c not in ("[", "{"):
+        h.update(canonical_json_bytes(r.value()))
+        return
+    close = "]" if c == "[" else "}"
+    r.pos += 1
+    h.update(c.encode("ascii"))
+    prev: Optional[str] = None
+    first = True
+    if r.peek() == close:
+        r.pos += 1
+    else:
+        while True:
+            if not first:
+                h.update(b",")
+            first = False
+            if c == "{":
+                if r.peek() != '"':
+                    raise WrapperStreamError("expected member name")
+                key = r.value()
+                if prev is not None and key <= prev:
+                    raise WrapperStreamError("object keys not in canonical order")
+                r.expect(":")
+                h.update(canonical_json_bytes(key) + b":")
+                prev = key
+            _hash_canonical(r, h)
+            d = r.peek()
+            r.pos += 1
+            if d == close:
+                break
+            if d != ",":
+                raise WrapperStreamError(f"expected ',' or {close!r}")
+    h.update(close.encode("ascii"))
+
+
+def iter_wrapper(path: Path, chunk_chars: int = STREAM_CHUNK_CHARS, hash_members: Tuple[str, ...] = ()) -> Iterator[Tuple[str, Any, Any]]:
+    # Events: ("member", key, value) / ("row", index, row) / ("rows_end", count, None)
+    # / ("member_sha256", key, canonical sha256) for array/object members listed in hash_members.
+    with path.open("r", encoding="utf-8-sig") as f:
+        r = _StreamReader(f, chunk_chars)
+        r.expect("{")
+        seen = set()
+        if r.peek() == "}":
+            r.pos += 1
+        else:
+            while True:
+                if r.peek() != '"':
+                    raise WrapperStreamError("expected member name")
+                key = r.value()
+                r.expect(":")
+                if key in seen:
+                    raise WrapperStreamError(f"duplicate member: {key}")
+                seen.add(key)
+
+                if key == "rows" and r.peek() == "[":
+                    r.pos += 1
+                    n = 0
+                    if r.peek() == "]":
+                        r.pos += 1
+                    else:
+                        while True:
+                            yield ("row", n, r.value())
+                            n += 1
+                            c = r.peek()
+                            r.pos += 1
+                            if c == "]":
+                                break
+                            if c != ",":
+                                raise WrapperStreamError("expected ',' or ']' in rows")
+                    yield ("rows_end", n, None)
+                elif key in hash_members and r.peek() in ("[", "{"):
+                    h = sha256()
+                    _hash_canonical(r, h)
+                    yield ("member_sha256", key, h.hexdigest())
+                else:
+                    yield ("member", key, r.value())
+
+                c = r.peek()
+                r.pos += 1
+                if c == "}":
+                    break
+                if c != ",":
+                    raise WrapperStreamError("expected ',' or '}'")
+        if r.peek() != "":
+            raise WrapperStreamError("trailing data after wrapper")
+
+
+def verify_wrapper_stream(path: Path, on_row: Optional[Callable[[Any], None]] = None) -> None:
+    # Streaming equivalent of verify_wrapper(load_json(path)), including which error is raised first.
+    # on_row receives every row in order (only meaningful if this returns without raising).
+    members: Dict[str, Any] = {}
+    payload_sha256: Optional[str] = None
+    resolved: Dict[str, Ed25519PublicKey] = {}
+    row_error: Optional[Exception] = None
+    try:
+        for kind, a, b in iter_wrapper(path, STREAM_CHUNK_CHARS, ("payload",)):
+            if kind == "member":
+                members[a] = b
+            elif kind == "member_sha256":
+                payload_sha256 = b
+            elif kind == "row":
+                if row_error is None:
+                    try:
+                        verify_row_ed25519(a, b, resolved)
+                    except Exception as e:
+                        row_error = e
+                if on_row is not None:
+                    on_row(b)
+            else:
+                members["rows"] = []
+    except WrapperStreamError:
+        raise
+    except Exception as e:
+        raise WrapperStreamError(f"{type(e).__name__}:{e}") from e
+
+    _check_stream_members(members, payload_sha256)
+
+    if row_error is not None:
+        raise row_error
+
+
+def _check_stream_members(members: Dict[str, Any], payload_sha256: Optional[str]) -> None:
+    # "schema" usually follows "rows" in the file, so wrapper-level checks run after the scan,
+    # in the same order as verify_wrapper ("rows" is [] once the rows array was seen).
+    if members.get("schema") != "mocka.pack.wrapper.signed.v2":
+        raise ValueError("unsupported wrapper schema")
+
+    verify_payload_hash(members, payload_sha256)
+
+    if not isinstance(members.get("rows", None), list):
+        raise ValueError("wrapper.rows must be list")
+
+
+def verify_wrapper_file(path: Path) -> None:
+    if wrapper_v3.is_wrapper_v3(path):
+        wrapper_v3.verify_wrapper_v3(path, resolve_public_key_strict)
+        return
+
+    try:
+        verify_wrapper_stream(path)
+    except WrapperStreamError:
+        wrapper = load_json(path)
+        if not isinstance(wrapper, dict):
+            raise ValueError("wrapper must be object")
+        verify_wrapper(wrapper)
+
+
 # -------------------------
 # Summary rebuild (legacy API kept)
 # -------------------------
@@ -198,7 +500,471 @@ def _pack_key(idx: int, pack: Dict[str, Any]) -> Tuple[int, str, str]:
     return (authoritative, idx, sha + "|" + path)
 
 
-def rebuild_summary_matrix(strict_manifest: bool = True) -> Dict[str, Any]:
+PackResult = Tuple[List[str], List[Tuple[str, Dict[str, Any]]]]
+
+_CACHE_MAC_KEY: Dict[str, Optional[bytes]] = {"key": None}
+
+
+def _pack_file(idx: int, pack: Dict[str, Any]) -> Tuple[Optional[Path], List[str]]:
+    rel_path = pack.get("path", "")
+    if not isinstance(rel_path, str) or not rel_path:
+        return None, [f"PACK_PATH_INVALID idx={idx}"]
+
+    pack_file = ROOT / rel_path
+    if not pack_file.exists():
+        return None, [f"PACK_NOT_FOUND path={rel_path}"]
+
+    return pack_file, []
+
+
+class _PackRows:
+    # on_row sink for one pack: rows are checked as they arrive and added straight to row_index
+    # (row_id -> candidate rows); self.rows keeps (row_id, row) references for the cache entry.
+    # discard() takes them back out if the pack fails afterwards.
+    def __init__(self, rel_path: str, row_index: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.rel_path = rel_path
+        self.row_index = row_index
+        self.errors: List[str] = []
+        self.rows: List[Tuple[str, Dict[str, Any]]] = []
+
+    def __call__(self, r: Any) -> None:
+        if not isinstance(r, dict):
+            self.errors.append(f"ROW_INVALID path={self.rel_path}")
+            return
+
+        row_id = r.get("row_id", "")
+        if not isinstance(row_id, str) or not row_id:
+            self.errors.append(f"ROW_ID_MISSING path={self.rel_path}")
+            return
+
+        self.row_index.setdefault(row_id, []).append(r)
+        self.rows.append((row_id, r))
+
+    def discard(self) -> None:
+        # This pack's rows are the most recent candidate of each row_id they were added to.
+        for row_id, _ in reversed(self.rows):
+            candidates = self.row_index[row_id]
+            candidates.pop()
+            if not candidates:
+                del self.row_index[row_id]
+        self.errors = []
+        self.rows = []
+
+
+def _collect_rows(rel_path: str, rows: List[Any]) -> PackResult:
+    sink = _PackRows(rel_path, {})
+    for r in rows:
+        sink(r)
+    return sink.errors, sink.rows
+
+
+def _verify_pack_into(idx: int, pack: Dict[str, Any], row_index: Dict[str, List[Dict[str, Any]]]) -> PackResult:
+    # Serial path: stream and verify one pack, adding its rows to row_index as they are read.
+    # The returned rows are the ones added; a pack that fails verification leaves row_index untouched.
+    pack_file, errors = _pack_file(idx, pack)
+    if pack_file is None:
+        return errors, []
+    rel_path = pack["path"]
+
+    sink = _PackRows(rel_path, row_index)
+    if wrapper_v3.is_wrapper_v3(pack_file):
+        # v3 rows come back as the equivalent v2 rows, so the summary does not depend on the format.
+        try:
+            wrapper_v3.verify_wrapper_v3(pack_file, resolve_public_key_strict, sink)
+        except wrapper_v3.WrapperV3FormatError as e:
+            sink.discard()
+            return [f"PACK_LOAD_FAIL path={rel_path} err={type(e).__name__}:{e}"], []
+        except Exception as e:
+            sink.discard()
+            return [f"VERIFY_FAIL path={rel_path} err={type(e).__name__}:{e}"], []
+        return sink.errors, sink.rows
+
+    try:
+        verify_wrapper_stream(pack_file, sink)
+        return sink.errors, sink.rows
+    except WrapperStreamError:
+        # Malformed or non-object file: take the load_json path so the error text is unchanged.
+        sink.discard()
+    except Exception as e:
+        sink.discard()
+        return [f"VERIFY_FAIL path={rel_path} err={type(e).__name__}:{e}"], []
+
+    try:
+        wrapper = load_json(pack_file)
+    except Exception as e:
+        return [f"PACK_LOAD_FAIL path={rel_path} err={type(e).__name__}:{e}"], []
+
+    if not isinstance(wrapper, dict):
+        return [f"WRAPPER_INVALID path={rel_path}"], []
+
+    try:
+        verify_wrapper(wrapper)
+    except Exception as e:
+        return [f"VERIFY_FAIL path={rel_path} err={type(e).__name__}:{e}"], []
+
+    rows = wrapper.get("rows", [])
+    if not isinstance(rows, list):
+        return [f"ROWS_INVALID path={rel_path}"], []
+
+    for r in rows:
+        sink(r)
+    return sink.errors, sink.rows
+
+
+def _verify_pack(idx: int, pack: Dict[str, Any]) -> PackResult:
+    # Worker task (v3 packs in the parallel rebuild).
+    return _verify_pack_into(idx, pack, {})
+
+
+def _verify_row_chunk(rel_path: str, start: int, rows: List[Any]) -> Dict[str, Any]:
+    # Worker task: signature checks for one slice of a v2 pack's rows, sent by the parent.
+    # Row indexes in errors stay absolute.
+    resolved: Dict[str, Ed25519PublicKey] = {}
+    try:
+        for idx, row in enumerate(rows, start):
+            verify_row_ed25519(idx, row, resolved)
+    except Exception as e:
+        return {"fatal": f"VERIFY_FAIL path={rel_path} err={type(e).__name__}:{e}"}
+
+    errors, out = _collect_rows(rel_path, rows)
+    return {"fatal": None, "errors": errors, "rows": out}
+
+
+def _submit_pack_chunks(ex: ProcessPoolExecutor, pack_file: Path, rel_path: str, chunk_rows: int) -> Tuple[Optional[str], List[Any]]:
+    # Parent side: reads the pack once (iter_wrapper) and submits every chunk_rows rows as soon as
+    # they are read, so no worker parses the pack. Returns (wrapper-level error, chunk futures in
+    # row order). Raises WrapperStreamError when the stream reader cannot take the file.
+    members: Dict[str, Any] = {}
+    payload_sha256: Optional[str] = None
+    futures: List[Any] = []
+    buf: List[Any] = []
+    start = 0
+    try:
+        for kind, a, b in iter_wrapper(pack_file, STREAM_CHUNK_CHARS, ("payload",)):
+            if kind == "member":
+                members[a] = b
+            elif kind == "member_sha256":
+                payload_sha256 = b
+            elif kind == "row":
+                buf.append(b)
+                if len(buf) >= chunk_rows:
+                    futures.append(ex.submit(_verify_row_chunk, rel_path, start, buf))
+                    start += len(buf)
+                    buf = []
+            else:
+                members["rows"] = []
+    except Exception as e:
+        for f in futures:
+            f.cancel()
+        if isinstance(e, WrapperStreamError):
+            raise
+        raise WrapperStreamError(f"{type(e).__name__}:{e}") from e
+    if buf:
+        futures.append(ex.submit(_verify_row_chunk, rel_path, start, buf))
+
+    try:
+        _check_stream_members(members, payload_sha256)
+    except Exception as e:
+        for f in futures:
+            f.cancel()
+        return f"VERIFY_FAIL path={rel_path} err={type(e).__name__}:{e}", []
+    return None, futures
+
+
+def _verify_packs_parallel(pack_items: List[Tuple[int, Dict[str, Any]]], workers: int, chunk_rows: int) -> List[PackResult]:
+    chunk_rows = max(chunk_rows, 1)
+    results: List[PackResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        # v2 packs are read once by the parent and fanned out as row chunks while reading;
+        # v3 packs, and v2 files the stream reader rejects, are one _verify_pack task each.
+        pending: List[Tuple[str, Any]] = []
+        for idx, pack in pack_items:
+            pack_file, errors = _pack_file(idx, pack)
+            if pack_file is None:
+                pending.append(("done", (errors, [])))
+                continue
+            if wrapper_v3.is_wrapper_v3(pack_file):
+                pending.append(("pack", ex.submit(_verify_pack, idx, pack)))
+                continue
+            try:
+                fatal, futures = _submit_pack_chunks(ex, pack_file, pack["path"], chunk_rows)
+            except WrapperStreamError:
+                pending.append(("pack", ex.submit(_verify_pack, idx, pack)))
+                continue
+            pending.append(("done", ([fatal], [])) if fatal is not None else ("chunks", futures))
+
+        for kind, item in pending:
+            if kind == "done":
+                results.append(item)
+                continue
+            if kind == "pack":
+                results.append(item.result())
+                continue
+            chunks = [f.result() for f in item]
+            # Serial verify_wrapper stops at the lowest failing row; chunks are in row order.
+            fatal = next((c["fatal"] for c in chunks if c["fatal"] is not None), None)
+            if fatal is not None:
+                results.append(([fatal], []))
+                continue
+            pack_errors: List[str] = []
+            pack_rows: List[Tuple[str, Dict[str, Any]]] = []
+            for c in chunks:
+                pack_errors.extend(c["errors"])
+                pack_rows.extend(c["rows"])
+            results.append((pack_errors, pack_rows))
+    return results
+
+
+# -------------------------
+# Verification cache (content-addressed, HMAC-authenticated)
+# -------------------------
+# An entry holds the verified rows and outcome of one pack, keyed by (pack file sha256, registry
+# digest, verifier version). Entries carry an HMAC-SHA256 under a local key stored outside
+# VERIFY_CACHE_DIR (VERIFY_CACHE_KEY_PATH), so write access to the cache alone cannot forge a
+# result; an entry whose MAC does not check is a miss and the pack is verified again.
+
+def _registry_digest() -> str:
+    # Registry bytes plus every referenced PEM, so a replaced key file also misses the cache.
+    h = sha256()
+    reg_bytes = REGISTRY_PATH.read_bytes() if REGISTRY_PATH.exists() else b"<missing>"
+    h.update(b"registry\0" + reg_bytes + b"\0")
+    try:
+        keys = json.loads(reg_bytes.decode("utf-8-sig")).get("keys", {})
+    except Exception:
+        keys = {}
+    if isinstance(keys, dict):
+        for key_id in sorted(keys):
+            entry = keys[key_id]
+            rel = entry.get("public_pem_path", "") if isinstance(entry, dict) else ""
+            pub_path = ROOT / rel if isinstance(rel, str) and rel else None
+            pem = pub_path.read_bytes() if pub_path is not None and pub_path.is_file() else b"<missing>"
+            h.update(key_id.encode("utf-8") + b"\0" + pem + b"\0")
+    return h.hexdigest()
+
+
+def _cache_path(pack_sha256: str, registry_sha256: str) -> Path:
+    key = sha256_hex(f"{pack_sha256}|{registry_sha256}|{VERIFIER_VERSION}".encode("utf-8"))
+    return VERIFY_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _cache_mac_key() -> bytes:
+    # Created on first use (32 random bytes, owner-only); a replaced key invalidates every entry.
+    if _CACHE_MAC_KEY["key"] is None:
+        path = VERIFY_CACHE_KEY_PATH
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                pass
+            else:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(os.urandom(32))
+        key = path.read_bytes()
+        if len(key) < 32:
+            raise ValueError(f"verify cache key too short: {path}")
+        _CACHE_MAC_KEY["key"] = key
+    return _CACHE_MAC_KEY["key"]
+
+
+def _cache_entry_mac(entry: Dict[str, Any]) -> str:
+    body = {k: v for k, v in entry.items() if k != "mac"}
+    return hmac.new(_cache_mac_key(), canonical_json_bytes(body), sha256).hexdigest()
+
+
+def _cache_load(pack_sha256: str, registry_sha256: str) -> Optional[PackResult]:
+    # Any mismatch (corrupt JSON, wrong key fields, MAC) is a miss; the entry is rewritten.
+    path = _cache_path(pack_sha256, registry_sha256)
+    if not path.exists():
+        return None
+    try:
+        entry = load_json(path)
+    except Exception:
+        return None
+    if not isinstance(entry, dict) or entry.get("schema") != VERIFY_CACHE_SCHEMA:
+        return None
+    if (entry.get("pack_sha256"), entry.get("registry_sha256"), entry.get("verifier_version")) != (pack_sha256, registry_sha256, VERIFIER_VERSION):
+        return None
+    mac = entry.get("mac")
+    if not isinstance(mac, str) or not hmac.compare_digest(mac, _cache_entry_mac(entry)):
+        return None
+    errors, rows = entry.get("errors"), entry.get("rows")
+    if not isinstance(errors, list) or not isinstance(rows, list):
+        return None
+    if entry.get("outcome") != ("OK" if not errors else "FAIL"):
+        return None
+    return errors, [(row_id, r) for row_id, r in rows]
+
+
+def _cache_store(pack_sha256: str, registry_sha256: str, result: PackResult) -> None:
+    errors, rows = result
+    entry: Dict[str, Any] = {
+        "schema": VERIFY_CACHE_SCHEMA,
+        "pack_sha256": pack_sha256,
+        "registry_sha256": registry_sha256,
+        "verifier_version": VERIFIER_VERSION,
+        "outcome": "OK" if not errors else "FAIL",
+        "errors": errors,
+        "rows": [[row_id, r] for row_id, r in rows],
+    }
+    entry["mac"] = _cache_entry_mac(entry)
+    atomic_write_text(_cache_path(pack_sha256, registry_sha256), json.dumps(entry, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n")
+
+
+# -------------------------
+# Sharded summary (Merkle root over shard hashes)
+# -------------------------
+# SUMMARY_SHARD_DIR/
+#   index.json         : header (phase / row_count / manifest_errors), per-shard sha256 + row_count, summary_hash
+#   shard_<prefix>.json: rows whose sha256(row_id) starts with <prefix>, written as canonical JSON
+#                        (file sha256 == shard hash, so a shard can be checked without parsing)
+# summary_hash = RFC 6962 style Merkle root over [header leaf] + [shard leaves in prefix order].
+
+def summary_shard_of(row_id: str, prefix_len: int = SUMMARY_SHARD_PREFIX_LEN) -> str:
+    # row_ids share literal prefixes ("pack:..."), so shard on the hash of the row_id.
+    return sha256_hex(row_id.encode("utf-8"))[:prefix_len]
+
+
+def _summary_shard_path(shard_dir: Path, prefix: str) -> Path:
+    return shard_dir / f"shard_{prefix}.json"
+
+
+def _merkle_root(leaves: List[bytes]) -> bytes:
+    if not leaves:
+        return sha256(b"").digest()
+    if len(leaves) == 1:
+        return sha256(b"\x00" + leaves[0]).digest()
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return sha256(b"\x01" + _merkle_root(leaves[:k]) + _merkle_root(leaves[k:])).digest()
+
+
+def _summary_header(index: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: index[k] for k in ("schema", "phase", "row_count", "manifest_errors", "shard_prefix_len")}
+
+
+def sharded_summary_hash(index: Dict[str, Any]) -> str:
+    leaves = [canonical_json_bytes(_summary_header(index))]
+    for prefix in sorted(index["shards"]):
+        leaves.append(f"{prefix}:{index['shards'][prefix]['sha256']}".encode("utf-8"))
+    return _merkle_root(leaves).hex()
+
+
+def _load_summary_index(shard_dir: Path) -> Optional[Dict[str, Any]]:
+    path = shard_dir / "index.json"
+    if not path.exists():
+        return None
+    try:
+        index = load_json(path)
+    except Exception:
+        return None
+    if not isinstance(index, dict) or index.get("schema") != SUMMARY_SHARDED_SCHEMA:
+        return None
+    return index
+
+
+def write_sharded_summary(phase: Any, resolved_rows: Dict[str, Any], errors: List[str], shard_dir: Optional[Path] = None) -> Dict[str, Any]:
+    # Rewrites only shards whose on-disk bytes differ from the new ones; index.json is replaced last.
+    shard_dir = shard_dir or SUMMARY_SHARD_DIR
+    old = _load_summary_index(shard_dir)
+    old_shards = old.get("shards", {}) if old and old.get("shard_prefix_len") == SUMMARY_SHARD_PREFIX_LEN else {}
+
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for row_id in sorted(resolved_rows):
+        grouped.setdefault(summary_shard_of(row_id), {})[row_id] = resolved_rows[row_id]
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    written = 0
+    for prefix in sorted(grouped):
+        body = canonical_json_bytes({"schema": SUMMARY_SHARD_SCHEMA, "shard": prefix, "rows": grouped[prefix]})
+        h = sha256_hex(body)
+        shards[prefix] = {"sha256": h, "row_count": len(grouped[prefix]), "bytes": len(body)}
+        path = _summary_shard_path(shard_dir, prefix)
+        # Skip only when the bytes on disk are the ones the new index will vouch for
+        # (a same-size edit or corruption must not survive the rebuild).
+        if old_shards.get(prefix, {}).get("sha256") == h and path.exists() and sha256_file_hex(path) == h:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+        written += 1
+
+    index: Dict[str, Any] = {
+        "schema": SUMMARY_SHARDED_SCHEMA,
+        "phase": phase,
+        "row_count": len(resolved_rows),
+        "manifest_errors": errors,
+        "shard_prefix_len": SUMMARY_SHARD_PREFIX_LEN,
+        "shards": shards,
+    }
+    index["summary_hash"] = sharded_summary_hash(index)
+    write_json(shard_dir / "index.json", index)
+
+    removed = 0
+    if shard_dir.exists():
+        for path in shard_dir.glob("shard_*.json"):
+            if path.stem[len("shard_"):] not in shards:
+                path.unlink()
+                removed += 1
+
+    print(f"SHARDS: total={len(shards)} written={written} unchanged={len(shards) - written} removed={removed}")
+    return index
+
+
+def load_summary_shard(prefix: str, shard_dir: Optional[Path] = None, check: bool = True) -> Dict[str, Any]:
+    # Loads one shard without touching the others. check=True (default) goes through index.json:
+    # a prefix the index does not list has no rows, a listed shard must exist and match its sha256,
+    # and the index itself must match its summary_hash. check=False reads the file as is.
+    shard_dir = shard_dir or SUMMARY_SHARD_DIR
+    path = _summary_shard_path(shard_dir, prefix)
+    if check:
+        index = _load_summary_index(shard_dir)
+        if index is None:
+            raise ValueError(f"summary index invalid: {shard_dir / 'index.json'}")
+        if sharded_summary_hash(index) != index.get("summary_hash"):
+            raise ValueError("summary index hash mismatch")
+        meta = index["shards"].get(prefix)
+        if meta is None:
+            return {}
+        if not path.exists():
+            raise FileNotFoundError(f"summary shard missing: {prefix} path={path}")
+        body = path.read_bytes()
+        if sha256_hex(body) != meta.get("sha256"):
+            raise ValueError(f"summary shard hash mismatch: {prefix}")
+    else:
+        if not path.exists():
+            return {}
+        body = path.read_bytes()
+    shard = json.loads(body.decode("utf-8"))
+    return shard.get("rows", {})
+
+
+def load_summary_row(row_id: str, shard_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    return load_summary_shard(summary_shard_of(row_id), shard_dir).get(row_id)
+
+
+def verify_sharded_summary(shard_dir: Optional[Path] = None) -> List[str]:
+    # Returns problems (empty = OK): every shard hash and the Merkle root are recomputed.
+    shard_dir = shard_dir or SUMMARY_SHARD_DIR
+    index = _load_summary_index(shard_dir)
+    if index is None:
+        return [f"SUMMARY_INDEX_INVALID path={shard_dir / 'index.json'}"]
+
+    problems: List[str] = []
+    for prefix, meta in sorted(index.get("shards", {}).items()):
+        path = _summary_shard_path(shard_dir, prefix)
+        if not path.exists():
+            problems.append(f"SHARD_MISSING shard={prefix}")
+        elif sha256_file_hex(path) != meta.get("sha256"):
+            problems.append(f"SHARD_HASH_MISMATCH shard={prefix}")
+    if sharded_summary_hash(index) != index.get("summary_hash"):
+        problems.append("SUMMARY_HASH_MISMATCH")
+    return problems
+
+
+def rebuild_summary_matrix(strict_manifest: bool = True, workers: int = 1, chunk_rows: int = CHUNK_ROWS, use_cache: bool = True, sharded: bool = False) -> Dict[str, Any]:
     if not FREEZE_MANIFEST_PATH.exists():
         raise FileNotFoundError(f"freeze_manifest not found: {FREEZE_MANIFEST_PATH}")
 
@@ -220,49 +986,48 @@ def rebuild_summary_matrix(strict_manifest: bool = True) -> Dict[str, Any]:
             pack_items.append((i, p))
     pack_items.sort(key=lambda t: _pack_key(t[0], t[1]))
 
-    for idx, pack in pack_items:
-        rel_path = pack.get("path", "")
-        if not isinstance(rel_path, str) or not rel_path:
-            errors.append(f"PACK_PATH_INVALID idx={idx}")
-            continue
-
-        pack_file = ROOT / rel_path
-        if not pack_file.exists():
-            errors.append(f"PACK_NOT_FOUND path={rel_path}")
+    # Cache lookup: packs whose (file sha256, registry digest, verifier version) were already
+    # verified are not parsed or signature-checked again. Each pack file is hashed once; the file
+    # identity taken before hashing decides whether the result may be stored afterwards.
+    pack_results: List[Optional[PackResult]] = [None] * len(pack_items)
+    pack_shas: Dict[int, str] = {}
+    pack_idents: Dict[int, Tuple[str, int, int, int]] = {}
+    registry_sha = _registry_digest() if use_cache else ""
+    todo: List[int] = []
+    for i, (idx, pack) in enumerate(pack_items):
+        pack_file, path_errors = _pack_file(idx, pack)
+        if pack_file is None:
+            pack_results[i] = (path_errors, [])
             continue
-
-        try:
-            wrapper = load_json(pack_file)
-        except Exception as e:
-            errors.append(f"PACK_LOAD_FAIL path={rel_path} err={type(e).__name__}:{e}")
-            continue
-
-        if not isinstance(wrapper, dict):
-            errors.append(f"WRAPPER_INVALID path={rel_path}")
-            continue
-
-        try:
-            verify_wrapper(wrapper)
-        except Exception as e:
-            errors.append(f"VERIFY_FAIL path={rel_path} err={type(e).__name__}:{e}")
-            continue
-
-        rows = wrapper.get("rows", [])
-        if not isinstance(rows, list):
-            errors.append(f"ROWS_INVALID path={rel_path}")
-            continue
-
-        for r in rows:
-            if not isinstance(r, dict):
-                errors.append(f"ROW_INVALID path={rel_path}")
-                continue
-
-            row_id = r.get("row_id", "")
-            if not isinstance(row_id, str) or not row_id:
-                errors.append(f"ROW_ID_MISSING path={rel_path}")
-                continue
-
-            row_index.setdefault(row_id, []).append(r)
+        if use_cache:
+            pack_idents[i] = _file_identity(pack_file)
+            pack_shas[i] = sha256_file_hex(pack_file)
+            pack_results[i] = _cache_load(pack_shas[i], registry_sha)
+        if pack_results[i] is None:
+            todo.append(i)
+
+    if workers > 1:
+        for i, result in zip(todo, _verify_packs_parallel([pack_items[i] for i in todo], workers, chunk_rows)):
+            pack_results[i] = result
+
+    # Merge in _pack_key order, so summary_hash does not depend on workers or the cache.
+    # Serial rebuild: rows go from the pack stream straight into row_index.
+    todo_set = set(todo)
+    for i, (idx, pack) in enumerate(pack_items):
+        result = pack_results[i]
+        if result is None:
+            result = _verify_pack_into(idx, pack, row_index)
+        else:
+            for row_id, r in result[1]:
+                row_index.setdefault(row_id, []).append(r)
+        pack_results[i] = None
+        errors.extend(result[0])
+
+        # Store only if the file did not change while it was being hashed and verified.
+        if use_cache and i in todo_set and i in pack_shas:
+            pack_file, _ = _pack_file(idx, pack)
+            if pack_file is not None and _file_identity(pack_file) == pack_idents[i]:
+                _cache_store(pack_shas[i], registry_sha, result)
 
     # Deterministic row selection per row_id: canonical hash tie-break
     resolved_rows: Dict[str, Any] = {}
@@ -271,6 +1036,15 @@ def rebuild_summary_matrix(strict_manifest: bool = True) -> Dict[str, Any]:
         candidates.sort(key=lambda rr: sha256_hex(canonical_json_bytes(rr)))
         resolved_rows[row_id] = candidates[0]
 
+    if sharded:
+        summary = write_sharded_summary(manifest.get("phase"), resolved_rows, errors)
+        summary_hash = summary["summary_hash"]
+        print("OK: deterministic sharded summary rebuilt")
+        print(f"SUMMARY_HASH: {summary_hash}")
+        if strict_manifest and errors:
+            raise RuntimeError("STRICT_MANIFEST_FAIL: " + " | ".join(errors))
+        return summary
+
     summary: Dict[str, Any] = {
         "phase": manifest.get("phase"),
         "row_count": len(resolved_rows),
@@ -302,19 +1076,29 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--wrapper", default="", help="verify single wrapper")
     ap.add_argument("--rebuild-summary", action="store_true", help="rebuild summary from freeze_manifest")
+    ap.add_argument("--workers", type=int, default=1, help="process pool size for pack/row-chunk verification (1 = serial)")
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows per verification task when --workers > 1")
+    ap.add_argument("--no-cache", action="store_true", help="re-verify every pack (ignore and do not write .verify_cache)")
+    ap.add_argument("--sharded", action="store_true", help="write acceptance/summary_matrix.shards/ instead of summary_matrix.json")
+    ap.add_argument("--verify-shards", action="store_true", help="recheck shard hashes and the Merkle root of the sharded summary")
     args = ap.parse_args()
 
+    if args.verify_shards:
+        problems = verify_sharded_summary()
+        for p in problems:
+            print(f"FAIL: {p}")
+        if problems:
+            return 1
+        print("OK: sharded summary verified")
+        return 0
+
     # Legacy default: no args => rebuild summary strict
     if args.rebuild_summary or (not args.wrapper):
-        rebuild_summary_matrix(strict_manifest=True)
+        rebuild_summary_matrix(strict_manifest=True, workers=args.workers, chunk_rows=args.chunk_rows, use_cache=not args.no_cache, sharded=args.sharded)
         return 0
 
     wpath = Path(args.wrapper)
-    wrapper = load_json(wpath)
-    if not isinstance(wrapper, dict):
-        raise ValueError("wrapper must be object")
-
-    verify_wrapper(wrapper)
+    verify_wrapper_file(wpath)
 
     print("STRICT_OK")
     print(f"wrapper={wpath}")
@@ -14,7 +14,8 @@ def main():
 
     try:
         from verify.manifest_resolver import rebuild_summary_matrix
-        rebuild_summary_matrix(strict_manifest=True)
+        # --no-cache: re-verify every pack instead of reusing .verify_cache entries
+        rebuild_summary_matrix(strict_manifest=True, use_cache="--no-cache" not in sys.argv[1:])
         print("OVERALL: PASS")
         return 0
     except Exception as e:
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from verify_common import canonical_json_bytes, canonical_json_sha256  # noqa: E402
+
+
+# mocka.pack.wrapper.signed.v3: compact binary wrapper with detached row signatures.
+#
+# layout (big-endian):
+#   magic         8 bytes  b"MOCKAWR\x03"
+#   payload_hash 32 bytes  raw sha256 of the canonical payload
+#   meta_len      u32      + meta: canonical JSON of the v2 top-level members except schema / payload_hash / rows
+#   key_count     u16      + key_count * 32 raw key_ids
+#   row_count     u32
+#   rows          row_count * (key_index u16, row_sig 64 bytes, msg_len u32, msg)
+#
+# msg is the canonical JSON of the row without row_sig / row_sig_alg / key_id, i.e. exactly the
+# bytes the v2 verifier signs, so the Ed25519 check runs on msg as stored (no hex decode, no dict
+# copy). Readers still require msg to be that canonical object (decode_msg); otherwise a row
+# could verify here but not as the rebuilt v2 row. A v2 row is json.loads(msg) + key_id /
+# row_sig (lower hex) / row_sig_alg "ed25519"; the v2 <-> v3 conversion is lossless for every
+# well-formed v2 wrapper.
+
+SCHEMA_V2 = "mocka.pack.wrapper.signed.v2"
+SCHEMA_V3 = "mocka.pack.wrapper.signed.v3"
+MAGIC = b"MOCKAWR\x03"
+
+SIG_FIELDS = ("row_sig", "row_sig_alg", "key_id")
+V2_HEADER_FIELDS = ("schema", "payload_hash", "rows")
+
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_ROW_HEAD = struct.Struct(">H64sI")
+
+_HEX = frozenset("0123456789abcdef")
+
+
+class WrapperV3FormatError(ValueError):
+    """The file is not a structurally valid v3 wrapper (bad magic, truncated, trailing bytes)."""
+
+
+# -------------------------
+# Hex
+# -------------------------
+
+def _is_lower_hex(s: Any, length: int) -> bool:
+    return isinstance(s, str) and len(s) == length and _HEX.issuperset(s)
+
+
+# -------------------------
+# Reader
+# -------------------------
+
+def is_wrapper_v3(path: Path) -> bool:
+    try:
+        with path.open("rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _read_exact(f: BinaryIO, n: int) -> bytes:
+    b = f.read(n)
+    if len(b) != n:
+        raise WrapperV3FormatError("truncated v3 wrapper")
+    return b
+
+
+def read_header(f: BinaryIO) -> Tuple[str, Dict[str, Any], List[str], int]:
+    # Returns (payload_hash hex, meta members, key_ids hex, row_count).
+    if f.read(len(MAGIC)) != MAGIC:
+        raise WrapperV3FormatError("not a v3 wrapper (magic mismatch)")
+    payload_hash = _read_exact(f, 32).hex()
+    (meta_len,) = _U32.unpack(_read_exact(f, 4))
+    try:
+        meta = json.loads(_read_exact(f, meta_len).decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise WrapperV3FormatError(f"v3 meta invalid: {e}")
+    if not isinstance(meta, dict):
+        raise WrapperV3FormatError("v3 meta must be object")
+    (key_count,) = _U16.unpack(_read_exact(f, 2))
+    keys = _read_exact(f, 32 * key_count)
+    key_ids = [keys[i:i + 32].hex() for i in range(0, len(keys), 32)]
+    (row_count,) = _U32.unpack(_read_exact(f, 4))
+    return payload_hash, meta, key_ids, row_count
+
+
+def iter_rows(f: BinaryIO, row_count: int) -> Iterator[Tuple[int, bytes, bytes]]:
+    # (key_index, row_sig, msg) per row; the file must end right after the last row.
+    for _ in range(row_count):
+        key_index, sig, msg_len = _ROW_HEAD.unpack(_read_exact(f, _ROW_HEAD.size))
+        yield key_index, sig, _read_exact(f, msg_len)
+    if f.read(1):
+        raise WrapperV3FormatError("trailing data after v3 rows")
+
+
+def decode_msg(msg: bytes) -> Dict[str, Any]:
+    # msg must be the canonical JSON of an object without SIG_FIELDS, i.e. the exact bytes the v2
+    # verifier would sign for the rebuilt row.
+    try:
+        row = json.loads(msg.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("msg is not JSON")
+    if not isinstance(row, dict):
+        raise ValueError("msg must be object")
+    if any(k in row for k in SIG_FIELDS):
+        raise ValueError("msg carries signature fields")
+    try:
+        canonical = canonical_json_bytes(row)
+    except ValueError:
+        canonical = None
+    if canonical != msg:
+        raise ValueError("msg is not canonical JSON")
+    return row
+
+
+def row_to_v2(row: Dict[str, Any], key_id: str, sig: bytes) -> Dict[str, Any]:
+    # row: decode_msg(msg); the signature fields are added in place.
+    row["row_sig"] = sig.hex()
+    row["row_sig_alg"] = "ed25519"
+    row["key_id"] = key_id
+    return row
+
+
+# -------------------------
+# Verifier (strict)
+# -------------------------
+
+def verify_wrapper_v3(path: Path, resolve_key: Callable[[str], Any], on_row: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+    # Same verdicts as manifest_resolver.verify_wrapper on the equivalent v2 wrapper (a msg that
+    # fails decode_msg is a row failure; v2 would report it as a signature failure).
+    # resolve_key is the strict registry lookup (manifest_resolver.resolve_public_key_strict);
+    # each key_id in the table is resolved once, on first use.
+    # on_row receives the rebuilt v2 rows (only meaningful if this returns without raising).
+    # Structural damage raises WrapperV3FormatError even when an earlier row already failed,
+    # like a JSON decode error would for v2.
+    wrapper_error: Optional[Exception] = None
+    row_error: Optional[Exception] = None
+
+    with path.open("rb") as f:
+        payload_hash, meta, key_ids, row_count = read_header(f)
+
+        payload = meta.get("payload", None)
+        if payload is None:
+            wrapper_error = ValueError("wrapper.payload missing")
+        else:
+            actual = canonical_json_sha256(payload)
+            if actual != payload_hash:
+                wrapper_error = ValueError(f"payload_hash mismatch expected={payload_hash} actual={actual}")
+
+        resolved: List[Any] = [None] * len(key_ids)
+        for idx, (key_index, sig, msg) in enumerate(iter_rows(f, row_count)):
+            if key_index >= len(key_ids):
+                raise WrapperV3FormatError(f"row[{idx}] key_index out of range")
+            try:
+                row = decode_msg(msg)
+            except ValueError as e:
+                row = None
+                if row_error is None:
+                    row_error = ValueError(f"row[{idx}] {e}")
+            if wrapper_error is None and row_error is None:
+                try:
+                    pk = resolved[key_index]
+                    if pk is None:
+                        pk = resolved[key_index] = resolve_key(key_ids[key_index])
+                    try:
+                        pk.verify(sig, msg)
+                    except Exception:
+                        raise ValueError(f"row[{idx}] signature verification failed")
+                except Exception as e:
+                    row_error = e
+            if on_row is not None and row is not None:
+                on_row(row_to_v2(row, key_ids[key_index], sig))
+
+    if wrapper_error is not None:
+        raise wrapper_error
+    if row_error is not None:
+        raise row_error
+
+
+# -------------------------
+# Converters
+# -------------------------
+
+def _resolver():
+    # manifest_resolver imports this module, so it is loaded lazily here.
+    from verify import manifest_resolver
+    return manifest_resolver
+
+
+def _replace_atomic(dst: Path, write: Callable[[BinaryIO], None]) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=dst.name + ".", suffix=".tmp", dir=str(dst.parent))
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def convert_v2_to_v3(src: Path, dst: Path) -> Dict[str, Any]:
+    # Streams the v2 rows (manifest_resolver.iter_wrapper); rows go to a spool file first because
+    # the key table and row_count precede them in v3.
+    mr = _resolver()
+    members: Dict[str, Any] = {}
+    key_index: Dict[str, int] = {}
+    row_count = 0
+    has_rows = False
+
+    with tempfile.TemporaryFile() as spool:
+        for kind, a, row in mr.iter_wrapper(src, mr.STREAM_CHUNK_CHARS):
+            if kind == "member":
+                members[a] = row
+                continue
+            if kind == "rows_end":
+                has_rows = True
+                continue
+
+            idx = a
+            if not isinstance(row, dict):
+                raise ValueError(f"row[{idx}] must be object")
+            if row.get("row_sig_alg", "") != "ed25519":
+                raise ValueError(f"row[{idx}] invalid row_sig_alg")
+            key_id, sig_hex = row.get("key_id", ""), row.get("row_sig", "")
+            if not _is_lower_hex(key_id, 64):
+                raise ValueError(f"row[{idx}] key_id not representable in v3 (64 lower-case hex)")
+            if not _is_lower_hex(sig_hex, 128):
+                raise ValueError(f"row[{idx}] row_sig not representable in v3 (128 lower-case hex)")
+
+            if key_id not in key_index:
+                if len(key_index) > 0xFFFF:
+                    raise ValueError("too many key_ids for v3 key table")
+                key_index[key_id] = len(key_index)
+            msg = canonical_json_bytes({k: v for k, v in row.items() if k not in SIG_FIELDS})
+            try:
+                decode_msg(msg)
+            except ValueError as e:
+                raise ValueError(f"row[{idx}] not representable in v3: {e}")
+            spool.write(_ROW_HEAD.pack(key_index[key_id], bytes.fromhex(sig_hex), len(msg)))
+            spool.write(msg)
+            row_count += 1
+
+        if members.get("schema") != SCHEMA_V2:
+            raise ValueError("unsupported wrapper schema")
+        if not has_rows:
+            raise ValueError("wrapper.rows must be list")
+        payload_hash = members.get("payload_hash", "")
+        if not _is_lower_hex(payload_hash, 64):
+            raise ValueError("wrapper.payload_hash not representable in v3 (64 lower-case hex)")
+
+        meta = canonical_json_bytes({k: v for k, v in members.items() if k not in V2_HEADER_FIELDS})
+
+        def write(out: BinaryIO) -> None:
+            out.write(MAGIC)
+            out.write(bytes.fromhex(payload_hash))
+            out.write(_U32.pack(len(meta)))
+            out.write(meta)
+            out.write(_U16.pack(len(key_index)))
+            for k in key_index:
+                out.write(bytes.fromhex(k))
+            out.write(_U32.pack(row_count))
+            spool.seek(0)
+            for b in iter(lambda: spool.read(1024 * 1024), b""):
+                out.write(b)
+
+        _replace_atomic(dst, write)
+
+    return {"rows": row_count, "keys": len(key_index), "bytes_in": src.stat().st_size, "bytes_out": dst.stat().st_size}
+
+
+def _indent_json(obj: Any, level: int) -> str:
+    # json.dumps(indent=2) of a nested value, as it appears at nesting depth `level`.
+    s = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True)
+    return s.replace("\n", "\n" + "  " * level)
+
+
+def convert_v3_to_v2(src: Path, dst: Path) -> Dict[str, Any]:
+    # Output is byte-identical to manifest_resolver.write_json(wrapper), written row by row.
+    with src.open("rb") as f:
+        payload_hash, meta, key_ids, row_count = read_header(f)
+        members: Dict[str, Any] = dict(meta)
+        members["schema"] = SCHEMA_V2
+        members["payload_hash"] = payload_hash
+        names = sorted(list(members) + ["rows"])
+
+        def write(out: BinaryIO) -> None:
+            out.write(b"{")
+            for i, name in enumerate(names):
+                out.write((("," if i else "") + "\n  " + json.dumps(name, ensure_ascii=False) + ": ").encode("utf-8"))
+                if name != "rows":
+                    out.write(_indent_json(members[name], 1).encode("utf-8"))
+                    continue
+                if row_count == 0:
+                    out.write(b"[]")
+                    continue
+                out.write(b"[")
+                for j, (key_index, sig, msg) in enumerate(iter_rows(f, row_count)):
+                    if key_index >= len(key_ids):
+                        raise WrapperV3FormatError(f"row[{j}] key_index out of range")
+                    try:
+                        row = row_to_v2(decode_msg(msg), key_ids[key_index], sig)
+                    except ValueError as e:
+                        raise ValueError(f"row[{j}] {e}")
+                    out.write(((",\n    " if j else "\n    ") + _indent_json(row, 2)).encode("utf-8"))
+                out.write(b"\n  ]")
+            out.write(b"\n}\n")
+
+        _replace_atomic(dst, write)
+
+    return {"rows": row_count, "keys": len(key_ids), "bytes_in": src.stat().st_size, "bytes_out": dst.stat().st_size}
+
+
+# -------------------------
+# CLI
+# -------------------------
+
+def main() -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("to-v3", help="convert a v2 JSON wrapper to v3")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p = sub.add_parser("to-v2", help="convert a v3 wrapper back to v2 JSON")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p = sub.add_parser("verify", help="strict verification of a v3 wrapper")
+    p.add_argument("wrapper")
+    args = ap.parse_args()
+
+    if args.cmd == "verify":
+        verify_wrapper_v3(Path(args.wrapper), _resolver().resolve_public_key_strict)
+        print("STRICT_OK")
+        print(f"wrapper={args.wrapper}")
+        return 0
+
+    fn = convert_v2_to_v3 if args.cmd == "to-v3" else convert_v3_to_v2
+    info = fn(Path(args.src), Path(args.dst))
+    print(f"OK: {args.cmd} {args.src} -> {args.dst}")
+    print(f"ROWS: {info['rows']} KEYS: {info['keys']} BYTES: {info['bytes_in']} -> {info['bytes_out']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
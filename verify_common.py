@@ -0,0 +1,146 @@
+﻿# note: verify_full_chain.py / verify_full_chain_and_signature.py / verify/ の共通 helper
+# 正規形 JSON の判定と生成、台帳の fetchmany 走査、peak RSS 計測をここに 1 本化する
+# verify pack にはこの file も同梱する（export_verify_pack.ps1）
+
+import hashlib
+import json
+import re
+import sys
+
+FETCH_ROWS = 1000
+
+# -------------------------
+# ledger canonical form: sort_keys, separators=(",",":"), ensure_ascii
+# -------------------------
+
+class NotCanonicalJson(ValueError):
+    pass
+
+# backslash を含む event_content 用: 正規形 (sort_keys, separators=(",",":"), ensure_ascii) に現れうるトークン列のみ許可
+CANONICAL_TOKENS = re.compile(
+    r'(?:"(?:[ !#-\[\]-~]++|\\["\\bfnrt]|\\u(?!00(?:0[89acd]|[2-6][0-9a-f]|7[0-9a-e]))[0-9a-f]{4})*+"'
+    r'|-?[0-9]++(?:\.[0-9]++)?+(?:[eE][-+]?[0-9]++)?+|true|false|null|[{}\[\],:])*+'
+)
+
+def canonical_pairs(pairs):
+    # key は厳密に昇順（重複なし）であること
+    prev = None
+    for k, _ in pairs:
+        if prev is not None and not prev < k:
+            raise NotCanonicalJson("object keys not sorted")
+        prev = k
+    return None
+
+def canonical_int(s: str):
+    if s == "-0":
+        raise NotCanonicalJson(s)
+    return int(s)
+
+def canonical_float(s: str):
+    if repr(float(s)) != s:
+        raise NotCanonicalJson(s)
+    return None
+
+def reject_constant(s: str):
+    raise NotCanonicalJson(s)
+
+CANONICAL_DECODER = json.JSONDecoder(
+    object_pairs_hook=canonical_pairs,
+    parse_int=canonical_int,
+    parse_float=canonical_float,
+    parse_constant=reject_constant,
+)
+
+def is_canonical_json(text: str) -> bool:
+    # True のときに限り json.dumps(json.loads(text), sort_keys=True, separators=(",",":")) == text
+    if not text.isascii() or "\x7f" in text:
+        return False
+    if "\\" in text:
+        if CANONICAL_TOKENS.fullmatch(text) is None:
+            return False
+    else:
+        outside = "".join(text.split('"')[::2])
+        if " " in outside or "\n" in outside or "\r" in outside or "\t" in outside:
+            return False
+    try:
+        CANONICAL_DECODER.decode(text)
+    except ValueError:
+        return False
+    return True
+
+def normalize_json_bytes(text: str) -> bytes:
+    # writer が正規形で保存している行は再シリアライズしない（判定外は従来通り loads/dumps）
+    if is_canonical_json(text):
+        return text.encode("utf-8")
+    obj = json.loads(text)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+# -------------------------
+# ledger scan
+# -------------------------
+
+def iter_row_batches(cur, sql: str, params=(), fetch_rows: int = FETCH_ROWS):
+    # fetchall() はせず fetchmany 窓で読む（ピークメモリを台帳サイズから切り離す）
+    cur.execute(sql, params)
+    while True:
+        batch = cur.fetchmany(fetch_rows)
+        if not batch:
+            return
+        yield batch
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return peak_rss_bytes_windows()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def peak_rss_bytes_windows():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.windll.kernel32
+        psapi = ctypes.windll.psapi
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return int(counters.PeakWorkingSetSize)
+    except Exception:
+        return None
+
+# -------------------------
+# pack canonical form: sort_keys, separators=(",",":"), ensure_ascii=False
+# -------------------------
+
+def canonical_json_bytes(obj) -> bytes:
+    s = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return s.encode("utf-8")
+
+_PACK_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+def canonical_json_sha256(obj) -> str:
+    # canonical_json_bytes と同じ bytes を、1 本の文字列にせず chunk ごとに hash する
+    h = hashlib.sha256()
+    for chunk in _PACK_ENCODER.iterencode(obj):
+        h.update(chunk.encode("utf-8"))
+    return h.hexdigest()
@@ -1,52 +1,205 @@
-﻿import sqlite3
+﻿import argparse
+import sqlite3
 import hashlib
 import json
-import sys
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from verify_common import FETCH_ROWS, iter_row_batches, normalize_json_bytes, peak_rss_bytes
 
 DB = r"C:/Users/sirok/MoCKA/audit/ed25519/audit.db"
 TABLE = "audit_ledger_event"
+CHECKPOINT_SCHEMA = "mocka.verify.checkpoint.v1"
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
-def normalize_json_bytes(text: str) -> bytes:
-    obj = json.loads(text)
-    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+def utc_now_z() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
-def main():
-    conn = sqlite3.connect(DB)
-    cur = conn.cursor()
+def default_checkpoint_path(db_path: str) -> str:
+    return db_path + ".verify_checkpoint.json"
 
-    cur.execute(f"SELECT id, event_id, prev_chain_hash, chain_hash, event_content FROM {TABLE} ORDER BY id ASC")
-    rows = cur.fetchall()
+def checkpoint_digest(body: dict) -> str:
+    # 破損検出用の digest（鍵なし）。改ざん耐性はない: checkpoint を書き換えられる者は再計算できる
+    # resume 時に信頼の根拠とするのは、DB 上の last_id 行が last_chain_hash を持つことの確認だけ
+    return sha256_hex(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8"))
 
-    prev_chain_hash = ""
+def load_checkpoint(path: str):
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        cp = json.load(f)
+
+    if not isinstance(cp, dict):
+        raise SystemExit(f"CHECKPOINT INVALID: {path} (rerun with --full)")
+
+    expected = cp.pop("checkpoint_hash", "")
+    if cp.get("schema") != CHECKPOINT_SCHEMA or cp.get("table") != TABLE or expected != checkpoint_digest(cp):
+        raise SystemExit(f"CHECKPOINT CORRUPT: {path} (rerun with --full)")
+
+    return cp
+
+def write_checkpoint(path: str, last_id: int, last_chain_hash: str, rows_verified: int):
+    body = {
+        "schema": CHECKPOINT_SCHEMA,
+        "table": TABLE,
+        "last_id": last_id,
+        "last_chain_hash": last_chain_hash,
+        "rows_verified": rows_verified,
+        "verified_at_utc": utc_now_z(),
+    }
+    body["checkpoint_hash"] = checkpoint_digest(body)
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(json.dumps(body, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+def resume_point(cur, cp):
+    # checkpoint の位置にある行が今も同じ chain_hash を持つことを確認する
+    last_id = int(cp["last_id"])
+    cur.execute(f"SELECT chain_hash FROM {TABLE} WHERE id = ?", (last_id,))
+    row = cur.fetchone()
+    if not row or row[0] != cp["last_chain_hash"]:
+        raise SystemExit(f"CHECKPOINT MISMATCH at id={last_id} (ledger rewritten? rerun with --full)")
+    return last_id, cp["last_chain_hash"], int(cp["rows_verified"])
+
+def verify_rows_serial(cur, sql: str, params, fetch_rows: int, prev_chain_hash: str, last_id: int):
+    rows_checked = 0
+
+    for batch in iter_row_batches(cur, sql, params, fetch_rows):
+        for row in batch:
+            row_id, event_id, prev_db, chain_db, content = row
+
+            # 1. event_id 再計算
+            recalculated_event_id = sha256_hex(normalize_json_bytes(content))
+            if recalculated_event_id != event_id:
+                raise SystemExit(f"EVENT_ID MISMATCH at id={row_id}")
+
+            # 2. prev_chain_hash 一致確認
+            if (prev_db or "") != prev_chain_hash:
+                raise SystemExit(f"PREV_CHAIN_HASH MISMATCH at id={row_id}")
+
+            # 3. chain_hash 再計算
+            recalculated_chain = sha256_hex((prev_chain_hash + event_id).encode("utf-8"))
+            if recalculated_chain != chain_db:
+                raise SystemExit(f"CHAIN_HASH MISMATCH at id={row_id}")
+
+            prev_chain_hash = chain_db
+            last_id = row_id
+            rows_checked += 1
+
+    return last_id, prev_chain_hash, rows_checked
 
-    for row in rows:
-        row_id, event_id, prev_db, chain_db, content = row
+def recompute_event_id_batch(items):
+    # worker 側: 行間依存のない event_id 再計算だけを行い、不一致の id を返す
+    mismatched = []
+    for row_id, event_id, content in items:
+        try:
+            ok = sha256_hex(normalize_json_bytes(content)) == event_id
+        except ValueError:
+            ok = False
+        if not ok:
+            mismatched.append(row_id)
+    return mismatched
 
-        # 1. event_id 再計算
-        recalculated_event_id = sha256_hex(normalize_json_bytes(content))
-        if recalculated_event_id != event_id:
-            raise SystemExit(f"EVENT_ID MISMATCH at id={row_id}")
+def verify_rows_pipelined(cur, sql: str, params, fetch_rows: int, prev_chain_hash: str, last_id: int, workers: int):
+    # event_id 再計算は process pool、prev + event_id の連鎖確認は main process で逐次に行う
+    rows_checked = 0
+    failures = []
+    pending = deque()
+    max_inflight = workers * 2
 
-        # 2. prev_chain_hash 一致確認
-        if (prev_db or "") != prev_chain_hash:
-            raise SystemExit(f"PREV_CHAIN_HASH MISMATCH at id={row_id}")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in iter_row_batches(cur, sql, params, fetch_rows):
+            pending.append(pool.submit(recompute_event_id_batch, [(r[0], r[1], r[4]) for r in batch]))
 
-        # 3. chain_hash 再計算
-        recalculated_chain = sha256_hex((prev_chain_hash + event_id).encode("utf-8"))
-        if recalculated_chain != chain_db:
-            raise SystemExit(f"CHAIN_HASH MISMATCH at id={row_id}")
+            for row_id, event_id, prev_db, chain_db, _content in batch:
+                if (prev_db or "") != prev_chain_hash:
+                    failures.append((row_id, 1, f"PREV_CHAIN_HASH MISMATCH at id={row_id}"))
 
-        prev_chain_hash = chain_db
+                recalculated_chain = sha256_hex((prev_chain_hash + event_id).encode("utf-8"))
+                if recalculated_chain != chain_db:
+                    failures.append((row_id, 2, f"CHAIN_HASH MISMATCH at id={row_id}"))
 
+                prev_chain_hash = chain_db
+                last_id = row_id
+                rows_checked += 1
+
+            while len(pending) > max_inflight:
+                failures.extend((i, 0, f"EVENT_ID MISMATCH at id={i}") for i in pending.popleft().result())
+
+        while pending:
+            failures.extend((i, 0, f"EVENT_ID MISMATCH at id={i}") for i in pending.popleft().result())
+
+    # serial モードと同じ順序（行 id 順、同一行では event_id → prev → chain）で報告する
+    failures.sort(key=lambda f: (f[0], f[1]))
+    return last_id, prev_chain_hash, rows_checked, [msg for _, _, msg in failures]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DB)
+    ap.add_argument("--checkpoint", default="", help="checkpoint path (default: <db>.verify_checkpoint.json)")
+    ap.add_argument("--full", action="store_true", help="ignore checkpoint and walk from genesis")
+    ap.add_argument("--fetch-rows", type=int, default=FETCH_ROWS, help="rows per fetchmany window")
+    ap.add_argument("--workers", type=int, default=0, help="event_id worker processes (0 = serial, -1 = all cores)")
+    args = ap.parse_args(argv)
+
+    checkpoint_path = args.checkpoint or default_checkpoint_path(args.db)
+    workers = (os.cpu_count() or 1) if args.workers < 0 else args.workers
+
+    conn = sqlite3.connect(args.db)
+    cur = conn.cursor()
+
+    after_id = 0
+    prev_chain_hash = ""
+    rows_before = 0
+
+    cp = None if args.full else load_checkpoint(checkpoint_path)
+    if cp is not None:
+        after_id, prev_chain_hash, rows_before = resume_point(cur, cp)
+
+    sql = f"SELECT id, event_id, prev_chain_hash, chain_hash, event_content FROM {TABLE} WHERE id > ? ORDER BY id ASC"
+
+    t0 = time.perf_counter()
+
+    if workers > 0:
+        last_id, prev_chain_hash, rows_checked, failures = verify_rows_pipelined(
+            cur, sql, (after_id,), args.fetch_rows, prev_chain_hash, after_id, workers
+        )
+        if failures:
+            conn.close()
+            for msg in failures:
+                print(msg)
+            raise SystemExit(f"FAIL: {len(failures)} mismatch(es), first: {failures[0]}")
+    else:
+        last_id, prev_chain_hash, rows_checked = verify_rows_serial(
+            cur, sql, (after_id,), args.fetch_rows, prev_chain_hash, after_id
+        )
+
+    elapsed = time.perf_counter() - t0
     conn.close()
 
+    rows_verified = rows_before + rows_checked
+    if last_id and (cp is None or last_id != after_id):
+        write_checkpoint(checkpoint_path, last_id, prev_chain_hash, rows_verified)
+
     print(json.dumps({
         "status": "OK",
-        "rows_verified": len(rows),
-        "final_chain_hash": prev_chain_hash
+        "mode": "full" if cp is None else "incremental",
+        "workers": workers,
+        "resumed_from_id": after_id,
+        "rows_checked": rows_checked,
+        "rows_verified": rows_verified,
+        "final_chain_hash": prev_chain_hash,
+        "checkpoint": checkpoint_path,
+        "elapsed_sec": round(elapsed, 6),
+        "rows_per_sec": round(rows_checked / elapsed, 1) if elapsed > 0 else None,
+        "peak_rss_bytes": peak_rss_bytes()
     }, indent=2))
 
 if __name__ == "__main__":
@@ -1,21 +1,25 @@
-﻿import sqlite3
+﻿import argparse
+import sqlite3
 import hashlib
 import json
+import os
 import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
+from verify_common import FETCH_ROWS, iter_row_batches, normalize_json_bytes, peak_rss_bytes
 
 DB = r"C:/Users/sirok/MoCKA/audit/ed25519/audit.db"
 TABLE = "audit_ledger_event"
 PUBKEY_PATH = r"C:/Users/sirok/MoCKA/audit/ed25519/keys/ed25519_public.key"
+SIG_BATCH = 256
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
-def normalize_json_bytes(text: str) -> bytes:
-    obj = json.loads(text)
-    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
-
 def load_ed25519_public_key_auto(path: str) -> ed25519.Ed25519PublicKey:
     data = open(path, "rb").read()
 
@@ -45,51 +49,258 @@ def verify_signature(pubkey: ed25519.Ed25519PublicKey, message_bytes: bytes, sig
     sig = bytes.fromhex(signature_hex)
     pubkey.verify(sig, message_bytes)
 
-def main():
-    conn = sqlite3.connect(DB)
+_WORKER_PUBKEY = None
+
+def init_signature_worker(pubkey_path: str):
+    # 公開鍵は worker ごとに 1 回だけ parse する
+    global _WORKER_PUBKEY
+    _WORKER_PUBKEY = load_ed25519_public_key_auto(pubkey_path)
+
+def verify_signature_batch(jobs):
+    # jobs: [(row_id, message_canonical, signature_hex)] を id 順に検証し、最初の失敗 id を返す
+    for row_id, message_canonical, signature_hex in jobs:
+        try:
+            verify_signature(_WORKER_PUBKEY, message_canonical.encode("utf-8"), signature_hex)
+        except Exception:
+            return row_id
+    return None
+
+class SignatureBatcher:
+    # daily_signature の検証ジョブを batch にまとめ、chain walk と並行して worker pool で検証する
+    def __init__(self, pubkey_path: str, workers: int, batch_size: int):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_signature_worker, initargs=(pubkey_path,))
+        self.batch_size = batch_size
+        self.max_inflight = workers * 2
+        self.jobs = []
+        self.pending = deque()
+        self.checked = 0
+
+    def add(self, row_id: int, message_canonical: str, signature_hex: str):
+        self.jobs.append((row_id, message_canonical, signature_hex))
+        if len(self.jobs) >= self.batch_size:
+            self.submit()
+
+    def submit(self):
+        if self.jobs:
+            self.pending.append((len(self.jobs), self.pool.submit(verify_signature_batch, self.jobs)))
+            self.jobs = []
+        while len(self.pending) > self.max_inflight:
+            self.collect_one()
+
+    def collect_one(self):
+        # batch は id 順に投入・回収するので、最初に見つかった失敗が台帳上で最初の失敗になる
+        n, fut = self.pending.popleft()
+        failed_id = fut.result()
+        if failed_id is not None:
+            raise SystemExit(f"SIGNATURE VERIFY FAIL at id={failed_id}")
+        self.checked += n
+
+    def drain(self):
+        self.submit()
+        while self.pending:
+            self.collect_one()
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+def check_anchor(cur, row, attested: dict):
+    # anchor 行が署名内容と一致することを確認する（不一致なら理由、一致なら None）
+    # - chain_hash: 行の prev_chain_hash + event_id から再計算して final_chain_hash と一致
+    # - event_id: 行の event_content から再計算して一致（= 署名が覆う最後の event）
+    # - ledger_count: anchor 以前（anchor を含む）の行数と一致
+    # 返り値は (理由, ledger_count の確認方法)
+    anchor_id, event_id, prev_db, chain_db, content = row
+    if sha256_hex(((prev_db or "") + event_id).encode("utf-8")) != attested["final_chain_hash"]:
+        return f"anchor id={anchor_id}: chain_hash does not recompute to the attested final_chain_hash", None
+    try:
+        content_ok = sha256_hex(normalize_json_bytes(content)) == event_id
+    except ValueError:
+        content_ok = False
+    if not content_ok:
+        return f"anchor id={anchor_id}: event_id does not match event_content", None
+
+    ledger_count = attested.get("ledger_count")
+    if type(ledger_count) is not int:
+        return f"anchor id={anchor_id}: attested ledger_count missing", None
+    # 台帳の id は append 順に欠番なく振られる（削除しない）ので、id が詰まっていれば anchor の位置は
+    # id - 先頭 id + 1 で、rowid の seek だけで確認できる（id_position）
+    # 一致しない = id に欠番があるときだけ COUNT で数え直す（O(n)、出力の ledger_count_check=count で分かる）
+    # prefix 内の行削除そのものは full replay（--since-last-signature なし）で検出する
+    cur.execute(f"SELECT MIN(id) FROM {TABLE}")
+    first_id = cur.fetchone()[0]
+    if first_id is not None and anchor_id - first_id + 1 == ledger_count:
+        return None, "id_position"
+    cur.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE id <= ?", (anchor_id,))
+    actual = cur.fetchone()[0]
+    if actual != ledger_count:
+        return f"anchor id={anchor_id}: attested ledger_count={ledger_count} but {actual} row(s) up to the anchor", None
+    return None, "count"
+
+# anchor 探索が index seek になるのに必要な index の先頭列（audit/ed25519/ledger_query.py migrate が作る）
+ANCHOR_INDEX_COLUMNS = ("event_type", "chain_hash")
+
+def missing_anchor_indexes(conn: sqlite3.Connection):
+    # 書き込まずに確認する。無い列は daily_signature / chain_hash の検索が全件 scan になる
+    cur = conn.cursor()
+    leading = set()
+    for index_row in cur.execute(f"PRAGMA index_list({TABLE})").fetchall():
+        cols = conn.execute(f"PRAGMA index_info(\"{index_row[1]}\")").fetchall()
+        if cols:
+            leading.add(min(cols)[2])
+    return [c for c in ANCHOR_INDEX_COLUMNS if c not in leading]
+
+def find_signature_anchor(conn: sqlite3.Connection, pubkey: ed25519.Ed25519PublicKey, fetch_rows: int = FETCH_ROWS):
+    # 最新の daily_signature から遡り、署名が通り、かつ署名対象 final_chain_hash が
+    # それより前の行の chain_hash と一致するものを anchor とする
+    # event_type / chain_hash の index（ledger_query.py migrate）があれば、どの検索も index seek になる
+    # 返り値は (anchor, rejected)。署名は通るが台帳の状態と一致しない場合は、より古い署名は探さず
+    # (None, 理由) を返して full replay に倒す
+    cur = conn.cursor()
+    sql = f"SELECT id, event_content FROM {TABLE} WHERE event_type = 'daily_signature' ORDER BY id DESC"
+    anchor_sql = f"SELECT id, event_id, prev_chain_hash, chain_hash, event_content FROM {TABLE}"
+    for batch in iter_row_batches(conn.cursor(), sql, (), fetch_rows):
+        for sig_id, content in batch:
+            try:
+                payload = json.loads(content)
+                message_canonical = payload["message_canonical"]
+                verify_signature(pubkey, message_canonical.encode("utf-8"), payload["signature_hex"])
+                # 信頼するのは署名された message の中身だけ（payload 側の値は使わない）
+                attested = json.loads(message_canonical)
+                final_chain_hash = attested["final_chain_hash"]
+            except Exception:
+                continue
+
+            if not isinstance(final_chain_hash, str) or not final_chain_hash:
+                continue
+
+            # 通常は署名行の直前の行が anchor
+            cur.execute(anchor_sql + " WHERE id < ? ORDER BY id DESC LIMIT 1", (sig_id,))
+            row = cur.fetchone()
+            if not row or row[3] != final_chain_hash:
+                cur.execute(anchor_sql + " WHERE chain_hash = ? AND id < ? ORDER BY id DESC LIMIT 1", (final_chain_hash, sig_id))
+                row = cur.fetchone()
+            if not row:
+                return None, f"signature id={sig_id}: attested final_chain_hash not found before it"
+
+            rejected, count_check = check_anchor(cur, row, attested)
+            if rejected is not None:
+                return None, f"signature id={sig_id}: {rejected}"
+
+            return {
+                "signature_id": sig_id,
+                "anchor_id": row[0],
+                "final_chain_hash": final_chain_hash,
+                "ledger_count": attested["ledger_count"],
+                "ledger_count_check": count_check,
+                "date": attested.get("date"),
+            }, None
+    return None, None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DB)
+    ap.add_argument("--pubkey", default=PUBKEY_PATH)
+    ap.add_argument("--fetch-rows", type=int, default=FETCH_ROWS, help="rows per fetchmany window")
+    ap.add_argument("--sig-workers", type=int, default=0, help="signature worker processes (0 = inline, -1 = all cores)")
+    ap.add_argument("--sig-batch", type=int, default=SIG_BATCH, help="signatures per worker batch")
+    ap.add_argument("--since-last-signature", action="store_true", help="trust the prefix attested by the newest valid daily_signature and verify only the rows after it")
+    args = ap.parse_args(argv)
+
+    sig_workers = (os.cpu_count() or 1) if args.sig_workers < 0 else args.sig_workers
+
+    conn = sqlite3.connect(args.db)
     cur = conn.cursor()
 
-    cur.execute(f"SELECT id, event_type, event_id, prev_chain_hash, chain_hash, event_content FROM {TABLE} ORDER BY id ASC")
-    rows = cur.fetchall()
+    sql = f"SELECT id, event_type, event_id, prev_chain_hash, chain_hash, event_content FROM {TABLE} WHERE id > ? ORDER BY id ASC"
 
     prev_chain_hash = ""
-    pubkey = load_ed25519_public_key_auto(PUBKEY_PATH)
+    after_id = 0
+    pubkey = load_ed25519_public_key_auto(args.pubkey)
+
+    anchor = None
+    anchor_rejected = None
+    t0 = time.perf_counter()
+    if args.since_last_signature:
+        missing = missing_anchor_indexes(conn)
+        if missing:
+            print(f"WARN: no index on {TABLE}({', '.join(missing)}); the anchor search scans the table (run: audit/ed25519/ledger_query.py --db {args.db} migrate)", file=sys.stderr)
+        anchor, anchor_rejected = find_signature_anchor(conn, pubkey, args.fetch_rows)
+        if anchor is not None:
+            after_id = anchor["anchor_id"]
+            prev_chain_hash = anchor["final_chain_hash"]
+
+    batcher = SignatureBatcher(args.pubkey, sig_workers, args.sig_batch) if sig_workers > 0 else None
+
+    def fail(msg: str):
+        # 先行する行の署名失敗があればそちらを先に報告する（inline 検証と同じ報告順）
+        if batcher is not None:
+            batcher.drain()
+        raise SystemExit(msg)
 
     sig_checked = 0
+    rows_checked = 0
+
+    try:
+        for batch in iter_row_batches(cur, sql, (after_id,), args.fetch_rows):
+            for row in batch:
+                row_id, event_type, event_id, prev_db, chain_db, content = row
 
-    for row in rows:
-        row_id, event_type, event_id, prev_db, chain_db, content = row
+                recalculated_event_id = sha256_hex(normalize_json_bytes(content))
+                if recalculated_event_id != event_id:
+                    fail(f"EVENT_ID MISMATCH at id={row_id}")
 
-        recalculated_event_id = sha256_hex(normalize_json_bytes(content))
-        if recalculated_event_id != event_id:
-            raise SystemExit(f"EVENT_ID MISMATCH at id={row_id}")
+                if (prev_db or "") != prev_chain_hash:
+                    fail(f"PREV_CHAIN_HASH MISMATCH at id={row_id}")
 
-        if (prev_db or "") != prev_chain_hash:
-            raise SystemExit(f"PREV_CHAIN_HASH MISMATCH at id={row_id}")
+                recalculated_chain = sha256_hex((prev_chain_hash + event_id).encode("utf-8"))
+                if recalculated_chain != chain_db:
+                    fail(f"CHAIN_HASH MISMATCH at id={row_id}")
 
-        recalculated_chain = sha256_hex((prev_chain_hash + event_id).encode("utf-8"))
-        if recalculated_chain != chain_db:
-            raise SystemExit(f"CHAIN_HASH MISMATCH at id={row_id}")
+                if event_type == "daily_signature":
+                    payload = json.loads(content)
+                    if batcher is not None:
+                        batcher.add(row_id, payload["message_canonical"], payload["signature_hex"])
+                    else:
+                        message = payload["message_canonical"].encode("utf-8")
+                        signature_hex = payload["signature_hex"]
+                        try:
+                            verify_signature(pubkey, message, signature_hex)
+                            sig_checked += 1
+                        except Exception:
+                            raise SystemExit(f"SIGNATURE VERIFY FAIL at id={row_id}")
 
-        if event_type == "daily_signature":
-            payload = json.loads(content)
-            message = payload["message_canonical"].encode("utf-8")
-            signature_hex = payload["signature_hex"]
-            try:
-                verify_signature(pubkey, message, signature_hex)
-                sig_checked += 1
-            except Exception:
-                raise SystemExit(f"SIGNATURE VERIFY FAIL at id={row_id}")
+                prev_chain_hash = chain_db
+                rows_checked += 1
 
-        prev_chain_hash = chain_db
+        if batcher is not None:
+            batcher.drain()
+            sig_checked = batcher.checked
+    finally:
+        if batcher is not None:
+            batcher.close()
 
+    elapsed = time.perf_counter() - t0
     conn.close()
 
+    if not args.since_last_signature:
+        mode = "full"
+    elif anchor is None:
+        mode = "full_fallback"
+    else:
+        mode = "since_last_signature"
+
     print(json.dumps({
         "status": "OK",
-        "rows_verified": len(rows),
+        "mode": mode,
+        "anchor": anchor,
+        "anchor_rejected": anchor_rejected,
+        "rows_verified": rows_checked,
         "final_chain_hash": prev_chain_hash,
-        "signature_checked": sig_checked
+        "signature_checked": sig_checked,
+        "sig_workers": sig_workers,
+        "elapsed_sec": round(elapsed, 6),
+        "rows_per_sec": round(rows_checked / elapsed, 1) if elapsed > 0 else None,
+        "peak_rss_bytes": peak_rss_bytes()
     }, indent=2))
 
 if __name__ == "__main__":